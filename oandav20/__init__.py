@@ -1 +1,2 @@
 from .oanda import Oanda
+from .async_oanda import AsyncOanda
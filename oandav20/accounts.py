@@ -0,0 +1,286 @@
+import time
+from typing import Any, Callable, Dict, List
+
+from oandav20.bulk import (BulkItem, BulkReport, execute_bulk,
+                           execute_bulk_async)
+
+
+class GroupReport(BulkReport):
+    """GroupReport is the result of the AccountGroup methods, one item per
+    account with the 'account_id' in the arguments.
+    """
+
+    @property
+    def results(self) -> Dict[str, Any]:
+        """Results of the succeeded calls by account IDs."""
+        return {item.arguments["account_id"]: item.result
+                for item in self.succeeded}
+
+    @property
+    def errors(self) -> Dict[str, Exception]:
+        """Exceptions of the failed calls by account IDs."""
+        return {item.arguments["account_id"]: item.error
+                for item in self.failed}
+
+    def merged(self, key: str) -> List[dict]:
+        """Merge the JSON objects of all succeeded accounts into one list.
+
+        Every object is a copy with the "accountID" key with ID of its
+        account, the results stay unchanged.
+
+        Example:
+            >>> group.get_all_trades().merged("trades")
+            [{"accountID": "101-004-3881593-001", "id": "6410", ...}, ...]
+
+        Arguments:
+            key:
+                Key of the list or object in the results, for example
+                "trades" or "account".
+        """
+        merged_objects = []
+
+        for account_id, result in self.results.items():
+            objects = result[key]
+
+            for item in objects if isinstance(objects, list) else [objects]:
+                merged_objects.append(dict(item, accountID=account_id))
+
+        return merged_objects
+
+
+class AccountGroup:
+    """AccountGroup calls the account methods for several accounts of one
+    token at once.
+
+    The requests for all accounts are sent concurrently, so a sweep over
+    many accounts takes about one round-trip instead of one round-trip per
+    account. Failure of one account doesn't stop the rest, see the returned
+    report instead.
+
+    Example:
+        >>> group = AccountGroup(o, ["101-004-3881593-001",
+        ...                          "101-004-3881593-002"])
+        >>> report = group.get_account_summary()
+        >>> sum(float(account["NAV"])
+        ...     for account in report.merged("account"))
+        87301.5767
+
+    Attributes:
+        account_ids (List[str]):
+            Oanda trading account IDs.
+        concurrency (int):
+            Maximum number of the per account requests sent at once, 0 for
+            all accounts at once.
+        oanda (Oanda):
+            Client sending the requests, preferably in the thread-safe mode.
+    """
+
+    def __init__(self, oanda: "Oanda", account_ids: List[str],
+                 concurrency: int = 0) \
+            -> None:
+        """Initialize an instance of class AccountGroup.
+
+        Arguments:
+            oanda:
+                Client sending the requests.
+            account_ids:
+                Oanda trading account IDs.
+            concurrency:
+                Maximum number of the per account requests sent at once, 0
+                for all accounts at once.
+        """
+        self.account_ids = list(account_ids)
+        self.concurrency = concurrency
+        self.oanda = oanda
+
+    def _get_calls(self) -> List[dict]:
+        """Get keyword arguments of the call for every account."""
+        return [{"account_id": account_id} for account_id in self.account_ids]
+
+    def _execute(self, function: Callable[..., Any]) -> GroupReport:
+        """Call the function for every account concurrently."""
+        calls = self._get_calls()
+        report = execute_bulk(function, calls,
+                              self.concurrency or len(calls))
+
+        return GroupReport(report.items, report.elapsed)
+
+    def get_account_summary(self) -> GroupReport:
+        """Get summary of every account.
+
+        Returns:
+            GroupReport with the 'get_account_summary' result of every
+            account, merge them by the "account" key.
+        """
+        return self._execute(self.oanda.get_account_summary)
+
+    def get_positions(self) -> GroupReport:
+        """Get positions of every account.
+
+        Returns:
+            GroupReport with the 'get_positions' result of every account,
+            merge them by the "positions" key.
+        """
+        return self._execute(self.oanda.get_positions)
+
+    def get_all_trades(self) -> GroupReport:
+        """Get open trades of every account.
+
+        Returns:
+            GroupReport with the 'get_all_trades' result of every account,
+            merge them by the "trades" key.
+        """
+        return self._execute(self.oanda.get_all_trades)
+
+    def get_all_orders(self) -> GroupReport:
+        """Get pending orders of every account.
+
+        Returns:
+            GroupReport with the 'get_all_orders' result of every account,
+            merge them by the "orders" key.
+        """
+        return self._execute(self.oanda.get_all_orders)
+
+    def _select_calls(self, report: GroupReport, key: str,
+                      select: Callable[[List[dict]], List[dict]],
+                      group: Callable[[List[dict], List[dict]],
+                                      List[dict]] = None) \
+            -> List[dict]:
+        """Select the calls of the bulk close or cancel from the lists of
+        all accounts.
+
+        Arguments:
+            report:
+                Report with the open trades or pending orders.
+            key:
+                Either "trades" or "orders".
+            select:
+                Function selecting the keyword arguments of the calls, for
+                example 'Oanda._select_trades'.
+            group:
+                Function replacing the selected calls of one account, for
+                example 'Oanda._group_by_position'.
+
+        Returns:
+            List of keyword arguments including the 'account_id'.
+        """
+        calls = []
+
+        for account_id, result in report.results.items():
+            selected = select(result[key])
+
+            if group is not None:
+                selected = group(result[key], selected)
+
+            for arguments in selected:
+                arguments["account_id"] = account_id
+                calls.append(arguments)
+
+        return calls
+
+    def _merge_reports(self, list_report: GroupReport, report: BulkReport,
+                       started: float) \
+            -> BulkReport:
+        """Add the accounts whose list couldn't be obtained to the report
+        of the bulk close or cancel as failed items.
+        """
+        items = list(report.items) + [
+            BulkItem({"account_id": account_id}, None, error, 0.0)
+            for account_id, error in list_report.errors.items()]
+
+        return BulkReport(items, time.perf_counter() - started)
+
+    def close_all_trades(self, concurrency: int = 10,
+                         by_position: bool = False) \
+            -> BulkReport:
+        """Close all open trades of every account.
+
+        The open trades of all accounts are obtained concurrently and then
+        the trades of all accounts are closed together. With the
+        'by_position' sides of positions with at least two trades are closed
+        by one 'close_position' call each.
+
+        Arguments:
+            concurrency:
+                Maximum number of close requests sent at once.
+            by_position:
+                Close the whole sides of positions by one request, which
+                closes also trades opened after the trades were obtained.
+
+        Returns:
+            BulkReport with the result of every 'close_trade' and
+            'close_position' call, the 'account_id' is in the arguments.
+            Accounts whose trades couldn't be obtained are failed items with
+            the 'account_id' argument only.
+        """
+        started = time.perf_counter()
+        trades = self.get_all_trades()
+        calls = self._select_calls(
+            trades, "trades", self.oanda._select_trades,
+            self.oanda._group_by_position if by_position else None)
+        report = execute_bulk(self.oanda._close_selected, calls,
+                              concurrency)
+
+        return self._merge_reports(trades, report, started)
+
+    def cancel_all_orders(self, concurrency: int = 10) -> BulkReport:
+        """Cancel all pending orders of every account.
+
+        The pending orders of all accounts are obtained concurrently and
+        then the orders of all accounts are canceled together.
+
+        Arguments:
+            concurrency:
+                Maximum number of cancel requests sent at once.
+
+        Returns:
+            BulkReport with the result of every 'cancel_order' call, the
+            'account_id' is in the arguments. Accounts whose orders
+            couldn't be obtained are failed items with the 'account_id'
+            argument only.
+        """
+        started = time.perf_counter()
+        orders = self.get_all_orders()
+        calls = self._select_calls(orders, "orders",
+                                   self.oanda._select_orders)
+        report = execute_bulk(self.oanda.cancel_order, calls, concurrency)
+
+        return self._merge_reports(orders, report, started)
+
+
+class AsyncAccountGroup(AccountGroup):
+    """Asynchronous variant of the AccountGroup for the AsyncOanda client,
+    every method returns a coroutine which must be awaited.
+    """
+
+    async def _execute(self, function: Callable[..., Any]) -> GroupReport:
+        calls = self._get_calls()
+        report = await execute_bulk_async(function, calls,
+                                          self.concurrency or len(calls))
+
+        return GroupReport(report.items, report.elapsed)
+
+    async def close_all_trades(self, concurrency: int = 10,
+                               by_position: bool = False) \
+            -> BulkReport:
+        """Asynchronous variant of the 'AccountGroup.close_all_trades'."""
+        started = time.perf_counter()
+        trades = await self.get_all_trades()
+        calls = self._select_calls(
+            trades, "trades", self.oanda._select_trades,
+            self.oanda._group_by_position if by_position else None)
+        report = await execute_bulk_async(self.oanda._close_selected, calls,
+                                          concurrency)
+
+        return self._merge_reports(trades, report, started)
+
+    async def cancel_all_orders(self, concurrency: int = 10) -> BulkReport:
+        """Asynchronous variant of the 'AccountGroup.cancel_all_orders'."""
+        started = time.perf_counter()
+        orders = await self.get_all_orders()
+        calls = self._select_calls(orders, "orders",
+                                   self.oanda._select_orders)
+        report = await execute_bulk_async(self.oanda.cancel_order, calls,
+                                          concurrency)
+
+        return self._merge_reports(orders, report, started)
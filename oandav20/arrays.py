@@ -0,0 +1,261 @@
+from typing import List
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Keys of the candle object for the price components.
+
+PRICE_COMPONENTS = {
+    "A": "ask",
+    "B": "bid",
+    "M": "mid"
+}
+
+if np is not None:
+    CANDLE_DTYPE = np.dtype([
+        ("time", "datetime64[ns]"),
+        ("open", "f8"),
+        ("high", "f8"),
+        ("low", "f8"),
+        ("close", "f8"),
+        ("volume", "i8"),
+        ("complete", "?")
+    ])
+else:
+    CANDLE_DTYPE = None
+
+
+def require_numpy() -> None:
+    """Check if the optional 'numpy' package is installed.
+
+    Raises:
+        ImportError:
+            The 'numpy' package isn't installed.
+    """
+    if np is None:
+        raise ImportError("This feature requires the 'numpy' package, "
+                          "install it via 'pip install oandav20[numpy]'.")
+
+
+def parse_unix_times(times: List[str]) -> "np.ndarray":
+    """Convert UNIX times from Oanda to an array of datetime64[ns].
+
+    Oanda sends the UNIX times (header "Accept-Datetime-Format: UNIX") as
+    strings with 9 decimal places, for example "1502916000.000000000".
+    Fewer decimal places or none are accepted as well.
+
+    Arguments:
+        times:
+            UNIX times from Oanda.
+
+    Returns:
+        Array with dtype datetime64[ns].
+
+    Raises:
+        ValueError:
+            Time with more than 9 decimal places or not a number.
+    """
+    require_numpy()
+
+    nanoseconds = np.array([_to_nanoseconds(time) for time in times],
+                           dtype="i8")
+
+    return nanoseconds.view("datetime64[ns]")
+
+
+def _to_nanoseconds(time: str) -> str:
+    """Convert one UNIX time to the string with number of nanoseconds."""
+    seconds, _, fraction = time.partition(".")
+
+    if len(fraction) > 9:
+        raise ValueError("Invalid UNIX time '{}'.".format(time))
+
+    return seconds + fraction.ljust(9, "0")
+
+
+def candles_to_array(candles: List[dict], price: str = "M") \
+        -> "np.ndarray":
+    """Convert candles from Oanda to a structured array.
+
+    Arguments:
+        candles:
+            The "candles" key from the candles endpoint requested with the
+            UNIX times.
+        price:
+            Price component of the candles, "M", "B" or "A".
+
+    Returns:
+        Array with dtype CANDLE_DTYPE.
+    """
+    require_numpy()
+
+    component = PRICE_COMPONENTS[price]
+    array = np.empty(len(candles), dtype=CANDLE_DTYPE)
+
+    if not candles:
+        return array
+
+    array["time"] = parse_unix_times([candle["time"] for candle in candles])
+
+    for field, key in [("open", "o"), ("high", "h"), ("low", "l"),
+                       ("close", "c")]:
+        array[field] = np.array(
+            [candle[component][key] for candle in candles], dtype="f8")
+
+    array["volume"] = [candle["volume"] for candle in candles]
+    array["complete"] = [candle["complete"] for candle in candles]
+
+    return array
+
+
+def merge_candles(arrays: List["np.ndarray"]) -> "np.ndarray":
+    """Concatenate candle arrays sorted by time without duplicates.
+
+    If more arrays contain a candle with the same time, the candle from the
+    later array is used (for example complete candle replaces the
+    incomplete one).
+
+    Arguments:
+        arrays:
+            Arrays with dtype CANDLE_DTYPE.
+
+    Returns:
+        One contiguous array with dtype CANDLE_DTYPE.
+    """
+    require_numpy()
+
+    if not arrays:
+        return np.empty(0, dtype=CANDLE_DTYPE)
+
+    array = np.concatenate(arrays)[::-1]
+    _, indexes = np.unique(array["time"], return_index=True)
+
+    return np.ascontiguousarray(array[indexes])
+
+
+def get_pricing_dtype(depth: int = 1) -> "np.dtype":
+    """Get dtype of the pricing snapshot with the given number of the
+    depth levels.
+
+    Fields:
+        instrument:
+            Index of the instrument in the requested list, -1 for unknown
+            one.
+        time:
+            Time of the price as datetime64[ns].
+        tradeable:
+            The instrument may be traded.
+        bid, ask:
+            Best bid and ask.
+        closeout_bid, closeout_ask:
+            Closeout prices.
+        bids, asks:
+            Prices of the depth levels, NaN for missing level.
+        bid_liquidity, ask_liquidity:
+            Liquidity of the depth levels, NaN for missing level.
+        positive_units_factor, negative_units_factor:
+            Quote to home currency conversion factors.
+    """
+    require_numpy()
+
+    return np.dtype([
+        ("instrument", "i4"),
+        ("time", "datetime64[ns]"),
+        ("tradeable", "?"),
+        ("bid", "f8"),
+        ("ask", "f8"),
+        ("closeout_bid", "f8"),
+        ("closeout_ask", "f8"),
+        ("bids", "f8", (depth,)),
+        ("bid_liquidity", "f8", (depth,)),
+        ("asks", "f8", (depth,)),
+        ("ask_liquidity", "f8", (depth,)),
+        ("positive_units_factor", "f8"),
+        ("negative_units_factor", "f8")
+    ])
+
+
+def parse_times(times: List[str]) -> "np.ndarray":
+    """Convert either UNIX or RFC 3339 times from Oanda to an array of
+    datetime64[ns].
+    """
+    if times and "T" in times[0]:
+        return np.array([time.rstrip("Z") for time in times],
+                        dtype="datetime64[ns]")
+
+    return parse_unix_times(times)
+
+
+def prices_to_array(prices: List[dict], instruments: List[str],
+                    depth: int = 1) \
+        -> "np.ndarray":
+    """Convert prices from Oanda to a columnar snapshot.
+
+    All numeric strings of all prices are collected into one flat list and
+    converted by a single NumPy call, which is much faster than converting
+    them one by one.
+
+    Arguments:
+        prices:
+            The "prices" key from the pricing endpoint.
+        instruments:
+            Codes of the requested instruments, the 'instrument' field is
+            index into this list.
+        depth:
+            Number of the depth levels of the bids and asks.
+
+    Returns:
+        Array with dtype from the 'get_pricing_dtype', one row per price in
+        the same order as the 'prices'.
+    """
+    dtype = get_pricing_dtype(depth)
+    array = np.empty(len(prices), dtype=dtype)
+
+    if not prices:
+        return array
+
+    missing = ["nan"] * depth
+    values = []
+
+    for price in prices:
+        bids = price.get("bids", [])[:depth]
+        asks = price.get("asks", [])[:depth]
+        factors = price.get("quoteHomeConversionFactors", {})
+
+        values.append(price.get("closeoutBid", "nan"))
+        values.append(price.get("closeoutAsk", "nan"))
+
+        for levels in [bids, asks]:
+            padding = missing[len(levels):]
+            values.extend([level["price"] for level in levels])
+            values.extend(padding)
+            values.extend([level.get("liquidity", "nan")
+                           for level in levels])
+            values.extend(padding)
+
+        values.append(factors.get("positiveUnits", "nan"))
+        values.append(factors.get("negativeUnits", "nan"))
+
+    numbers = np.array(values, dtype="f8").reshape(len(prices), -1)
+    indexes = {code: index for index, code in enumerate(instruments)}
+
+    array["instrument"] = [indexes.get(price["instrument"], -1)
+                           for price in prices]
+    array["time"] = parse_times([price["time"] for price in prices])
+    array["tradeable"] = [
+        price.get("tradeable", price.get("status") == "tradeable")
+        for price in prices]
+    array["closeout_bid"] = numbers[:, 0]
+    array["closeout_ask"] = numbers[:, 1]
+    array["bids"] = numbers[:, 2:2 + depth]
+    array["bid_liquidity"] = numbers[:, 2 + depth:2 + 2 * depth]
+    array["asks"] = numbers[:, 2 + 2 * depth:2 + 3 * depth]
+    array["ask_liquidity"] = numbers[:, 2 + 3 * depth:2 + 4 * depth]
+    array["bid"] = array["bids"][:, 0]
+    array["ask"] = array["asks"][:, 0]
+    array["positive_units_factor"] = numbers[:, -2]
+    array["negative_units_factor"] = numbers[:, -1]
+
+    return array
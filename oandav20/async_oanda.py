@@ -0,0 +1,606 @@
+import asyncio
+import datetime
+import inspect
+import json
+import time
+from functools import partial
+from typing import Any, Callable, List, Union
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from oandav20.bulk import BulkReport, execute_bulk_async
+from oandav20.instruments import InstrumentRegistry
+from oandav20.metrics import get_body_size
+from oandav20.mixins.account import AccountMixin
+from oandav20.mixins.instruments import InstrumentsMixin
+from oandav20.mixins.orders import OrdersMixin
+from oandav20.mixins.trades import TradesMixin
+from oandav20.mixins.positions import PositionsMixin
+from oandav20.mixins.pricing import PricingMixin
+from oandav20.mixins.transactions import TransactionsMixin
+from oandav20.oanda import (ENVIRONMENTS, MAX_RECONNECT_DELAY,
+                            RECONNECT_DELAY, STREAM_ENVIRONMENTS)
+from oandav20.pool import PoolConfig
+from oandav20.ratelimit import RateLimiter
+from oandav20.retry import RetryPolicy
+from oandav20.singleflight import SingleFlight, get_request_key
+
+
+class AsyncOanda(AccountMixin, OrdersMixin, TradesMixin, PositionsMixin,
+                 PricingMixin, TransactionsMixin, InstrumentsMixin):
+    """AsyncOanda is the asyncio variant of the Oanda class.
+
+    It has the same methods like the Oanda class, but every method returns
+    a coroutine which must be awaited. All requests are sent via one
+    'aiohttp' session, so many requests may be in flight at once from one
+    event loop.
+
+    Arguments are validated already by calling the method, so for example
+    invalid instrument code raises the ValueError before any awaiting.
+
+    The 'aiohttp' package is an optional dependency, install it via
+    'pip install oandav20[async]'.
+
+    Attributes:
+        base_url (str):
+            Base url alias prefix for all endpoints.
+        candle_store (CandleStore):
+            Local store of candles used by the 'get_candles' method, None
+            for no store.
+        client (aiohttp.ClientSession):
+            Session object with HTTP persistent connections to the Oanda API
+            server, created by the first request.
+        default_id (str):
+            Default Oanda trading account ID.
+        instrument_registry (InstrumentRegistry):
+            Valid instruments used for validation of the instrument codes.
+        metrics (RequestMetrics):
+            Statistics of the requests, None for no recording.
+        order_cache (OrderCache):
+            Known pending orders used by the 'update_order' method instead
+            of getting the order, None for no cache.
+        pool (PoolConfig):
+            Configuration of the persistent connections.
+        rate_limiter (RateLimiter):
+            Limiter pacing the requests, None for no limit.
+        response_cache (ResponseCache):
+            Read-through cache of the GET responses of the mixins, None for
+            no cache.
+        retry_policy (RetryPolicy):
+            Policy for repeating requests failed by transient errors, None
+            for no retries.
+        single_flight (SingleFlight):
+            Coalescer of the concurrent identical GET requests of the
+            mixins, None for no coalescing.
+        stream_url (str):
+            Base url alias prefix for all streaming endpoints.
+    """
+
+    def __init__(self, environment: str, access_token: str, default_id: str,
+                 pool: PoolConfig = None) \
+            -> None:
+        """Initialize an instance of class AsyncOanda.
+
+        Arguments:
+            environment:
+                Trading environment, accepts only value "DEMO" or "REAL".
+            access_token:
+                Access token for user authentication.
+            default_id:
+                Default Oanda trading account ID.
+            pool:
+                Configuration of the persistent connections (connections
+                per host, keep-alive and timeouts), PoolConfig() by default.
+                If it has 'prewarm' connections, they are opened when the
+                object is entered by 'async with'.
+
+        Raises:
+            ImportError:
+                The 'aiohttp' package isn't installed.
+            ValueError:
+                Value "DEMO" or "REAL" wasn't passed to the 'environment'
+                parameter.
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncOanda requires the 'aiohttp' package.")
+
+        if environment not in ENVIRONMENTS:
+            raise ValueError("Invalid environment '{}'.".format(environment))
+
+        self.base_url = ENVIRONMENTS[environment]
+        self.stream_url = STREAM_ENVIRONMENTS[environment]
+        self.client = None
+        self.candle_store = None
+        self.default_id = default_id
+        self.instrument_registry = InstrumentRegistry(self)
+        self.metrics = None
+        self.order_cache = None
+        self.pool = pool or PoolConfig()
+        self.rate_limiter = RateLimiter()
+        self.response_cache = None
+        self.retry_policy = RetryPolicy()
+        self.single_flight = SingleFlight()
+        self._headers = {
+            "Authorization": "Bearer " + access_token,
+            "Content-Type": "application/json"
+        }
+
+    async def __aenter__(self) -> "AsyncOanda":
+        if self.pool.prewarm:
+            await self.prewarm(self.pool.prewarm)
+
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the HTTP session connections with the Oanda server."""
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
+
+    async def prewarm(self, connections: int = 1) -> int:
+        """Asynchronous variant of the 'Oanda.prewarm'."""
+        connections = min(connections, self.pool.max_connections)
+
+        async def open_connection():
+            try:
+                response = await self.send_request("")
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                return False
+
+            return response.status_code < 400
+
+        results = await asyncio.gather(
+            *[open_connection() for _ in range(connections)])
+
+        return sum(results)
+
+    def _get_client(self) -> "aiohttp.ClientSession":
+        """Return the HTTP session, create it by the first call."""
+        if self.client is None:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool.max_connections * self.pool.pool_size,
+                limit_per_host=self.pool.max_connections,
+                keepalive_timeout=self.pool.keep_alive or None,
+                force_close=False)
+            timeout = aiohttp.ClientTimeout(
+                sock_connect=self.pool.connect_timeout or None,
+                sock_read=self.pool.read_timeout or None)
+            self.client = aiohttp.ClientSession(
+                connector=connector, headers=self._headers, timeout=timeout)
+
+        return self.client
+
+    async def send_request(self, endpoint: str, method: str = "GET",
+                           **kwargs: Any) \
+            -> requests.Response:
+        """Send an HTTP request to the Oanda trading server.
+
+        The response body is read at once and returned as the same object
+        like from the Oanda class, so the 'raise_for_status' raises the
+        'requests.HTTPError' as well. The request waits for the
+        'rate_limiter', transient errors are retried by the 'retry_policy'
+        and every attempt is recorded by the 'metrics', if they are set.
+
+        Arguments:
+            endpoint:
+                Suffix for a URL.
+            method:
+                HTTP method written in capital letters.
+            **kwargs:
+                Same keywords arguments like for an 'request' method from a
+                'aiohttp.ClientSession' object.
+
+        Returns:
+            HTTP Response object from the 'requests' package.
+        """
+        url = self.base_url + endpoint
+        attempt = 0
+
+        while True:
+            if self.rate_limiter is not None:
+                delay = self.rate_limiter.reserve()
+
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            started = time.perf_counter()
+
+            try:
+                response = await self._send(method, url, **kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if self.metrics is not None:
+                    self.metrics.record(
+                        method, endpoint, 0, time.perf_counter() - started,
+                        retry=attempt > 0)
+
+                if self.retry_policy is None or \
+                        not self.retry_policy.should_retry(
+                            method, attempt, kwargs.get("json")):
+                    raise
+
+                delay = self.retry_policy.get_delay(attempt)
+            else:
+                if self.metrics is not None:
+                    self.metrics.record(
+                        method, endpoint, response.status_code,
+                        time.perf_counter() - started,
+                        get_body_size(kwargs), len(response.content),
+                        attempt > 0)
+
+                if self.retry_policy is None or \
+                        not self.retry_policy.should_retry(
+                            method, attempt, kwargs.get("json"),
+                            response.status_code):
+                    return response
+
+                delay = self.retry_policy.get_delay(
+                    attempt, response.headers.get("Retry-After", ""))
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _send(self, method: str, url: str, **kwargs: Any) \
+            -> requests.Response:
+        """Send one HTTP request and read the whole response."""
+        async with self._get_client().request(method, url, **kwargs) \
+                as response:
+            response_obj = requests.Response()
+            response_obj.status_code = response.status
+            response_obj.reason = response.reason
+            response_obj.url = str(response.url)
+            response_obj.headers = CaseInsensitiveDict(response.headers)
+            response_obj.encoding = response.charset
+            response_obj._content = await response.read()
+
+        return response_obj
+
+    async def _request(self, endpoint: str, method: str = "GET",
+                       parser: Callable[[requests.Response], Any] = None,
+                       **kwargs: Any) \
+            -> Any:
+        """Send an HTTP request and process the response for the mixins.
+
+        Concurrent identical GET requests share one response via the
+        'single_flight' and fresh responses are returned by the
+        'response_cache', each caller still gets its own result. Other
+        requests invalidate the cached responses and requests in flight of
+        the account.
+
+        Arguments:
+            endpoint:
+                Suffix for a URL.
+            method:
+                HTTP method written in capital letters.
+            parser:
+                Function which gets the successful response and returns the
+                method result, otherwise the decoded JSON body is returned.
+            **kwargs:
+                Same keywords arguments like for the 'send_request' method.
+
+        Returns:
+            Result of the 'parser' function or JSON object (dict).
+
+        Raises:
+            requests.HTTPError:
+                HTTP response status code is 4xx or 5xx.
+        """
+        send = partial(self.send_request, endpoint, method, **kwargs)
+
+        if method == "GET":
+            key = get_request_key(endpoint, kwargs)
+
+            if self.single_flight is not None:
+                send = partial(self.single_flight.call_async, key, send)
+
+            if self.response_cache is not None:
+                send = partial(self.response_cache.call_async, endpoint, key,
+                               send)
+
+            response = await send()
+        else:
+            try:
+                response = await send()
+            finally:
+                if self.single_flight is not None:
+                    self.single_flight.invalidate(endpoint)
+
+                if self.response_cache is not None:
+                    self.response_cache.invalidate(endpoint)
+
+        if response.status_code >= 400:
+            response.raise_for_status()
+
+        if parser:
+            return parser(response)
+
+        return response.json()
+
+    def _stream(self, endpoint: str, params: dict = None,
+                heartbeat: Callable[[dict], Any] = None,
+                stall_timeout: float = 10.0) \
+            -> "AsyncStream":
+        """Return messages from a streaming endpoint for the mixins.
+
+        Arguments:
+            Same arguments like for the 'Oanda._stream' method.
+
+        Returns:
+            AsyncStream object for the 'async for' loop.
+        """
+        return AsyncStream(self, self.stream_url + endpoint, params,
+                           heartbeat, stall_timeout)
+
+    # Methods below combine several requests, so they cannot be inherited
+    # from the mixins as they are.
+
+    async def update_order(self, order_id: int = 0, own_id: str = "",
+                           price: float = 0.0, price_bound: float = 0.0,
+                           stoploss: float = 0.0, takeprofit: float = 0.0,
+                           units: int = 0, account_id: str = "") \
+            -> Any:
+        """Asynchronous variant of the 'OrdersMixin.update_order'."""
+        account_id = account_id or self.default_id
+
+        if not order_id and not own_id:
+            raise TypeError("Missing argument either for the 'order_id' or "
+                            "'own_id'.")
+
+        replace = partial(
+            self._replace_order, order_id=order_id, own_id=own_id,
+            price=price, price_bound=price_bound, stoploss=stoploss,
+            takeprofit=takeprofit, units=units, account_id=account_id)
+        cached_details = self._get_cached_order(account_id, order_id, own_id)
+
+        if cached_details is not None:
+            try:
+                return await replace(cached_details)
+            except requests.HTTPError as error:
+                self._check_cached_order_error(
+                    error, account_id, order_id, own_id)
+
+        old_order_details = (await self.get_order(
+            order_id, own_id, account_id=account_id))["order"]
+
+        return await replace(old_order_details)
+
+    async def create_orders(self, orders: List[dict], account_id: str = "",
+                            concurrency: int = 10) \
+            -> BulkReport:
+        """Asynchronous variant of the 'OrdersMixin.create_orders'."""
+        self._validate_orders(orders)
+
+        return await execute_bulk_async(
+            partial(self._send_order, account_id=account_id), orders,
+            concurrency)
+
+    async def update_orders(self, orders: List[dict], account_id: str = "",
+                            concurrency: int = 10) \
+            -> BulkReport:
+        """Asynchronous variant of the 'OrdersMixin.update_orders'."""
+        account_id = account_id or self.default_id
+        self._validate_order_updates(orders)
+        pending_orders = (await self.get_all_orders(account_id))["orders"]
+        index = self._index_orders(pending_orders)
+        self._check_duplicate_orders(orders, index)
+
+        async def update_pending_order(**order):
+            result = self._update_pending_order(
+                index, account_id=account_id, **order)
+
+            if inspect.isawaitable(result):
+                result = await result
+
+            return result
+
+        return await execute_bulk_async(update_pending_order, orders,
+                                        concurrency)
+
+    async def cancel_filtered_orders(self, order_ids: List[int] = [],
+                                     own_ids: List[str] = [],
+                                     instrument: str = "",
+                                     account_id: str = "",
+                                     concurrency: int = 10) \
+            -> BulkReport:
+        """Asynchronous variant of the 'OrdersMixin.cancel_filtered_orders'.
+        """
+        account_id = account_id or self.default_id
+
+        if not order_ids and not own_ids and not instrument:
+            raise TypeError("Missing argument either for the 'order_ids' or "
+                            "'own_ids' or 'instrument'.")
+
+        pending_orders = await self.get_all_orders(account_id)
+        selected_orders = self._select_orders(
+            pending_orders["orders"], order_ids, own_ids, instrument)
+
+        return await execute_bulk_async(
+            partial(self.cancel_order, account_id=account_id), selected_orders,
+            concurrency)
+
+    async def cancel_all_orders(self, account_id: str = "",
+                                concurrency: int = 10) \
+            -> BulkReport:
+        """Asynchronous variant of the 'OrdersMixin.cancel_all_orders'."""
+        account_id = account_id or self.default_id
+        pending_orders = await self.get_all_orders(account_id)
+        selected_orders = self._select_orders(pending_orders["orders"])
+
+        return await execute_bulk_async(
+            partial(self.cancel_order, account_id=account_id), selected_orders,
+            concurrency)
+
+    async def close_filtered_trades(self, trade_ids: List[int] = [],
+                                    own_ids: List[str] = [],
+                                    instrument: str = "",
+                                    account_id: str = "",
+                                    concurrency: int = 10,
+                                    by_position: bool = False) \
+            -> BulkReport:
+        """Asynchronous variant of the 'TradesMixin.close_filtered_trades'.
+        """
+        account_id = account_id or self.default_id
+
+        if not trade_ids and not own_ids and not instrument:
+            raise TypeError("Missing argument either for the 'trade_ids' or "
+                            "'own_ids' or 'instrument'.")
+
+        open_trades = await self.get_all_trades(account_id)
+        selected_trades = self._select_trades(
+            open_trades["trades"], trade_ids, own_ids, instrument)
+
+        if by_position:
+            selected_trades = self._group_by_position(
+                open_trades["trades"], selected_trades)
+
+        return await execute_bulk_async(
+            partial(self._close_selected, account_id=account_id),
+            selected_trades, concurrency)
+
+    async def close_all_trades(self, account_id: str = "",
+                               concurrency: int = 10,
+                               by_position: bool = False) \
+            -> BulkReport:
+        """Asynchronous variant of the 'TradesMixin.close_all_trades'."""
+        account_id = account_id or self.default_id
+        open_trades = await self.get_all_trades(account_id)
+        selected_trades = self._select_trades(open_trades["trades"])
+
+        if by_position:
+            selected_trades = self._group_by_position(
+                open_trades["trades"], selected_trades)
+
+        return await execute_bulk_async(
+            partial(self._close_selected, account_id=account_id),
+            selected_trades, concurrency)
+
+    async def get_candles(self, instrument: str,
+                          start: Union[datetime.datetime, float],
+                          end: Union[datetime.datetime, float] = 0.0,
+                          granularity: str = "M1", price: str = "M",
+                          concurrency: int = 4, account_id: str = "") \
+            -> "numpy.ndarray":
+        """Asynchronous variant of the 'InstrumentsMixin.get_candles'."""
+        start, end, chunks = self._split_candles_range(
+            instrument, start, end, granularity, price)
+        get_chunk = partial(self._get_candles_chunk, instrument,
+                            granularity=granularity, price=price,
+                            account_id=account_id)
+        report = await execute_bulk_async(get_chunk, chunks, concurrency)
+
+        return self._collect_candles(instrument, start, end, granularity,
+                                     price, report)
+
+
+class AsyncStream:
+    """AsyncStream iterates over messages from a streaming endpoint.
+
+    It's the asynchronous variant of the 'Oanda._stream' generator, so the
+    connection is opened by the first iteration and reconnected with backoff
+    whenever it breaks, stalls or the server ends it.
+
+    Example:
+        >>> stream = o.stream_pricing(["EUR_USD"])
+        >>> async for price in stream:
+        ...     print(price["closeoutBid"])
+        >>> await stream.close()
+    """
+
+    def __init__(self, oanda: AsyncOanda, url: str, params: dict,
+                 heartbeat: Callable[[dict], Any], stall_timeout: float) \
+            -> None:
+        """Initialize an instance of class AsyncStream.
+
+        Arguments:
+            oanda:
+                AsyncOanda object whose HTTP session will be used.
+            url:
+                Full streaming URL.
+            params:
+                URL parameters.
+            heartbeat:
+                Function called with every heartbeat message, otherwise the
+                heartbeats are dropped.
+            stall_timeout:
+                Maximum number of seconds without any data.
+        """
+        self.oanda = oanda
+        self.url = url
+        self.params = params
+        self.heartbeat = heartbeat
+        self.stall_timeout = stall_timeout
+        self._response = None
+        self._delay = 0.0
+
+    def __aiter__(self) -> "AsyncStream":
+        return self
+
+    async def __anext__(self) -> dict:
+        while True:
+            if self._response is None:
+                await asyncio.sleep(self._delay)
+                self._delay = min(max(self._delay * 2, RECONNECT_DELAY),
+                                  MAX_RECONNECT_DELAY)
+
+                # The stalls are detected by the 'stall_timeout', not by the
+                # read timeout of the pool.
+
+                try:
+                    self._response = await asyncio.wait_for(
+                        self.oanda._get_client().get(
+                            self.url, params=self.params,
+                            timeout=aiohttp.ClientTimeout()),
+                        self.stall_timeout)
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    continue
+
+                status = self._response.status
+
+                if 400 <= status < 500:
+                    await self.close()
+                    raise requests.HTTPError(
+                        "{} Client Error for url: {}".format(status, self.url))
+
+                if status >= 500:
+                    await self.close()
+                    continue
+
+            try:
+                line = await asyncio.wait_for(
+                    self._response.content.readline(), self.stall_timeout)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                line = b""
+
+            if not line:
+                await self.close()
+                continue
+
+            line = line.strip()
+
+            if not line:
+                continue
+
+            message = json.loads(line.decode("utf-8"))
+            self._delay = 0.0
+
+            if message.get("type") == "HEARTBEAT":
+                if self.heartbeat:
+                    self.heartbeat(message)
+
+                continue
+
+            return message
+
+    async def close(self) -> None:
+        """Close the current streaming connection."""
+        if self._response is not None:
+            self._response.close()
+            self._response = None
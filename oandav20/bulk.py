@@ -0,0 +1,169 @@
+import asyncio
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List
+
+BulkItem = namedtuple("BulkItem", ["arguments", "result", "error", "elapsed"])
+BulkItem.__doc__ = """Result of one call within a bulk operation.
+
+Attributes:
+    arguments (dict):
+        Keyword arguments of the call, for example {"own_id": "EUR_USD_1"}.
+    result (Any):
+        Returned value of the call or None if the call failed.
+    error (Exception):
+        Raised exception or None if the call succeeded.
+    elapsed (float):
+        Duration of the call in seconds.
+"""
+
+# Marks the threads of the 'execute_bulk' thread pools.
+
+_worker = threading.local()
+
+
+def _init_worker() -> None:
+    _worker.active = True
+
+
+def is_bulk_worker() -> bool:
+    """Check if the current thread runs the calls of 'execute_bulk'.
+
+    The Oanda object lends such threads their own session, because one
+    session shouldn't be used by several threads at once.
+    """
+    return getattr(_worker, "active", False)
+
+
+class BulkReport:
+    """BulkReport is the result of the bulk methods such as the
+    'cancel_all_orders' or 'close_all_trades'.
+
+    Attributes:
+        items (List[BulkItem]):
+            Results of the calls in the same order as they were selected.
+        elapsed (float):
+            Duration of the whole bulk operation in seconds.
+    """
+
+    def __init__(self, items: List[BulkItem], elapsed: float) -> None:
+        """Initialize an instance of class BulkReport.
+
+        Arguments:
+            items:
+                Results of the calls.
+            elapsed:
+                Duration of the whole bulk operation in seconds.
+        """
+        self.items = items
+        self.elapsed = elapsed
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __repr__(self) -> str:
+        return "<BulkReport succeeded={} failed={} elapsed={:.3f}s>".format(
+            len(self.succeeded), len(self.failed), self.elapsed)
+
+    @property
+    def succeeded(self) -> List[BulkItem]:
+        """List of the calls which succeeded."""
+        return [item for item in self.items if item.error is None]
+
+    @property
+    def failed(self) -> List[BulkItem]:
+        """List of the calls which raised an exception."""
+        return [item for item in self.items if item.error is not None]
+
+
+def execute_bulk(function: Callable[..., Any], calls: List[dict],
+                 concurrency: int = 10) \
+        -> BulkReport:
+    """Call the function for every keyword arguments in a thread pool.
+
+    Exceptions of the single calls are not raised, they are stored in the
+    report instead, so one failed call doesn't stop the rest. The Oanda
+    methods called by the pool threads use lent sessions, see the
+    'is_bulk_worker'.
+
+    Arguments:
+        function:
+            Function to call, for example 'Oanda.cancel_order'.
+        calls:
+            List of keyword arguments for the function.
+        concurrency:
+            Maximum number of calls running at once.
+
+    Returns:
+        BulkReport with the results in the same order as the 'calls'.
+    """
+    start = time.perf_counter()
+
+    def execute(arguments):
+        call_start = time.perf_counter()
+
+        try:
+            result = function(**arguments)
+        except Exception as error:
+            return BulkItem(arguments, None, error,
+                            time.perf_counter() - call_start)
+
+        return BulkItem(arguments, result, None,
+                        time.perf_counter() - call_start)
+
+    if concurrency <= 1 or len(calls) <= 1:
+        items = [execute(arguments) for arguments in calls]
+    else:
+        workers = min(concurrency, len(calls))
+
+        def execute_in_worker(arguments):
+            _init_worker()
+            return execute(arguments)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            items = list(executor.map(execute_in_worker, calls))
+
+    return BulkReport(items, time.perf_counter() - start)
+
+
+async def execute_bulk_async(function: Callable[..., Any], calls: List[dict],
+                             concurrency: int = 10) \
+        -> BulkReport:
+    """Asynchronous variant of the 'execute_bulk' function.
+
+    Arguments:
+        function:
+            Function returning an awaitable, for example
+            'AsyncOanda.cancel_order'.
+        calls:
+            List of keyword arguments for the function.
+        concurrency:
+            Maximum number of calls awaited at once.
+
+    Returns:
+        BulkReport with the results in the same order as the 'calls'.
+    """
+    start = time.perf_counter()
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def execute(arguments):
+        async with semaphore:
+            call_start = time.perf_counter()
+
+            try:
+                result = await function(**arguments)
+            except Exception as error:
+                return BulkItem(arguments, None, error,
+                                time.perf_counter() - call_start)
+
+            return BulkItem(arguments, result, None,
+                            time.perf_counter() - call_start)
+
+    items = await asyncio.gather(*[execute(arguments) for arguments in calls])
+
+    return BulkReport(list(items), time.perf_counter() - start)
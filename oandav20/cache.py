@@ -0,0 +1,260 @@
+import threading
+import time
+from typing import Awaitable, Callable, Dict
+
+import requests
+
+from oandav20.metrics import get_endpoint_template
+
+# Number of seconds the responses are fresh by endpoint templates, the other
+# endpoints aren't cached.
+
+DEFAULT_TTLS = {
+    "/{id}/summary": 1.0,
+    "/{id}/positions": 1.0,
+    "/{id}/pricing": 0.25
+}
+
+# Number of cached responses above which the expired ones are dropped.
+
+PRUNE_SIZE = 1024
+
+
+def get_account_id(endpoint: str) -> str:
+    """Get the account ID from the endpoint, for example "/123/summary"."""
+    return endpoint.split("/", 2)[1] if endpoint.startswith("/") else ""
+
+
+class _Entry:
+    """Cached response and the time it was received."""
+
+    __slots__ = ["response", "received"]
+
+    def __init__(self, response: requests.Response, received: float) \
+            -> None:
+        self.response = response
+        self.received = received
+
+
+class ResponseCache:
+    """ResponseCache is an opt-in read-through cache of the GET responses
+    of the mixins with short per endpoint TTLs.
+
+    A fresh response (younger than the TTL of its endpoint) is returned
+    without any request. Responses of the same account are dropped when the
+    client sends any other request than GET through the mixins, for example
+    'create_order', 'close_trade' or 'update_trade'. If a refresh fails by
+    a connection error or 5xx status code, a response at most
+    'max_staleness' seconds old is returned instead.
+
+    Every caller decodes the cached response itself, so the returned JSON
+    objects are never shared between the callers.
+
+    Example:
+        >>> o.response_cache = ResponseCache({"/{id}/pricing": 0.1})
+        >>> o.get_pricing(["EUR_USD"])  # miss
+        >>> o.get_pricing(["EUR_USD"])  # hit
+        >>> o.response_cache.hits, o.response_cache.misses
+        (1, 1)
+
+    Attributes:
+        hits (int):
+            Number of fresh responses returned from the cache.
+        max_staleness (float):
+            Maximum age in seconds of the response returned when the refresh
+            fails, 0 for none.
+        misses (int):
+            Number of requests sent for the cached endpoints.
+        stale_hits (int):
+            Number of old responses returned because the refresh failed.
+        ttls (Dict[str, float]):
+            Number of seconds the responses are fresh by endpoint templates
+            such as "/{id}/summary", see 'get_endpoint_template'.
+    """
+
+    def __init__(self, ttls: Dict[str, float] = None,
+                 max_staleness: float = 0.0) \
+            -> None:
+        """Initialize an instance of class ResponseCache.
+
+        Arguments:
+            ttls:
+                Number of seconds the responses are fresh by endpoint
+                templates, DEFAULT_TTLS by default.
+            max_staleness:
+                Maximum age in seconds of the response returned when the
+                refresh fails.
+        """
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.max_staleness = max_staleness
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+
+        self._entries = {}  # type: Dict[str, Dict[str, _Entry]]
+        self._generation = 0
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def _get_generation(self, endpoint: str) -> tuple:
+        """Get generation of the account of the endpoint, changed by every
+        invalidation of the account. Call it with the lock held."""
+        account_id = get_account_id(endpoint)
+
+        return self._generation, self._generations.get(account_id, 0)
+
+    def _lookup(self, endpoint: str, key: str) -> tuple:
+        """Find the cached response.
+
+        Returns:
+            Tuple of the fresh response (or None), stale entry (or None) and
+            the generation of the account. Fresh responses are counted as
+            hits, the rest as misses.
+        """
+        ttl = self.ttls.get(get_endpoint_template(endpoint))
+
+        with self._lock:
+            generation = self._get_generation(endpoint)
+            entry = self._entries.get(get_account_id(endpoint), {}).get(key)
+
+            if entry is not None and \
+                    time.monotonic() - entry.received < ttl:
+                self.hits += 1
+                return entry.response, None, generation
+
+            self.misses += 1
+
+            return None, entry, generation
+
+    def _store(self, endpoint: str, key: str, generation: tuple,
+               response: requests.Response) \
+            -> None:
+        """Store the successful response unless the account was
+        invalidated meanwhile."""
+        if response.status_code >= 400:
+            return
+
+        with self._lock:
+            if self._get_generation(endpoint) != generation:
+                return
+
+            now = time.monotonic()
+            entries = self._entries.setdefault(get_account_id(endpoint), {})
+            entries[key] = _Entry(response, now)
+
+            if len(entries) > PRUNE_SIZE:
+                max_age = max(self.ttls.values()) + self.max_staleness
+
+                for key, entry in list(entries.items()):
+                    if now - entry.received > max_age:
+                        del entries[key]
+
+    def _get_stale(self, entry: "_Entry") -> requests.Response:
+        """Get the stale response if it isn't older than 'max_staleness',
+        otherwise None."""
+        if entry is None or \
+                time.monotonic() - entry.received > self.max_staleness:
+            return None
+
+        with self._lock:
+            self.stale_hits += 1
+
+        return entry.response
+
+    def is_cached(self, endpoint: str) -> bool:
+        """Check if responses of the endpoint are cached."""
+        return get_endpoint_template(endpoint) in self.ttls
+
+    def call(self, endpoint: str, key: str,
+             function: Callable[[], requests.Response]) \
+            -> requests.Response:
+        """Return the fresh cached response or call the function.
+
+        Arguments:
+            endpoint:
+                Suffix for a URL.
+            key:
+                Key of the request, see 'get_request_key'.
+            function:
+                Function sending the request.
+
+        Returns:
+            HTTP Response object from the 'requests' package.
+        """
+        if not self.is_cached(endpoint):
+            return function()
+
+        response, entry, generation = self._lookup(endpoint, key)
+
+        if response is not None:
+            return response
+
+        try:
+            response = function()
+        except (requests.ConnectionError, requests.Timeout):
+            stale_response = self._get_stale(entry)
+
+            if stale_response is None:
+                raise
+
+            return stale_response
+
+        if response.status_code >= 500:
+            stale_response = self._get_stale(entry)
+
+            return response if stale_response is None else stale_response
+
+        self._store(endpoint, key, generation, response)
+
+        return response
+
+    async def call_async(self, endpoint: str, key: str,
+                         function: Callable[[],
+                                            Awaitable[requests.Response]]) \
+            -> requests.Response:
+        """Asynchronous variant of the 'call' method."""
+        if not self.is_cached(endpoint):
+            return await function()
+
+        response, entry, generation = self._lookup(endpoint, key)
+
+        if response is not None:
+            return response
+
+        try:
+            response = await function()
+        except (requests.ConnectionError, requests.Timeout):
+            stale_response = self._get_stale(entry)
+
+            if stale_response is None:
+                raise
+
+            return stale_response
+
+        if response.status_code >= 500:
+            stale_response = self._get_stale(entry)
+
+            return response if stale_response is None else stale_response
+
+        self._store(endpoint, key, generation, response)
+
+        return response
+
+    def invalidate(self, endpoint: str = "") -> None:
+        """Drop the cached responses of the account of the endpoint.
+
+        Arguments:
+            endpoint:
+                Any endpoint of the account, all accounts by default.
+        """
+        account_id = get_account_id(endpoint)
+
+        with self._lock:
+            if not account_id:
+                self._entries.clear()
+                self._generation += 1
+                return
+
+            self._generations[account_id] = \
+                self._generations.get(account_id, 0) + 1
+            self._entries.pop(account_id, None)
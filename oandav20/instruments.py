@@ -0,0 +1,506 @@
+import asyncio
+import inspect
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+from typing import Any, FrozenSet, Iterable, List, Optional
+
+BONDS = {
+    "Bund": "DE10YB_EUR",
+    "UK 10Y Gilt": "UK10YB_GBP",
+    "US 10Y T-Note": "USB10Y_USD",
+    "US 2Y T-Note": "USB02Y_USD",
+    "US 5Y T-Note": "USB05Y_USD",
+    "US T-Bond": "USB30Y_USD"
+}
+
+COMMODITIES = {
+    "Brent Crude Oil": "BCO_USD",
+    "Corn": "CORN_USD",
+    "Natural Gas": "NATGAS_USD",
+    "Soybeans": "SOYBN_USD",
+    "Sugar": "SUGAR_USD",
+    "West Texas Oil": "WTICO_USD",
+    "Wheat": "WHEAT_USD"
+}
+
+FOREX = {
+    "AUD/CAD": "AUD_CAD",
+    "AUD/CHF": "AUD_CHF",
+    "AUD/HKD": "AUD_HKD",
+    "AUD/JPY": "AUD_JPY",
+    "AUD/NZD": "AUD_NZD",
+    "AUD/SGD": "AUD_SGD",
+    "AUD/USD": "AUD_USD",
+    "CAD/CHF": "CAD_CHF",
+    "CAD/HKD": "CAD_HKD",
+    "CAD/JPY": "CAD_JPY",
+    "CAD/SGD": "CAD_SGD",
+    "CHF/HKD": "CHF_HKD",
+    "CHF/JPY": "CHF_JPY",
+    "CHF/ZAR": "CHF_ZAR",
+    "EUR/AUD": "EUR_AUD",
+    "EUR/CAD": "EUR_CAD",
+    "EUR/CHF": "EUR_CHF",
+    "EUR/CZK": "EUR_CZK",
+    "EUR/DKK": "EUR_DKK",
+    "EUR/GBP": "EUR_GBP",
+    "EUR/HKD": "EUR_HKD",
+    "EUR/HUF": "EUR_HUF",
+    "EUR/JPY": "EUR_JPY",
+    "EUR/NOK": "EUR_NOK",
+    "EUR/NZD": "EUR_NZD",
+    "EUR/PLN": "EUR_PLN",
+    "EUR/SEK": "EUR_SEK",
+    "EUR/SGD": "EUR_SGD",
+    "EUR/TRY": "EUR_TRY",
+    "EUR/USD": "EUR_USD",
+    "EUR/ZAR": "EUR_ZAR",
+    "GBP/AUD": "GBP_AUD",
+    "GBP/CAD": "GBP_CAD",
+    "GBP/CHF": "GBP_CHF",
+    "GBP/HKD": "GBP_HKD",
+    "GBP/JPY": "GBP_JPY",
+    "GBP/NZD": "GBP_NZD",
+    "GBP/PLN": "GBP_PLN",
+    "GBP/SGD": "GBP_SGD",
+    "GBP/USD": "GBP_USD",
+    "GBP/ZAR": "GBP_ZAR",
+    "HKD/JPY": "HKD_JPY",
+    "NZD/CAD": "NZD_CAD",
+    "NZD/CHF": "NZD_CHF",
+    "NZD/HKD": "NZD_HKD",
+    "NZD/JPY": "NZD_JPY",
+    "NZD/SGD": "NZD_SGD",
+    "NZD/USD": "NZD_USD",
+    "SGD/CHF": "SGD_CHF",
+    "SGD/HKD": "SGD_HKD",
+    "SGD/JPY": "SGD_JPY",
+    "TRY/JPY": "TRY_JPY",
+    "USD/CAD": "USD_CAD",
+    "USD/CHF": "USD_CHF",
+    "USD/CNH": "USD_CNH",
+    "USD/CZK": "USD_CZK",
+    "USD/DKK": "USD_DKK",
+    "USD/HKD": "USD_HKD",
+    "USD/HUF": "USD_HUF",
+    "USD/INR": "USD_INR",
+    "USD/JPY": "USD_JPY",
+    "USD/MXN": "USD_MXN",
+    "USD/NOK": "USD_NOK",
+    "USD/PLN": "USD_PLN",
+    "USD/SAR": "USD_SAR",
+    "USD/SEK": "USD_SEK",
+    "USD/SGD": "USD_SGD",
+    "USD/THB": "USD_THB",
+    "USD/TRY": "USD_TRY",
+    "USD/ZAR": "USD_ZAR",
+    "ZAR/JPY": "ZAR_JPY"
+}
+
+INDICES = {
+    "Australia 200": "AU200_AUD",
+    "Europe 50": "EU50_EUR",
+    "France 40": "FR40_EUR",
+    "Germany 30": "DE30_EUR",
+    "Hong Kong 33": "HK33_HKD",
+    "Japan 255": "JP225_USD",
+    "Netherlands 25": "NL25_EUR",
+    "Singapore 30": "SG30_SGD",
+    "Swiss 20": "CH20_CHF",
+    "UK 100": "UK100_GBP",
+    "US Nas 100": "NAS100_USD",
+    "US Russ 2000": "US2000_USD",
+    "US SPX 500": "SPX500_USD",
+    "US Wall St 30": "US30_USD"
+}
+
+METALS = {
+    "Copper": "XCU_USD",
+    "Gold": "XAU_USD",
+    "Gold/AUD": "XAU_AUD",
+    "Gold/CAD": "XAU_CAD",
+    "Gold/CHF": "XAU_CHF",
+    "Gold/EUR": "XAU_EUR",
+    "Gold/GBP": "XAU_GBP",
+    "Gold/HKD": "XAU_HKD",
+    "Gold/JPY": "XAU_JPY",
+    "Gold/NZD": "XAU_NZD",
+    "Gold/SGD": "XAU_SGD",
+    "Gold/Silver": "XAU_XAG",
+    "Palladium": "XPD_USD",
+    "Platinum": "XPT_USD",
+    "Silver": "XAG_USD",
+    "Silver/AUD": "XAG_AUD",
+    "Silver/CAD": "XAG_CAD",
+    "Silver/CHF": "XAG_CHF",
+    "Silver/EUR": "XAG_EUR",
+    "Silver/GBP": "XAG_GBP",
+    "Silver/HKD": "XAG_HKD",
+    "Silver/JPY": "XAG_JPY",
+    "Silver/NZD": "XAG_NZD",
+    "Silver/SGD": "XAG_SGD"
+}
+
+# All instruments, keys represent human values and values instrument codes.
+
+INSTRUMENTS = {}
+
+for _instruments in [BONDS, COMMODITIES, FOREX, INDICES, METALS]:
+    INSTRUMENTS.update(_instruments)
+
+InstrumentInfo = namedtuple(
+    "InstrumentInfo",
+    ["code", "display_name", "asset_class", "base_currency",
+     "quote_currency"])
+InstrumentInfo.__doc__ = """Static details of an instrument.
+
+Attributes:
+    code (str):
+        Instrument code, for example "EUR_USD".
+    display_name (str):
+        Human value, for example "EUR/USD".
+    asset_class (str):
+        One of "BOND", "COMMODITY", "FOREX", "INDEX" or "METAL".
+    base_currency (str):
+        Base currency or the underlying for the non-forex instruments, for
+        example "EUR" or "DE30".
+    quote_currency (str):
+        Quote currency, for example "USD".
+"""
+
+ASSET_CLASSES = {
+    "BOND": BONDS,
+    "COMMODITY": COMMODITIES,
+    "FOREX": FOREX,
+    "INDEX": INDICES,
+    "METAL": METALS
+}
+
+# Index of all instruments by their codes.
+
+INSTRUMENT_INDEX = {
+    code: InstrumentInfo(code, display_name, asset_class,
+                         *code.split("_", 1))
+    for asset_class, instruments in ASSET_CLASSES.items()
+    for display_name, code in instruments.items()
+}
+
+INSTRUMENT_CODES = frozenset(INSTRUMENT_INDEX)
+
+# Index of instrument codes by the base and quote currencies.
+
+CURRENCY_INDEX = {}
+
+for _info in INSTRUMENT_INDEX.values():
+    for _currency in [_info.base_currency, _info.quote_currency]:
+        CURRENCY_INDEX.setdefault(_currency, set()).add(_info.code)
+
+CURRENCY_INDEX = {currency: frozenset(codes) for currency, codes in
+                  CURRENCY_INDEX.items()}
+
+
+def validate_instruments(codes: Iterable[str],
+                         valid_codes: FrozenSet[str] = INSTRUMENT_CODES) \
+        -> None:
+    """Check if all the given instrument codes are valid.
+
+    Arguments:
+        codes:
+            Instrument codes.
+        valid_codes:
+            Set of the valid codes, the hard-coded INSTRUMENTS by default.
+
+    Raises:
+        ValueError:
+            Invalid instrument code.
+    """
+    for code in codes:
+        if code not in valid_codes:
+            raise ValueError("Invalid instrument code '{}'.".format(code))
+
+
+def get_instruments_by_currency(currency: str,
+                                codes: FrozenSet[str] = INSTRUMENT_CODES) \
+        -> FrozenSet[str]:
+    """Get codes of all instruments with the given base or quote currency.
+
+    Arguments:
+        currency:
+            Currency code, for example "USD".
+        codes:
+            Set of the instrument codes to search, the hard-coded
+            INSTRUMENTS by default.
+
+    Returns:
+        Set of the instrument codes, empty for unknown currency.
+    """
+    if codes is INSTRUMENT_CODES:
+        return CURRENCY_INDEX.get(currency, frozenset())
+
+    return frozenset(code for code in codes
+                     if currency in code.split("_", 1))
+
+
+# Number of seconds before the next attempt, if a background refresh failed.
+
+RETRY_DELAY = 60.0
+
+
+class InstrumentRegistry:
+    """InstrumentRegistry holds the tradeable instruments obtained by the
+    'get_instruments' method.
+
+    The hard-coded INSTRUMENTS may be outdated, so after calling the 'load'
+    method the instrument codes are validated against the actual list from
+    Oanda. Until then the INSTRUMENTS are used. Every Oanda object has its
+    own registry in the 'instrument_registry' attribute.
+
+    Once the details are older than 'ttl' seconds, they are refreshed in
+    the background by the next validation, so the validation never waits
+    for a request. If 'path' is given, the details are also saved to that
+    file and the next 'load' uses it without any request while it's fresh.
+
+    With the AsyncOanda object the 'load' and 'refresh' methods return a
+    coroutine which must be awaited.
+
+    Example:
+        >>> o.instrument_registry.path = "instruments.json"
+        >>> o.instrument_registry.load()
+        >>> o.instrument_registry.get("EUR_USD")["pipLocation"]
+        -4
+
+    Attributes:
+        account_id (str):
+            Oanda trading account ID used for the 'get_instruments' method.
+        error (Exception):
+            Exception raised by the last failed background refresh.
+        loaded_at (float):
+            Unix time of the obtained details, 0 if not loaded.
+        oanda (Oanda):
+            Oanda or AsyncOanda object used for the requests.
+        path (str):
+            Path to the JSON file with saved details, empty for no file.
+        ttl (float):
+            Number of seconds after which the details are refreshed.
+    """
+
+    def __init__(self, oanda: Any, ttl: float = 3600.0, path: str = "",
+                 account_id: str = "") \
+            -> None:
+        """Initialize an instance of class InstrumentRegistry.
+
+        Arguments:
+            oanda:
+                Oanda or AsyncOanda object used for the requests.
+            ttl:
+                Number of seconds after which the details are refreshed.
+            path:
+                Path to the JSON file with saved details.
+            account_id:
+                Oanda trading account ID, otherwise 'default_id' of the
+                Oanda object will be used.
+        """
+        self.oanda = oanda
+        self.ttl = ttl
+        self.path = path
+        self.account_id = account_id
+        self.loaded_at = 0.0
+
+        self.error = None
+
+        self._instruments = {}
+        self._codes = INSTRUMENT_CODES
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._retry_at = 0.0
+        self._task = None
+
+    def __contains__(self, code: str) -> bool:
+        self._check_expiration()
+
+        return code in self._codes
+
+    @property
+    def codes(self) -> FrozenSet[str]:
+        """Set of all valid instrument codes."""
+        return self._codes
+
+    def get(self, code: str) -> Optional[dict]:
+        """Get details of the given instrument.
+
+        Arguments:
+            code:
+                Instrument code.
+
+        Returns:
+            JSON object (dict) like one item of the 'get_instruments'
+            method or None if not loaded or unknown.
+        """
+        self._check_expiration()
+
+        return self._instruments.get(code)
+
+    def validate(self, codes: Iterable[str]) -> None:
+        """Check if all the given instrument codes are valid.
+
+        Arguments:
+            codes:
+                Instrument codes.
+
+        Raises:
+            ValueError:
+                Invalid instrument code.
+        """
+        self._check_expiration()
+        validate_instruments(codes, self._codes)
+
+    def get_by_currency(self, currency: str) -> FrozenSet[str]:
+        """Get codes of all valid instruments with the given base or quote
+        currency.
+
+        Arguments:
+            currency:
+                Currency code, for example "USD".
+
+        Returns:
+            Set of the instrument codes, empty for unknown currency.
+        """
+        self._check_expiration()
+
+        return get_instruments_by_currency(currency, self._codes)
+
+    def load(self) -> Any:
+        """Load the details from the file if it's fresh, otherwise from
+        Oanda.
+
+        Raises:
+            requests.HTTPError:
+                HTTP response status code is 4xx or 5xx.
+        """
+        if self._is_async():
+            return self._load_async()
+
+        if not self._load_file():
+            self.refresh()
+
+    def refresh(self) -> Any:
+        """Obtain the details from Oanda.
+
+        Raises:
+            requests.HTTPError:
+                HTTP response status code is 4xx or 5xx.
+        """
+        if self._is_async():
+            return self._refresh_async()
+
+        account_id = self.account_id or self.oanda.default_id
+        response = self.oanda.get_instruments(account_id=account_id)
+        self.update(response["instruments"])
+
+    def update(self, instruments: List[dict], loaded_at: float = 0.0,
+               save: bool = True) \
+            -> None:
+        """Replace the details by the given ones.
+
+        Arguments:
+            instruments:
+                The "instruments" key from the 'get_instruments' method.
+            loaded_at:
+                Unix time of the obtained details, now by default.
+            save:
+                Save the details to the file, if the 'path' is set.
+        """
+        self.loaded_at = loaded_at or time.time()
+        self._instruments = {
+            instrument["name"]: instrument for instrument in instruments}
+        self._codes = frozenset(self._instruments)
+
+        if save and self.path:
+            temporary_path = self.path + ".tmp"
+
+            with open(temporary_path, "w") as f:
+                json.dump({"time": self.loaded_at,
+                           "instruments": instruments}, f)
+
+            os.replace(temporary_path, self.path)
+
+    async def _load_async(self) -> None:
+        if not self._load_file():
+            await self._refresh_async()
+
+    async def _refresh_async(self) -> None:
+        account_id = self.account_id or self.oanda.default_id
+        response = await self.oanda.get_instruments(account_id=account_id)
+        self.update(response["instruments"])
+
+    def _is_async(self) -> bool:
+        return inspect.iscoroutinefunction(self.oanda.send_request)
+
+    def _load_file(self) -> bool:
+        """Load the details from the file, return True if they are fresh.
+        """
+        if not self.path or not os.path.exists(self.path):
+            return False
+
+        try:
+            with open(self.path) as f:
+                saved = json.load(f)
+
+            self.update(saved["instruments"], saved["time"], save=False)
+        except (ValueError, KeyError):
+            return False
+
+        return time.time() - self.loaded_at < self.ttl
+
+    def _check_expiration(self) -> None:
+        """Start the background refresh once the details expired.
+
+        With the AsyncOanda object the refresh is scheduled only from a
+        running event loop, otherwise the next validation tries again.
+        """
+        now = time.time()
+
+        if not self.loaded_at or self._refreshing or \
+                now - self.loaded_at < self.ttl or now < self._retry_at:
+            return
+
+        with self._lock:
+            if self._refreshing:
+                return
+
+            if self._is_async():
+                try:
+                    loop = asyncio.get_event_loop()
+                except RuntimeError:
+                    return
+
+                if not loop.is_running():
+                    return
+
+                self._refreshing = True
+                self._task = loop.create_task(self._refresh_in_background())
+            else:
+                self._refreshing = True
+                threading.Thread(target=self._refresh_in_background_thread,
+                                 daemon=True).start()
+
+    async def _refresh_in_background(self) -> None:
+        try:
+            await self._refresh_async()
+        except Exception as error:
+            self.error = error
+            self._retry_at = time.time() + RETRY_DELAY
+        finally:
+            self._refreshing = False
+
+    def _refresh_in_background_thread(self) -> None:
+        try:
+            self.refresh()
+        except Exception as error:
+            self.error = error
+            self._retry_at = time.time() + RETRY_DELAY
+        finally:
+            self._refreshing = False
@@ -0,0 +1,283 @@
+import json
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Tuple
+
+# Upper bounds of the latency histogram buckets in seconds.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                   10.0, float("inf"))
+
+# Path segments followed by an instrument code.
+
+INSTRUMENT_SEGMENTS = frozenset(["instruments", "positions"])
+
+
+@lru_cache(maxsize=1024)
+def get_endpoint_template(endpoint: str) -> str:
+    """Replace the IDs and instrument codes in the endpoint by placeholders.
+
+    Example:
+        >>> get_endpoint_template("/101-004-3881593-001/orders/@foo/cancel")
+        '/{id}/orders/{id}/cancel'
+    """
+    segments = endpoint.split("/")
+
+    for index, segment in enumerate(segments):
+        if index == 1 or segment.isdigit() or segment.startswith("@"):
+            segments[index] = "{id}"
+        elif index > 1 and segments[index - 1] in INSTRUMENT_SEGMENTS:
+            segments[index] = "{instrument}"
+
+    return "/".join(segments)
+
+
+def get_body_size(kwargs: Dict[str, Any]) -> int:
+    """Get size of the request body in bytes from the request keyword
+    arguments.
+    """
+    if kwargs.get("json") is not None:
+        return len(json.dumps(kwargs["json"]).encode())
+
+    data = kwargs.get("data")
+
+    if isinstance(data, str):
+        return len(data.encode())
+
+    if isinstance(data, bytes):
+        return len(data)
+
+    return 0
+
+
+class EndpointStats:
+    """Statistics of the requests to one endpoint.
+
+    Attributes:
+        bytes_received (int):
+            Total size of the response bodies.
+        bytes_sent (int):
+            Total size of the request bodies.
+        count (int):
+            Number of requests.
+        errors (int):
+            Number of requests failed by a connection error or with status
+            code 4xx or 5xx.
+        latency_buckets (List[int]):
+            Number of requests per bucket of the LATENCY_BUCKETS (not
+            cumulative).
+        latency_sum (float):
+            Total duration of the requests in seconds.
+        retries (int):
+            Number of repeated requests.
+        statuses (Dict[int, int]):
+            Number of responses per status code, 0 for connection error.
+    """
+
+    __slots__ = ["bytes_received", "bytes_sent", "count", "errors",
+                 "latency_buckets", "latency_sum", "retries", "statuses"]
+
+    def __init__(self) -> None:
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self.count = 0
+        self.errors = 0
+        self.latency_buckets = [0] * len(LATENCY_BUCKETS)
+        self.latency_sum = 0.0
+        self.retries = 0
+        self.statuses = {}
+
+    def to_dict(self) -> dict:
+        """Return the statistics as JSON object (dict)."""
+        cumulative = 0
+        buckets = {}
+
+        for bound, count in zip(LATENCY_BUCKETS, self.latency_buckets):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+
+        return {
+            "bytes_received": self.bytes_received,
+            "bytes_sent": self.bytes_sent,
+            "count": self.count,
+            "errors": self.errors,
+            "latency_buckets": buckets,
+            "latency_sum": self.latency_sum,
+            "retries": self.retries,
+            "statuses": {str(status): count
+                         for status, count in self.statuses.items()}
+        }
+
+
+class RequestMetrics:
+    """RequestMetrics records latency, sizes, status codes and retries of
+    the requests per endpoint.
+
+    The endpoints are grouped by templates, so for example all order
+    cancels are counted together as "PUT /{id}/orders/{id}/cancel".
+
+    The metrics are disabled by default, because the 'metrics' attribute of
+    the Oanda object is None, set it to RequestMetrics object to record the
+    requests.
+
+    Example:
+        >>> o.metrics = RequestMetrics()
+        >>> o.get_account_summary()
+        >>> o.metrics.snapshot()["GET /{id}/summary"]["count"]
+        1
+        >>> print(o.metrics.to_prometheus())
+        # HELP oandav20_request_duration_seconds ...
+    """
+
+    def __init__(self) -> None:
+        """Initialize an instance of class RequestMetrics."""
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, method: str, endpoint: str, status_code: int,
+               elapsed: float, bytes_sent: int = 0, bytes_received: int = 0,
+               retry: bool = False) \
+            -> None:
+        """Record one request.
+
+        Arguments:
+            method:
+                HTTP method written in capital letters.
+            endpoint:
+                Suffix for a URL, the IDs are replaced by placeholders.
+            status_code:
+                HTTP response status code, 0 for connection error.
+            elapsed:
+                Duration of the request in seconds.
+            bytes_sent:
+                Size of the request body.
+            bytes_received:
+                Size of the response body.
+            retry:
+                The request is a repeated one.
+        """
+        key = (method, get_endpoint_template(endpoint))
+        bucket = 0
+
+        while elapsed > LATENCY_BUCKETS[bucket]:
+            bucket += 1
+
+        with self._lock:
+            stats = self._stats.get(key)
+
+            if stats is None:
+                stats = self._stats[key] = EndpointStats()
+
+            stats.count += 1
+            stats.latency_sum += elapsed
+            stats.latency_buckets[bucket] += 1
+            stats.bytes_sent += bytes_sent
+            stats.bytes_received += bytes_received
+            stats.statuses[status_code] = \
+                stats.statuses.get(status_code, 0) + 1
+
+            if status_code == 0 or status_code >= 400:
+                stats.errors += 1
+
+            if retry:
+                stats.retries += 1
+
+    def reset(self) -> None:
+        """Remove all recorded statistics."""
+        with self._lock:
+            self._stats = {}
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Get copy of the statistics.
+
+        Returns:
+            JSON object (dict) with the statistics per "METHOD template",
+            the latency buckets are cumulative.
+
+        Example:
+            {
+                "GET /{id}/summary": {
+                    "bytes_received": 1024,
+                    "bytes_sent": 0,
+                    "count": 2,
+                    "errors": 0,
+                    "latency_buckets": {
+                        "0.005": 0,
+                        "0.01": 0,
+                        "0.025": 0,
+                        "0.05": 1,
+                        ...
+                        "inf": 2
+                    },
+                    "latency_sum": 0.0923,
+                    "retries": 0,
+                    "statuses": {
+                        "200": 2
+                    }
+                }
+            }
+        """
+        with self._lock:
+            return {"{0} {1}".format(*key): stats.to_dict()
+                    for key, stats in sorted(self._stats.items())}
+
+    def to_prometheus(self) -> str:
+        """Get the statistics in the Prometheus text exposition format."""
+        with self._lock:
+            items = [(key, stats.to_dict())
+                     for key, stats in sorted(self._stats.items())]
+
+        lines = []
+        metrics = [
+            ("oandav20_request_duration_seconds", "histogram",
+             "Duration of the requests to Oanda."),
+            ("oandav20_request_errors_total", "counter",
+             "Number of failed requests to Oanda."),
+            ("oandav20_request_retries_total", "counter",
+             "Number of repeated requests to Oanda."),
+            ("oandav20_request_sent_bytes_total", "counter",
+             "Size of the request bodies."),
+            ("oandav20_request_received_bytes_total", "counter",
+             "Size of the response bodies."),
+            ("oandav20_responses_total", "counter",
+             "Number of responses per status code, 0 for connection error.")
+        ]
+
+        for name, metric_type, description in metrics:
+            lines.append("# HELP {0} {1}".format(name, description))
+            lines.append("# TYPE {0} {1}".format(name, metric_type))
+
+            for key, stats in items:
+                lines.extend(self._format_metric(name, key, stats))
+
+        return "\n".join(lines) + "\n"
+
+    def _format_metric(self, name: str, key: Tuple[str, str], stats: dict) \
+            -> list:
+        labels = 'method="{0}",endpoint="{1}"'.format(*key)
+
+        if name == "oandav20_request_duration_seconds":
+            lines = [
+                '{0}_bucket{{{1},le="{2}"}} {3}'.format(
+                    name, labels, "+Inf" if bound == "inf" else bound, count)
+                for bound, count in stats["latency_buckets"].items()]
+            lines.append("{0}_sum{{{1}}} {2}".format(
+                name, labels, stats["latency_sum"]))
+            lines.append("{0}_count{{{1}}} {2}".format(
+                name, labels, stats["count"]))
+
+            return lines
+
+        if name == "oandav20_responses_total":
+            return ['{0}{{{1},status="{2}"}} {3}'.format(
+                name, labels, status, count)
+                for status, count in stats["statuses"].items()]
+
+        values = {
+            "oandav20_request_errors_total": stats["errors"],
+            "oandav20_request_retries_total": stats["retries"],
+            "oandav20_request_sent_bytes_total": stats["bytes_sent"],
+            "oandav20_request_received_bytes_total": stats["bytes_received"]
+        }
+
+        return ["{0}{{{1}}} {2}".format(name, labels, values[name])]
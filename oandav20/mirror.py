@@ -0,0 +1,230 @@
+import threading
+from typing import List
+
+# Keys of the 'state' object which are lists, the rest are account values.
+
+STATE_LISTS = ["orders", "positions", "trades"]
+
+
+class AccountMirror:
+    """AccountMirror keeps a local copy of the full account details.
+
+    The account is loaded once by the 'get_account' method and then only
+    the changes since the last known transaction are requested via the
+    'get_account_changes' method and applied in place. The 'account'
+    attribute has the same structure like the "account" key returned by the
+    'get_account' method.
+
+    Example:
+        >>> mirror = AccountMirror(o)
+        >>> mirror.refresh()  # full account details
+        >>> ...
+        >>> mirror.refresh()  # only changes
+        >>> mirror.account["NAV"]
+        '43650.78835'
+
+    Attributes:
+        account (dict):
+            Full account details, None before the first refresh.
+        account_id (str):
+            Oanda trading account ID.
+        error (Exception):
+            Last exception raised by the refresh in the background thread.
+        last_transaction_id (str):
+            ID of the last transaction applied to the account.
+        lock (threading.RLock):
+            Lock held while the account is being updated, hold it while
+            reading more values at once from another thread.
+        oanda (Oanda):
+            Oanda object used for the requests.
+    """
+
+    def __init__(self, oanda: "Oanda", account_id: str = "") -> None:
+        """Initialize an instance of class AccountMirror.
+
+        Arguments:
+            oanda:
+                Oanda object (not AsyncOanda) used for the requests.
+            account_id:
+                Oanda trading account ID, otherwise 'default_id' of the
+                Oanda object will be used.
+        """
+        self.oanda = oanda
+        self.account_id = account_id or oanda.default_id
+        self.account = None
+        self.error = None
+        self.last_transaction_id = None
+        self.lock = threading.RLock()
+
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def load(self) -> None:
+        """Load the full account details.
+
+        Raises:
+            requests.HTTPError:
+                HTTP response status code is 4xx or 5xx.
+        """
+        response = self.oanda.get_account(self.account_id)
+
+        with self.lock:
+            self.account = response["account"]
+            self.last_transaction_id = response["lastTransactionID"]
+
+    def refresh(self) -> None:
+        """Update the account details by the changes since the last
+        transaction, the first call loads the full account details.
+
+        Raises:
+            requests.HTTPError:
+                HTTP response status code is 4xx or 5xx.
+        """
+        if self.account is None:
+            self.load()
+            return
+
+        response = self.oanda.get_account_changes(
+            self.last_transaction_id, self.account_id)
+
+        with self.lock:
+            self.apply(response["changes"], response["state"])
+            self.last_transaction_id = response["lastTransactionID"]
+            self.account["lastTransactionID"] = self.last_transaction_id
+
+    def start(self, interval: float = 1.0) -> None:
+        """Refresh the account in a background thread.
+
+        Failed refreshes don't stop the thread, the last exception is
+        stored in the 'error' attribute.
+
+        Arguments:
+            interval:
+                Number of seconds between the refreshes.
+
+        Raises:
+            requests.HTTPError:
+                HTTP response status code of the first load is 4xx or 5xx.
+        """
+        if self.account is None:
+            self.load()
+
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(interval,), daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        self._stopped.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def apply(self, changes: dict, state: dict) -> None:
+        """Apply the account changes and state to the account details.
+
+        Arguments:
+            changes:
+                The "changes" key from the 'get_account_changes' method.
+            state:
+                The "state" key from the 'get_account_changes' method.
+        """
+        account = self.account
+
+        with self.lock:
+            # Orders
+
+            orders = account.setdefault("orders", [])
+            orders.extend(changes.get("ordersCreated", []))
+            finished_ids = set(
+                order["id"] for key in
+                ["ordersCancelled", "ordersFilled", "ordersTriggered"]
+                for order in changes.get(key, []))
+            orders[:] = [order for order in orders
+                         if order["id"] not in finished_ids and
+                         order.get("state", "PENDING") == "PENDING"]
+
+            # Trades
+
+            trades = account.setdefault("trades", [])
+            trades.extend(changes.get("tradesOpened", []))
+            self._replace_items(trades, changes.get("tradesReduced", []),
+                                "id")
+            closed_ids = set(
+                trade["id"] for trade in changes.get("tradesClosed", []))
+            trades[:] = [trade for trade in trades
+                         if trade["id"] not in closed_ids]
+
+            # Positions
+
+            positions = account.setdefault("positions", [])
+            self._replace_items(positions, changes.get("positions", []),
+                                "instrument")
+
+            # Actual state (unrealized profits, margin etc.)
+
+            for key, value in state.items():
+                if key not in STATE_LISTS:
+                    account[key] = value
+
+            self._update_items(orders, state.get("orders", []), "id")
+            self._update_items(trades, state.get("trades", []), "id")
+
+            for position_state in state.get("positions", []):
+                for position in positions:
+                    if position["instrument"] == \
+                            position_state["instrument"]:
+                        self._update_position(position, position_state)
+
+            account["pendingOrderCount"] = len(orders)
+            account["openTradeCount"] = len(trades)
+            account["openPositionCount"] = len(
+                [position for position in positions
+                 if position["long"]["units"] not in ["0", "0.0"] or
+                 position["short"]["units"] not in ["0", "0.0"]])
+
+    def _run(self, interval: float) -> None:
+        while not self._stopped.wait(interval):
+            try:
+                self.refresh()
+            except Exception as error:
+                self.error = error
+
+    def _replace_items(self, items: List[dict], new_items: List[dict],
+                       key: str) \
+            -> None:
+        indexes = {item[key]: index for index, item in enumerate(items)}
+
+        for new_item in new_items:
+            if new_item[key] in indexes:
+                items[indexes[new_item[key]]] = new_item
+            else:
+                indexes[new_item[key]] = len(items)
+                items.append(new_item)
+
+    def _update_items(self, items: List[dict], states: List[dict],
+                      key: str) \
+            -> None:
+        indexes = {item[key]: item for item in items}
+
+        for item_state in states:
+            if item_state[key] in indexes:
+                indexes[item_state[key]].update(item_state)
+
+    def _update_position(self, position: dict, position_state: dict) \
+            -> None:
+        if "netUnrealizedPL" in position_state:
+            position["unrealizedPL"] = position_state["netUnrealizedPL"]
+
+        if "longUnrealizedPL" in position_state:
+            position["long"]["unrealizedPL"] = \
+                position_state["longUnrealizedPL"]
+
+        if "shortUnrealizedPL" in position_state:
+            position["short"]["unrealizedPL"] = \
+                position_state["shortUnrealizedPL"]
+
+        if "marginUsed" in position_state:
+            position["marginUsed"] = position_state["marginUsed"]
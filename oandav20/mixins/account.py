@@ -1,143 +1,8 @@
 from typing import List, Union
 
-INSTRUMENTS = {
-    # Bonds
-
-    "Bund": "DE10YB_EUR",
-    "UK 10Y Gilt": "UK10YB_GBP",
-    "US 10Y T-Note": "USB10Y_USD",
-    "US 2Y T-Note": "USB02Y_USD",
-    "US 5Y T-Note": "USB05Y_USD",
-    "US T-Bond": "USB30Y_USD",
-
-    # Commodities
-
-    "Brent Crude Oil": "BCO_USD",
-    "Corn": "CORN_USD",
-    "Natural Gas": "NATGAS_USD",
-    "Soybeans": "SOYBN_USD",
-    "Sugar": "SUGAR_USD",
-    "West Texas Oil": "WTICO_USD",
-    "Wheat": "WHEAT_USD",
-
-    # Forex
-
-    "AUD/CAD": "AUD_CAD",
-    "AUD/CHF": "AUD_CHF",
-    "AUD/HKD": "AUD_HKD",
-    "AUD/JPY": "AUD_JPY",
-    "AUD/NZD": "AUD_NZD",
-    "AUD/SGD": "AUD_SGD",
-    "AUD/USD": "AUD_USD",
-    "CAD/CHF": "CAD_CHF",
-    "CAD/HKD": "CAD_HKD",
-    "CAD/JPY": "CAD_JPY",
-    "CAD/SGD": "CAD_SGD",
-    "CHF/HKD": "CHF_HKD",
-    "CHF/JPY": "CHF_JPY",
-    "CHF/ZAR": "CHF_ZAR",
-    "EUR/AUD": "EUR_AUD",
-    "EUR/CAD": "EUR_CAD",
-    "EUR/CHF": "EUR_CHF",
-    "EUR/CZK": "EUR_CZK",
-    "EUR/DKK": "EUR_DKK",
-    "EUR/GBP": "EUR_GBP",
-    "EUR/HKD": "EUR_HKD",
-    "EUR/HUF": "EUR_HUF",
-    "EUR/JPY": "EUR_JPY",
-    "EUR/NOK": "EUR_NOK",
-    "EUR/NZD": "EUR_NZD",
-    "EUR/PLN": "EUR_PLN",
-    "EUR/SEK": "EUR_SEK",
-    "EUR/SGD": "EUR_SGD",
-    "EUR/TRY": "EUR_TRY",
-    "EUR/USD": "EUR_USD",
-    "EUR/ZAR": "EUR_ZAR",
-    "GBP/AUD": "GBP_AUD",
-    "GBP/CAD": "GBP_CAD",
-    "GBP/CHF": "GBP_CHF",
-    "GBP/HKD": "GBP_HKD",
-    "GBP/JPY": "GBP_JPY",
-    "GBP/NZD": "GBP_NZD",
-    "GBP/PLN": "GBP_PLN",
-    "GBP/SGD": "GBP_SGD",
-    "GBP/USD": "GBP_USD",
-    "GBP/ZAR": "GBP_ZAR",
-    "HKD/JPY": "HKD_JPY",
-    "NZD/CAD": "NZD_CAD",
-    "NZD/CHF": "NZD_CHF",
-    "NZD/HKD": "NZD_HKD",
-    "NZD/JPY": "NZD_JPY",
-    "NZD/SGD": "NZD_SGD",
-    "NZD/USD": "NZD_USD",
-    "SGD/CHF": "SGD_CHF",
-    "SGD/HKD": "SGD_HKD",
-    "SGD/JPY": "SGD_JPY",
-    "TRY/JPY": "TRY_JPY",
-    "USD/CAD": "USD_CAD",
-    "USD/CHF": "USD_CHF",
-    "USD/CNH": "USD_CNH",
-    "USD/CZK": "USD_CZK",
-    "USD/DKK": "USD_DKK",
-    "USD/HKD": "USD_HKD",
-    "USD/HUF": "USD_HUF",
-    "USD/INR": "USD_INR",
-    "USD/JPY": "USD_JPY",
-    "USD/MXN": "USD_MXN",
-    "USD/NOK": "USD_NOK",
-    "USD/PLN": "USD_PLN",
-    "USD/SAR": "USD_SAR",
-    "USD/SEK": "USD_SEK",
-    "USD/SGD": "USD_SGD",
-    "USD/THB": "USD_THB",
-    "USD/TRY": "USD_TRY",
-    "USD/ZAR": "USD_ZAR",
-    "ZAR/JPY": "ZAR_JPY",
-
-    # Indices
-
-    "Australia 200": "AU200_AUD",
-    "Europe 50": "EU50_EUR",
-    "France 40": "FR40_EUR",
-    "Germany 30": "DE30_EUR",
-    "Hong Kong 33": "HK33_HKD",
-    "Japan 255": "JP225_USD",
-    "Netherlands 25": "NL25_EUR",
-    "Singapore 30": "SG30_SGD",
-    "Swiss 20": "CH20_CHF",
-    "UK 100": "UK100_GBP",
-    "US Nas 100": "NAS100_USD",
-    "US Russ 2000": "US2000_USD",
-    "US SPX 500": "SPX500_USD",
-    "US Wall St 30": "US30_USD",
-
-    # Metals
-
-    "Copper": "XCU_USD",
-    "Gold": "XAU_USD",
-    "Gold/AUD": "XAU_AUD",
-    "Gold/CAD": "XAU_CAD",
-    "Gold/CHF": "XAU_CHF",
-    "Gold/EUR": "XAU_EUR",
-    "Gold/GBP": "XAU_GBP",
-    "Gold/HKD": "XAU_HKD",
-    "Gold/JPY": "XAU_JPY",
-    "Gold/NZD": "XAU_NZD",
-    "Gold/SGD": "XAU_SGD",
-    "Gold/Silver": "XAU_XAG",
-    "Palladium": "XPD_USD",
-    "Platinum": "XPT_USD",
-    "Silver": "XAG_USD",
-    "Silver/AUD": "XAG_AUD",
-    "Silver/CAD": "XAG_CAD",
-    "Silver/CHF": "XAG_CHF",
-    "Silver/EUR": "XAG_EUR",
-    "Silver/GBP": "XAG_GBP",
-    "Silver/HKD": "XAG_HKD",
-    "Silver/JPY": "XAG_JPY",
-    "Silver/NZD": "XAG_NZD",
-    "Silver/SGD": "XAG_SGD"
-}
+# INSTRUMENTS used to be defined here, it's kept importable from this module.
+
+from oandav20.instruments import INSTRUMENTS
 
 
 class AccountMixin:
@@ -167,12 +32,7 @@ class AccountMixin:
                 HTTP response status code is 4xx or 5xx.
         """
         endpoint = ""
-        response = self.send_request(endpoint)
-
-        if response.status_code >= 400:
-            response.raise_for_status()
-
-        return response.json()
+        return self._request(endpoint)
 
     def get_account(self, account_id: str = "") -> dict:
         """Get full account details.
@@ -250,12 +110,7 @@ class AccountMixin:
         """
         account_id = account_id or self.default_id
         endpoint = "/{}".format(account_id)
-        response = self.send_request(endpoint)
-
-        if response.status_code >= 400:
-            response.raise_for_status()
-
-        return response.json()
+        return self._request(endpoint)
 
     def get_account_summary(self, account_id: str = "") -> dict:
         """Get short variant of account details.
@@ -308,12 +163,65 @@ class AccountMixin:
         """
         account_id = account_id or self.default_id
         endpoint = "/{}/summary".format(account_id)
-        response = self.send_request(endpoint)
+        return self._request(endpoint)
 
-        if response.status_code >= 400:
-            response.raise_for_status()
+    def get_account_changes(self, since_transaction_id: Union[int, str],
+                            account_id: str = "") \
+            -> dict:
+        """Get changes of the account since the given transaction.
+
+        Much smaller response than the 'get_account' method, which is
+        useful for keeping a local copy of the account up to date, see the
+        'AccountMirror' class.
+
+        Arguments:
+            since_transaction_id:
+                ID of the last known transaction, usually the
+                'lastTransactionID' key of the previous response.
+            account_id:
+                Oanda trading account ID, otherwise 'default_id' will be used.
 
-        return response.json()
+        Returns:
+            JSON object (dict) with the account changes and the actual
+            account state (unrealized profits, margin etc.).
+
+        Example:
+            {
+                "changes": {
+                    "ordersCancelled": [],
+                    "ordersCreated": [],
+                    "ordersFilled": [],
+                    "ordersTriggered": [],
+                    "positions": [],
+                    "tradesClosed": [],
+                    "tradesOpened": [],
+                    "tradesReduced": [],
+                    "transactions": []
+                },
+                "lastTransactionID": "6356",
+                "state": {
+                    "NAV": "43650.78835",
+                    "marginAvailable": "43650.78835",
+                    "marginUsed": "0.00000",
+                    "orders": [],
+                    "positionValue": "0.00000",
+                    "positions": [],
+                    "trades": [],
+                    "unrealizedPL": "0.00000",
+                    "withdrawalLimit": "43650.78835",
+                    ...
+                }
+            }
+
+        Raises:
+            requests.HTTPError:
+                HTTP response status code is 4xx or 5xx.
+        """
+        account_id = account_id or self.default_id
+        endpoint = "/{}/changes".format(account_id)
+        url_params = {"sinceTransactionID": str(since_transaction_id)}
+
+        return self._request(endpoint, params=url_params)
 
     def get_instruments(self, instruments: List[str] = [],
                         account_id: str = "") \
@@ -365,21 +273,10 @@ class AccountMixin:
         account_id = account_id or self.default_id
         endpoint = "/{}/instruments".format(account_id)
 
-        if instruments:
-            for code in instruments:
-                if code in INSTRUMENTS.values():
-                    continue
-                else:
-                    raise ValueError("Invalid instrument code '{}'".format(
-                        code))
+        self.instrument_registry.validate(instruments)
 
         url_params = {"instruments": ",".join(instruments)}
-        response = self.send_request(endpoint, params=url_params)
-
-        if response.status_code >= 400:
-            response.raise_for_status()
-
-        return response.json()
+        return self._request(endpoint, params=url_params)
 
     def configure_account(self, margin: Union[float, int],
                           account_id: str = "") \
@@ -428,9 +325,6 @@ class AccountMixin:
             raise ValueError("Invalid margin '{} %'.".format(margin))
 
         request_body = {"marginRate": str(margin_rate[margin])}
-        response = self.send_request(endpoint, "PATCH", json=request_body)
-
-        if response.status_code >= 400:
-            response.raise_for_status()
-
-        return response.status_code == 200
+        return self._request(
+            endpoint, "PATCH", lambda response: response.status_code == 200,
+            json=request_body)
@@ -0,0 +1,237 @@
+import calendar
+import datetime
+import time
+from functools import partial
+from typing import Any, List, Tuple, Union
+
+from oandav20.arrays import (PRICE_COMPONENTS, candles_to_array,
+                             merge_candles, require_numpy)
+from oandav20.bulk import BulkReport, execute_bulk
+
+# Length of the candles in seconds, the month is the longest one.
+
+GRANULARITIES = {
+    "S5": 5,
+    "S10": 10,
+    "S15": 15,
+    "S30": 30,
+    "M1": 60,
+    "M2": 120,
+    "M4": 240,
+    "M5": 300,
+    "M10": 600,
+    "M15": 900,
+    "M30": 1800,
+    "H1": 3600,
+    "H2": 7200,
+    "H3": 10800,
+    "H4": 14400,
+    "H6": 21600,
+    "H8": 28800,
+    "H12": 43200,
+    "D": 86400,
+    "W": 604800,
+    "M": 2678400
+}
+
+# Maximum number of candles per one request allowed by Oanda.
+
+MAX_CANDLES = 5000
+
+
+def to_unix_time(value: Union[datetime.datetime, float]) -> float:
+    """Convert datetime (naive one is considered as UTC) to UNIX time.
+
+    Arguments:
+        value:
+            Datetime object or already UNIX time.
+
+    Returns:
+        UNIX time in seconds.
+    """
+    if not isinstance(value, datetime.datetime):
+        return float(value)
+
+    if value.tzinfo is not None:
+        return value.timestamp()
+
+    return calendar.timegm(value.timetuple()) + value.microsecond / 1e6
+
+
+class InstrumentsMixin:
+    """Methods in the InstrumentsMixin class handles the instruments
+    endpoints.
+    """
+
+    def get_candles(self, instrument: str,
+                    start: Union[datetime.datetime, float],
+                    end: Union[datetime.datetime, float] = 0.0,
+                    granularity: str = "M1", price: str = "M",
+                    concurrency: int = 4, account_id: str = "") \
+            -> "numpy.ndarray":
+        """Get historical candles for the given instrument.
+
+        The date range is splitted to chunks by the maximum number of
+        candles per request and the chunks are downloaded concurrently. If
+        the 'candle_store' attribute is set, only the ranges missing in the
+        store are downloaded and saved there.
+
+        Requires the 'numpy' package.
+
+        Arguments:
+            instrument:
+                Code of instrument.
+            start:
+                Start of the range, datetime object (naive one is considered
+                as UTC) or UNIX time.
+            end:
+                End of the range, now by default.
+            granularity:
+                Length of the candles, for example "S5", "M1", "H4" or "D".
+            price:
+                Price component, "M" (midpoint), "B" (bid) or "A" (ask).
+            concurrency:
+                Maximum number of requests sent at once.
+            account_id:
+                Oanda trading account ID.
+
+        Returns:
+            Contiguous NumPy structured array sorted by time with the fields
+            "time" (datetime64[ns]), "open", "high", "low", "close",
+            "volume" and "complete".
+
+        Example:
+            >>> candles = o.get_candles("EUR_USD", datetime(2016, 1, 1),
+            ...                         datetime(2016, 7, 1), "M1")
+            >>> candles["close"].mean()
+            1.11539...
+
+        Raises:
+            ImportError:
+                The 'numpy' package isn't installed.
+            requests.HTTPError:
+                HTTP response status code is 4xx or 5xx.
+            ValueError:
+                1. Invalid instrument code passed to the 'instrument'
+                    parameter.
+                2. Invalid granularity passed to the 'granularity'
+                    parameter.
+                3. Invalid price component passed to the 'price'
+                    parameter.
+        """
+        start, end, chunks = self._split_candles_range(
+            instrument, start, end, granularity, price)
+        get_chunk = partial(self._get_candles_chunk, instrument,
+                            granularity=granularity, price=price,
+                            account_id=account_id)
+        report = execute_bulk(get_chunk, chunks, concurrency)
+
+        return self._collect_candles(instrument, start, end, granularity,
+                                     price, report)
+
+    def _split_candles_range(self, instrument: str,
+                             start: Union[datetime.datetime, float],
+                             end: Union[datetime.datetime, float],
+                             granularity: str, price: str) \
+            -> Tuple[float, float, List[dict]]:
+        """Validate the arguments of the 'get_candles' method and split the
+        date range (only the missing ranges if the candle store is set).
+
+        Returns:
+            Start and end of the range as UNIX times and list of keyword
+            arguments ('start' and 'end' UNIX times) for the
+            '_get_candles_chunk' method.
+        """
+        require_numpy()
+        self.instrument_registry.validate([instrument])
+
+        if granularity not in GRANULARITIES:
+            raise ValueError("Invalid granularity '{}'.".format(granularity))
+
+        if price not in PRICE_COMPONENTS:
+            raise ValueError("Invalid price component '{}'.".format(price))
+
+        start = to_unix_time(start)
+        end = min(to_unix_time(end or time.time()), time.time())
+
+        if self.candle_store is not None:
+            ranges = self.candle_store.get_missing(instrument, start, end,
+                                                   granularity, price)
+        else:
+            ranges = [(start, end)]
+
+        # One candle less than maximum, because both range limits may be
+        # included.
+
+        chunk_length = (MAX_CANDLES - 1) * GRANULARITIES[granularity]
+        chunks = []
+
+        for chunk_start, range_end in ranges:
+            while chunk_start < range_end:
+                chunks.append({
+                    "start": chunk_start,
+                    "end": min(chunk_start + chunk_length, range_end)
+                })
+                chunk_start += chunk_length
+
+        return start, end, chunks
+
+    def _collect_candles(self, instrument: str, start: float, end: float,
+                         granularity: str, price: str, report: BulkReport) \
+            -> Any:
+        """Merge the downloaded chunks of the 'get_candles' method and save
+        them to the candle store.
+
+        Returns:
+            Contiguous NumPy structured array with the candles.
+
+        Raises:
+            requests.HTTPError:
+                Error of the first failed chunk.
+        """
+        arrays = []
+
+        # Successful chunks are saved even if another one failed, so they
+        # won't be downloaded again.
+
+        for item in report.succeeded:
+            if self.candle_store is not None:
+                self.candle_store.write(
+                    instrument, item.result, item.arguments["start"],
+                    item.arguments["end"], granularity, price)
+
+            arrays.append(item.result)
+
+        if report.failed:
+            raise report.failed[0].error
+
+        if self.candle_store is not None:
+            arrays.insert(0, self.candle_store.read(
+                instrument, start, end, granularity, price))
+
+        return merge_candles(arrays)
+
+    def _get_candles_chunk(self, instrument: str, start: float, end: float,
+                           granularity: str, price: str, account_id: str) \
+            -> Any:
+        """Get candles within one chunk of the 'get_candles' method.
+
+        Returns:
+            NumPy structured array with the candles.
+        """
+        account_id = account_id or self.default_id
+        endpoint = "/{0}/instruments/{1}/candles".format(
+            account_id, instrument)
+        url_params = {
+            "from": "{:.9f}".format(start),
+            "granularity": granularity,
+            "price": price,
+            "to": "{:.9f}".format(end)
+        }
+        headers = {"Accept-Datetime-Format": "UNIX"}
+
+        return self._request(
+            endpoint, "GET",
+            lambda response: candles_to_array(
+                response.json()["candles"], price),
+            params=url_params, headers=headers)
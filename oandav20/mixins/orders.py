@@ -1,6 +1,49 @@
-from typing import Any, List, Union
-
-from oandav20.mixins.account import INSTRUMENTS
+from collections import namedtuple
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import requests
+
+from oandav20.bulk import BulkReport, execute_bulk
+
+CreatedOrder = namedtuple("CreatedOrder",
+                          ["order_id", "own_id", "fill", "cancel"])
+CreatedOrder.__doc__ = """Result of one order created by the 'create_orders'.
+
+Attributes:
+    order_id (str):
+        Order ID created by Oanda.
+    own_id (str):
+        Own ID or empty string.
+    fill (dict):
+        The "orderFillTransaction" object if the order was filled at once,
+        otherwise None.
+    cancel (dict):
+        The "orderCancelTransaction" object if the order was canceled at
+        once (for example unfilled "FOK" market order), otherwise None.
+"""
+
+
+UpdatedOrder = namedtuple("UpdatedOrder", ["order_id", "own_id", "replaced"])
+UpdatedOrder.__doc__ = """Result of one order updated by the 'update_orders'.
+
+Attributes:
+    order_id (str):
+        Order ID of the replacing order created by Oanda, or of the
+        unchanged order if nothing was replaced.
+    own_id (str):
+        Own ID or empty string.
+    replaced (bool):
+        False if the order already had the requested values and no request
+        was sent.
+"""
+
+# Keyword arguments accepted by the 'update_orders' for every order.
+
+ORDER_UPDATE_KEYS = frozenset([
+    "order_id", "own_id", "price", "price_bound", "stoploss", "takeprofit",
+    "units"
+])
 
 
 class OrdersMixin:
@@ -75,12 +118,47 @@ class OrdersMixin:
                     to the 'time_in_force' parameter.
         """
         account_id = account_id or self.default_id
+        endpoint, request_body = self._build_order(
+            order_type, instrument, side, units, price, price_bound,
+            time_in_force, stoploss, takeprofit, own_id, tag, comment,
+            account_id)
+
+        def parse_response(response):
+            self._cache_orders(account_id, response)
+
+            if not own_id:
+                return response.json()["orderCreateTransaction"]["id"]
+            else:
+                return response.status_code == 201
+
+        return self._request(endpoint, "POST", parse_response,
+                             json=request_body)
+
+    def _build_order(self, order_type: str, instrument: str, side: str,
+                     units: int, price: float = 0.0, price_bound: float = 0.0,
+                     time_in_force: str = "", stoploss: float = 0.0,
+                     takeprofit: float = 0.0, own_id: str = "", tag: str = "",
+                     comment: str = "", account_id: str = "") \
+            -> Tuple[str, dict]:
+        """Validate the order and build the request for the 'create_order'
+        and 'create_orders' methods.
+
+        Arguments:
+            Same arguments like for the 'create_order'.
+
+        Returns:
+            Endpoint and request body.
+
+        Raises:
+            Same exceptions like the 'create_order' except HTTPError.
+        """
+        account_id = account_id or self.default_id
         endpoint = "/{}/orders".format(account_id)
 
         if order_type not in ["MARKET", "LIMIT", "STOP"]:
             raise ValueError("Invalid order type '{}'.".format(order_type))
 
-        if instrument not in INSTRUMENTS.values():
+        if instrument not in self.instrument_registry:
             raise ValueError("Invalid instrument code '{}'.".format(
                 instrument))
 
@@ -168,15 +246,7 @@ class OrdersMixin:
                 "timeInForce": "GTC"
             }
 
-        response = self.send_request(endpoint, "POST", json=request_body)
-
-        if response.status_code >= 400:
-            response.raise_for_status()
-
-        if not own_id:
-            return response.json()["orderCreateTransaction"]["id"]
-        else:
-            return response.status_code == 201
+        return endpoint, request_body
 
     def create_market_order(self, *args: Any, **kwargs: Any) \
             -> Union[bool, str]:
@@ -223,6 +293,91 @@ class OrdersMixin:
         """
         return self.create_order("STOP", *args, **kwargs)
 
+    def create_orders(self, orders: List[dict], account_id: str = "",
+                      concurrency: int = 10) \
+            -> BulkReport:
+        """Create several orders at once.
+
+        All orders are validated before the first one is sent, so an
+        invalid one doesn't leave the rest half created. Then the orders are
+        sent concurrently and one rejected order doesn't stop the rest, see
+        the returned report instead.
+
+        Only the orders with own ID are retried after a transient error, so
+        use own IDs if the orders mustn't be lost.
+
+        Example:
+            >>> report = o.create_orders([
+            ...     {"order_type": "MARKET", "instrument": "EUR_USD",
+            ...      "side": "BUY", "units": 100, "own_id": "EUR_USD_1"},
+            ...     {"order_type": "LIMIT", "instrument": "GBP_USD",
+            ...      "side": "SELL", "units": 100, "price": 1.5}])
+            >>> [item.result.order_id for item in report.succeeded]
+            ['6372', '6374']
+
+        Arguments:
+            orders:
+                List of keyword arguments for the 'create_order', for
+                example {"order_type": "MARKET", "instrument": "EUR_USD",
+                "side": "BUY", "units": 100}.
+            account_id:
+                Oanda trading account ID, unless given by the order.
+            concurrency:
+                Maximum number of requests sent at once.
+
+        Returns:
+            BulkReport with CreatedOrder result or error per order, in the
+            same order as the 'orders'.
+
+        Raises:
+            TypeError:
+                Invalid or missing argument of an order, see the
+                'create_order'.
+            ValueError:
+                Invalid argument of an order, see the 'create_order'.
+        """
+        self._validate_orders(orders)
+
+        return execute_bulk(
+            partial(self._send_order, account_id=account_id), orders,
+            concurrency)
+
+    def _validate_orders(self, orders: List[dict]) -> None:
+        """Build every order of the 'create_orders' to raise the validation
+        errors before any request is sent.
+        """
+        for index, order in enumerate(orders):
+            try:
+                self._build_order(**order)
+            except (TypeError, ValueError) as error:
+                raise type(error)("Order #{0}: {1}".format(
+                    index, error)) from error
+
+    def _send_order(self, account_id: str = "", **order: Any) -> Any:
+        """Send one order of the 'create_orders'.
+
+        Returns:
+            CreatedOrder or awaitable with it for the asynchronous client.
+        """
+        account_id = account_id or self.default_id
+        endpoint, request_body = self._build_order(
+            **dict({"account_id": account_id}, **order))
+        own_id = order.get("own_id", "")
+
+        def parse_response(response):
+            response_body = response.json()
+
+            if self.order_cache is not None:
+                self.order_cache.apply_response(account_id, response_body)
+
+            return CreatedOrder(
+                response_body["orderCreateTransaction"]["id"], own_id,
+                response_body.get("orderFillTransaction"),
+                response_body.get("orderCancelTransaction"))
+
+        return self._request(endpoint, "POST", parse_response,
+                             json=request_body)
+
     def get_order(self, order_id: int = 0, own_id: str = "",
                   account_id: str = "") \
             -> dict:
@@ -284,12 +439,16 @@ class OrdersMixin:
 
         used_id = order_id or own_id
         endpoint = "/{0}/orders/{1}".format(account_id, used_id)
-        response = self.send_request(endpoint)
 
-        if response.status_code >= 400:
-            response.raise_for_status()
+        def parse_response(response):
+            response_body = response.json()
+
+            if self.order_cache is not None:
+                self.order_cache.put(account_id, response_body["order"])
+
+            return response_body
 
-        return response.json()
+        return self._request(endpoint, parser=parse_response)
 
     def get_all_orders(self, account_id: str = "") -> dict:
         """Get list of all pending orders.
@@ -336,12 +495,17 @@ class OrdersMixin:
         """
         account_id = account_id or self.default_id
         endpoint = "/{}/pendingOrders".format(account_id)
-        response = self.send_request(endpoint)
 
-        if response.status_code >= 400:
-            response.raise_for_status()
+        def parse_response(response):
+            response_body = response.json()
 
-        return response.json()
+            if self.order_cache is not None:
+                self.order_cache.replace_all(account_id,
+                                             response_body["orders"])
+
+            return response_body
+
+        return self._request(endpoint, parser=parse_response)
 
     def update_order(self, order_id: int = 0, own_id: str = "",
                      price: float = 0.0, price_bound: float = 0.0,
@@ -355,6 +519,11 @@ class OrdersMixin:
         situations must close the pending order himself / herself and create
         new one.
 
+        The replacing request is built from the current order details, which
+        are got by the 'get_order' unless the order is in the 'order_cache'.
+        If Oanda rejects the request built from the cached details (status
+        code 400), the details are got again and the request is repeated.
+
         Arguments:
             order_id:
                 Order ID provided by Oanda.
@@ -391,19 +560,263 @@ class OrdersMixin:
             raise TypeError("Missing argument either for the 'order_id' or "
                             "'own_id'.")
 
-        if order_id:
-            used_oanda_id = True
-            old_order_details = self.get_order(
-                order_id, account_id=account_id)["order"]
+        replace = partial(
+            self._replace_order, order_id=order_id, own_id=own_id,
+            price=price, price_bound=price_bound, stoploss=stoploss,
+            takeprofit=takeprofit, units=units, account_id=account_id)
+        cached_details = self._get_cached_order(account_id, order_id, own_id)
+
+        if cached_details is not None:
+            try:
+                return replace(cached_details)
+            except requests.HTTPError as error:
+                self._check_cached_order_error(
+                    error, account_id, order_id, own_id)
+
+        old_order_details = self.get_order(
+            order_id, own_id, account_id=account_id)["order"]
+
+        return replace(old_order_details)
+
+    def _get_cached_order(self, account_id: str, order_id: int,
+                          own_id: str) \
+            -> Optional[dict]:
+        """Get the order details from the 'order_cache' for the
+        'update_order' method.
+
+        Returns:
+            The "order" object or None if the order isn't cached.
+        """
+        if self.order_cache is None:
+            return None
+
+        return self.order_cache.get(account_id, order_id, own_id)
+
+    def _check_cached_order_error(self, error: requests.HTTPError,
+                                  account_id: str, order_id: int,
+                                  own_id: str) \
+            -> None:
+        """Drop the cached order whose replacing failed and raise the error
+        again unless the request may be repeated with the actual details.
+
+        Raises:
+            requests.HTTPError:
+                The replacing failed for another reason than stale details
+                (status code 400).
+        """
+        self.order_cache.remove(account_id, order_id, own_id)
+
+        if error.response is None or error.response.status_code != 400:
+            raise error
+
+    def update_orders(self, orders: List[dict], account_id: str = "",
+                      concurrency: int = 10) \
+            -> BulkReport:
+        """Update several pending orders at once.
 
+        All pending orders are got by one 'get_all_orders' request and
+        compared with the requested values, orders which already have them
+        are skipped. The rest are replaced concurrently and one rejected
+        order doesn't stop the rest, see the returned report instead.
+
+        Example:
+            >>> report = o.update_orders([
+            ...     {"own_id": "EUR_USD_1", "price": 1.101},
+            ...     {"own_id": "EUR_USD_2", "price": 1.102, "units": 200}])
+            >>> [item.result.replaced for item in report.succeeded]
+            [True, False]
+
+        Arguments:
+            orders:
+                List of keyword arguments for the 'update_order', for
+                example {"own_id": "EUR_USD_1", "price": 1.101}.
+            account_id:
+                Oanda trading account ID.
+            concurrency:
+                Maximum number of requests sent at once.
+
+        Returns:
+            BulkReport with UpdatedOrder result or error per order, in the
+            same order as the 'orders'. Orders which aren't pending fail by
+            the ValueError.
+
+        Raises:
+            requests.HTTPError:
+                Pending orders couldn't be obtained.
+            TypeError:
+                Missing argument either for the 'order_id' or 'own_id' or
+                unknown argument of an order.
+            ValueError:
+                The same order is requested more than once.
+        """
+        account_id = account_id or self.default_id
+        self._validate_order_updates(orders)
+        pending_orders = self.get_all_orders(account_id)["orders"]
+        index = self._index_orders(pending_orders)
+        self._check_duplicate_orders(orders, index)
+
+        return execute_bulk(
+            partial(self._update_pending_order, index,
+                    account_id=account_id),
+            orders, concurrency)
+
+    def _validate_order_updates(self, orders: List[dict]) -> None:
+        """Check arguments of every order of the 'update_orders' before
+        any request is sent.
+        """
+        for index, order in enumerate(orders):
+            unknown_keys = set(order) - ORDER_UPDATE_KEYS
+
+            if unknown_keys:
+                raise TypeError("Order #{0}: Unknown argument '{1}'.".format(
+                    index, sorted(unknown_keys)[0]))
+
+            if not order.get("order_id") and not order.get("own_id"):
+                raise TypeError("Order #{}: Missing argument either for the "
+                                "'order_id' or 'own_id'.".format(index))
+
+    def _check_duplicate_orders(self, orders: List[dict],
+                                pending_orders: Dict[str, dict]) \
+            -> None:
+        """Check that no order of the 'update_orders' is requested twice,
+        either by the same ID or by both its Oanda ID and own ID.
+
+        Every request is compared with the same details got before any
+        replacing, so the second one would replace an already canceled
+        order.
+        """
+        indexes = {}
+
+        for index, order in enumerate(orders):
+            used_id = "@" + order["own_id"] if order.get("own_id") else \
+                str(order["order_id"])
+            pending_order = pending_orders.get(used_id)
+            order_id = pending_order["id"] if pending_order else used_id
+
+            if order_id in indexes:
+                raise ValueError("Order #{0}: The same order as order #{1}."
+                                 .format(index, indexes[order_id]))
+
+            indexes[order_id] = index
+
+    def _index_orders(self, orders: List[dict]) -> Dict[str, dict]:
+        """Index the orders by Oanda IDs and own IDs prefixed by "@"."""
+        index = {}
+
+        for order in orders:
+            index[order["id"]] = order
+            own_id = order.get("clientExtensions", {}).get("id")
+
+            if own_id:
+                index["@" + own_id] = order
+
+        return index
+
+    def _update_pending_order(self, pending_orders: Dict[str, dict],
+                              order_id: int = 0, own_id: str = "",
+                              price: float = 0.0, price_bound: float = 0.0,
+                              stoploss: float = 0.0, takeprofit: float = 0.0,
+                              units: int = 0, account_id: str = "") \
+            -> Any:
+        """Replace one order of the 'update_orders' unless it already has
+        the requested values.
+
+        Returns:
+            UpdatedOrder or awaitable with it for the asynchronous client
+            if the order is replaced.
+
+        Raises:
+            ValueError:
+                The order isn't pending.
+        """
+        old_order_details = pending_orders.get(
+            "@" + own_id if own_id else str(order_id))
+
+        if old_order_details is None:
+            raise ValueError("The order isn't pending.")
+
+        if not self._is_order_changed(old_order_details, price, price_bound,
+                                      stoploss, takeprofit, units):
+            return UpdatedOrder(old_order_details["id"], own_id, False)
+
+        def parse_response(response):
+            response_body = response.json()
+
+            if self.order_cache is not None:
+                self.order_cache.apply_response(account_id, response_body)
+
+            return UpdatedOrder(
+                response_body["orderCreateTransaction"]["id"], own_id, True)
+
+        return self._replace_order(
+            old_order_details, order_id, own_id, price, price_bound,
+            stoploss, takeprofit, units, account_id, parse_response)
+
+    def _is_order_changed(self, order: dict, price: float,
+                          price_bound: float, stoploss: float,
+                          takeprofit: float, units: int) \
+            -> bool:
+        """Check if the 'update_order' with the same arguments would change
+        any value of the order.
+        """
+        def is_different(value, current_value):
+            return bool(value) and (current_value is None or
+                                    float(current_value) != value)
+
+        return any([
+            is_different(price, order.get("price")),
+            order["type"] == "STOP" and
+            is_different(price_bound, order.get("priceBound")),
+            is_different(stoploss,
+                         order.get("stopLossOnFill", {}).get("price")),
+            is_different(takeprofit,
+                         order.get("takeProfitOnFill", {}).get("price")),
+            units > 0 and float(order.get("units", 0)) !=
+            self._get_signed_units(order, units)
+        ])
+
+    def _get_signed_units(self, order: dict, units: int) -> int:
+        """Return the positive units with the sign of the order's units,
+        so an update keeps the side of the order.
+        """
+        return -units if float(order.get("units", 0)) < 0 else units
+
+    def _replace_order(self, old_order_details: dict, order_id: int,
+                       own_id: str, price: float, price_bound: float,
+                       stoploss: float, takeprofit: float, units: int,
+                       account_id: str,
+                       parser: Callable[[Any], Any] = None) \
+            -> Union[bool, str]:
+        """Send the replacing request for the 'update_order' method.
+
+        Splitted from the 'update_order', so the request body may be built
+        from the already fetched order details by both the synchronous and
+        asynchronous client.
+
+        Arguments:
+            old_order_details:
+                The "order" object of the order being replaced.
+            parser:
+                Function processing the response instead of the default
+                one.
+            others:
+                Same arguments like for the 'update_order'.
+
+        Returns:
+            Same value like the 'update_order' or result of the 'parser'.
+        """
         if own_id:
-            own_id = "@" + own_id
-            old_order_details = self.get_order(
-                own_id=own_id, account_id=account_id)["order"]
+            used_id = "@" + own_id
+        else:
+            used_id = order_id
 
-        used_id = order_id or own_id
         endpoint = "/{0}/orders/{1}".format(account_id, used_id)
 
+        # Do not modify the passed details in place, the dict may be shared
+        # with another caller.
+
+        old_order_details = dict(old_order_details)
+
         # Oanda added internal keys which are incompatible with the order
         # structure within request body.
 
@@ -412,7 +825,7 @@ class OrdersMixin:
         ]
 
         for key in unwanted_keys:
-            old_order_details.pop(key)
+            old_order_details.pop(key, None)
 
         # Change value for key "positionFill" to "DEFAULT" because Oanda
         # has changed internally the value for their purposes and is also
@@ -423,41 +836,37 @@ class OrdersMixin:
         if price:
             old_order_details["price"] = str(price)
 
-        if price_bound and old_order_details["order"]["type"] == "STOP":
+        if price_bound and old_order_details["type"] == "STOP":
             old_order_details["priceBound"] = str(price_bound)
 
         if stoploss:
-            try:
-                old_order_details["stopLossOnFill"]["price"] = str(stoploss)
-            except KeyError:
-                old_order_details["stopLossOnFill"] = {
-                    "price": str(stoploss),
-                    "timeInForce": "GTC"
-                }
+            old_order_details["stopLossOnFill"] = dict(
+                old_order_details.get("stopLossOnFill",
+                                      {"timeInForce": "GTC"}),
+                price=str(stoploss))
 
         if takeprofit:
-            try:
-                old_order_details["takeProfitOnFill"]["price"] = \
-                    str(takeprofit)
-            except KeyError:
-                old_order_details["takeProfitOnFill"] = {
-                    "price": str(takeprofit),
-                    "timeInForce": "GTC"
-                }
+            old_order_details["takeProfitOnFill"] = dict(
+                old_order_details.get("takeProfitOnFill",
+                                      {"timeInForce": "GTC"}),
+                price=str(takeprofit))
 
         if units > 0:
-            old_order_details["units"] = str(units)
+            old_order_details["units"] = str(
+                self._get_signed_units(old_order_details, units))
 
         new_order = {"order": old_order_details}
-        response = self.send_request(endpoint, "PUT", json=new_order)
 
-        if response.status_code >= 400:
-            response.raise_for_status()
+        def parse_response(response):
+            self._cache_orders(account_id, response)
 
-        if used_oanda_id:
-            return response.json()["orderCreateTransaction"]["id"]
-        else:
-            return response.status_code == 201
+            if not own_id:
+                return response.json()["orderCreateTransaction"]["id"]
+            else:
+                return response.status_code == 201
+
+        return self._request(endpoint, "PUT", parser or parse_response,
+                             json=new_order)
 
     def update_order_extensions(self, order_id: int = 0, own_id: str = "",
                                 new_own_id: str = "", tag: str = "",
@@ -523,12 +932,9 @@ class OrdersMixin:
             request_body["clientExtensions"]["comment"] = comment
             request_body["tradeClientExtensions"]["comment"] = comment
 
-        response = self.send_request(endpoint, "PUT", json=request_body)
-
-        if response.status_code >= 400:
-            response.raise_for_status()
-
-        return response.status_code == 200
+        return self._request(
+            endpoint, "PUT", lambda response: response.status_code == 200,
+            json=request_body)
 
     def cancel_order(self, order_id: int = 0, own_id: str = "",
                      account_id="") \
@@ -567,23 +973,34 @@ class OrdersMixin:
 
         used_id = order_id or own_id
         endpoint = "/{0}/orders/{1}/cancel".format(account_id, used_id)
-        response = self.send_request(endpoint, "PUT")
 
-        if response.status_code >= 400:
-            response.raise_for_status()
+        def parse_response(response):
+            self._cache_orders(account_id, response)
+
+            return response.status_code == 200
+
+        return self._request(endpoint, "PUT", parse_response)
 
-        return response.status_code == 200
+    def _cache_orders(self, account_id: str,
+                      response: requests.Response) \
+            -> None:
+        """Update the 'order_cache' by the transactions of the response."""
+        if self.order_cache is not None:
+            self.order_cache.apply_response(account_id, response.json())
 
     def cancel_filtered_orders(self, order_ids: List[int] = [],
                                own_ids: List[str] = [], instrument: str = "",
-                               account_id: str = "") \
-            -> None:
+                               account_id: str = "", concurrency: int = 10) \
+            -> BulkReport:
         """Cancel the filtered pending orders if there are any.
 
         This method is very useful for situations where is important to
         cancel all pending orders which relate to USD currency before news are
         released.
 
+        The orders are cancelled concurrently and a failed cancellation
+        doesn't stop the rest, see the returned report instead.
+
         Arguments:
             order_ids:
                 Order IDs provided by Oanda.
@@ -591,14 +1008,20 @@ class OrdersMixin:
                 Own orders IDs (via 'own_id').
             instrument:
                 Instrument code or also single currency code.
+            account_id:
+                Oanda trading account ID.
+            concurrency:
+                Maximum number of cancel requests sent at once.
+
+        Returns:
+            BulkReport with the result of every 'cancel_order' call.
 
         Raises:
+            requests.HTTPError:
+                Pending orders couldn't be obtained.
             TypeError:
                 Missing argument either for the 'order_ids' or 'own_ids' or
                 'instrument' parameter.
-
-        Todo:
-            - refactor to async
         """
         account_id = account_id or self.default_id
 
@@ -607,47 +1030,69 @@ class OrdersMixin:
                             "'own_ids' or 'instrument'.")
 
         pending_orders = self.get_all_orders(account_id)
+        selected_orders = self._select_orders(
+            pending_orders["orders"], order_ids, own_ids, instrument)
+
+        return execute_bulk(partial(self.cancel_order, account_id=account_id),
+                            selected_orders, concurrency)
 
-        if pending_orders["orders"]:
-            if order_ids:
-                for id in order_ids:
-                    self.cancel_order(id, account_id=account_id)
+    def _select_orders(self, orders: List[dict], order_ids: List[int] = [],
+                       own_ids: List[str] = [], instrument: str = "") \
+            -> List[dict]:
+        """Select the pending orders for the filtered bulk methods.
 
-                return
+        Only the first given filter is applied, in order 'order_ids',
+        'own_ids' and 'instrument'.
 
-            if own_ids:
-                for id in own_ids:
-                    self.cancel_order(own_id=id, account_id=account_id)
+        Arguments:
+            orders:
+                List of pending orders from the 'get_all_orders' method.
+            others:
+                Same arguments like for the 'cancel_filtered_orders'.
 
-                return
+        Returns:
+            List of keyword arguments ('order_id' or 'own_id') for the
+            'cancel_order' method.
+        """
+        if not orders:
+            return []
 
-            if instrument:
-                orders_dict = \
-                    {int(order["id"]): order["instrument"] for order in
-                     pending_orders["orders"]}
+        if order_ids:
+            return [{"order_id": id} for id in order_ids]
 
-                for key, value in orders_dict.items():
-                    if instrument in orders_dict[key]:
-                        self.cancel_order(key, account_id=account_id)
+        if own_ids:
+            return [{"own_id": id} for id in own_ids]
 
-                return
+        if instrument:
+            return [{"order_id": int(order["id"])} for order in orders
+                    if instrument in order["instrument"]]
 
-    def cancel_all_orders(self, account_id: str = "") -> None:
+        return [{"order_id": int(order["id"])} for order in orders]
+
+    def cancel_all_orders(self, account_id: str = "",
+                          concurrency: int = 10) \
+            -> BulkReport:
         """Cancel all pending orders if there are any.
 
+        The orders are cancelled concurrently and a failed cancellation
+        doesn't stop the rest, see the returned report instead.
+
         Arguments:
             account_id:
                 Oanda trading account ID.
+            concurrency:
+                Maximum number of cancel requests sent at once.
 
-        Todo:
-            - refactor to async
+        Returns:
+            BulkReport with the result of every 'cancel_order' call.
+
+        Raises:
+            requests.HTTPError:
+                Pending orders couldn't be obtained.
         """
         account_id = account_id or self.default_id
         pending_orders = self.get_all_orders(account_id)
+        selected_orders = self._select_orders(pending_orders["orders"])
 
-        if pending_orders["orders"]:
-            orders_ids = \
-                [int(order["id"]) for order in pending_orders["orders"]]
-
-            for id in orders_ids:
-                self.cancel_order(id, account_id=account_id)
+        return execute_bulk(partial(self.cancel_order, account_id=account_id),
+                            selected_orders, concurrency)
@@ -1,3 +1,8 @@
+# Position sides and keys of their units in the close request.
+
+POSITION_SIDES = {"LONG": "longUnits", "SHORT": "shortUnits"}
+
+
 class PositionsMixin:
     """Methods in the PricingMixin class handles the pricing endpoints."""
 
@@ -45,9 +50,55 @@ class PositionsMixin:
         """
         account_id = account_id or self.default_id
         endpoint = "/{}/positions".format(account_id)
-        response = self.send_request(endpoint)
+        return self._request(endpoint)
+
+    def close_position(self, instrument: str, side: str, units: int = 0,
+                       account_id: str = "") \
+            -> bool:
+        """Close fully or partially one side of the position.
+
+        One request closes all trades of the side (the oldest first), so it's
+        faster than closing the trades one by one.
+
+        Arguments:
+            instrument:
+                Code of instrument.
+            side:
+                Side of the position, accepting only value "LONG" or
+                "SHORT".
+            units:
+                How many units should be closed. If empty then all units will
+                be used.
+            account_id:
+                Oanda trading account ID.
+
+        Returns:
+            True if the position was closed properly.
+
+        Raises:
+            requests.HTTPError:
+                HTTP response status code is 4xx or 5xx.
+            ValueError:
+                1. Invalid instrument code passed to the 'instrument'
+                    parameter.
+                2. Invalid side passed to the 'side' parameter.
+                3. Negative units passed to the 'units' parameter.
+        """
+        account_id = account_id or self.default_id
+
+        if instrument not in self.instrument_registry:
+            raise ValueError("Invalid instrument code '{}'.".format(
+                instrument))
+
+        if side not in POSITION_SIDES:
+            raise ValueError("Invalid position side '{}'.".format(side))
+
+        if units < 0:
+            raise ValueError("Units must be a positive number.")
 
-        if response.status_code >= 400:
-            response.raise_for_status()
+        endpoint = "/{0}/positions/{1}/close".format(account_id, instrument)
+        request_body = {POSITION_SIDES[side]: str(units) if units else "ALL"}
 
-        return response.json()
+        return self._request(
+            endpoint, "PUT", lambda response: response.status_code == 200,
+            json=request_body)
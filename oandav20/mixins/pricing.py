@@ -1,6 +1,6 @@
-from typing import List
+from typing import Any, Callable, Iterator, List
 
-from oandav20.mixins.account import INSTRUMENTS
+from oandav20.arrays import prices_to_array, require_numpy
 
 
 class PricingMixin:
@@ -81,16 +81,127 @@ class PricingMixin:
         account_id = self.default_id
         endpoint = "/{}/pricing".format(account_id)
 
-        for code in instruments:
-            if code in INSTRUMENTS.values():
-                continue
-            else:
-                raise ValueError("Invalid instrument code '{}'.".format(code))
+        self.instrument_registry.validate(instruments)
 
         url_params = {"instruments": ",".join(instruments)}
-        response = self.send_request(endpoint, params=url_params)
+        return self._request(endpoint, params=url_params)
 
-        if response.status_code >= 400:
-            response.raise_for_status()
+    def get_pricing_array(self, instruments: List[str], depth: int = 1) \
+            -> "numpy.ndarray":
+        """Get pricing information for 1 or more instruments as columnar
+        NumPy snapshot.
 
-        return response.json()
+        Unlike the 'get_pricing' method, all prices are converted to
+        numbers at once, which is much cheaper for many instruments polled
+        often.
+
+        Arguments:
+            instruments:
+                Code of instrument(s).
+            depth:
+                Number of the depth levels of the bids and asks.
+
+        Returns:
+            Structured array with one row per instrument, see the
+            'oandav20.arrays.get_pricing_dtype' for the fields.
+
+        Example:
+            >>> snapshot = o.get_pricing_array(["EUR_USD", "USD_JPY"])
+            >>> snapshot["ask"] - snapshot["bid"]
+            array([0.00013, 0.012])
+
+        Raises:
+            ImportError:
+                The 'numpy' package isn't installed.
+            requests.HTTPError:
+                HTTP response status code is 4xx or 5xx.
+            ValueError:
+                Invalid instrument code passed to the 'instruments' parameter.
+        """
+        require_numpy()
+
+        account_id = self.default_id
+        endpoint = "/{}/pricing".format(account_id)
+
+        self.instrument_registry.validate(instruments)
+
+        url_params = {"instruments": ",".join(instruments)}
+        headers = {"Accept-Datetime-Format": "UNIX"}
+
+        def parse_response(response):
+            return prices_to_array(response.json()["prices"], instruments,
+                                   depth)
+
+        return self._request(endpoint, "GET", parse_response,
+                             params=url_params, headers=headers)
+
+    def stream_pricing(self, instruments: List[str],
+                       heartbeat: Callable[[dict], Any] = None,
+                       stall_timeout: float = 10.0, account_id: str = "") \
+            -> Iterator[dict]:
+        """Stream pricing information for 1 or more instruments.
+
+        Unlike the 'get_pricing' method, the prices are pushed by the Oanda
+        server as soon as they change. The connection is reconnected with
+        backoff when it breaks or stalls, so the iteration never ends until
+        user stops it.
+
+        Arguments:
+            instruments:
+                Code of instrument(s).
+            heartbeat:
+                Function called with every heartbeat message, otherwise the
+                heartbeats are dropped.
+            stall_timeout:
+                Maximum number of seconds without any data before
+                reconnecting.
+            account_id:
+                Oanda trading account ID.
+
+        Yields:
+            JSON object (dict) with the pricing information.
+
+        Example:
+            >>> for price in o.stream_pricing(["EUR_USD", "USD_JPY"]):
+            ...     print(price)
+            {
+                "asks": [
+                    {
+                        "liquidity": 10000000,
+                        "price": "1.13028"
+                    },
+                    {
+                        ...
+                    }
+                ],
+                "bids": [
+                    {
+                        "liquidity": 10000000,
+                        "price": "1.13015"
+                    },
+                    {
+                        ...
+                    }
+                ],
+                "closeoutAsk": "1.13032",
+                "closeoutBid": "1.13011",
+                "instrument": "EUR_USD",
+                "status": "tradeable",
+                "time": "2016-06-22T18:41:36.201836422Z",
+                "type": "PRICE"
+            }
+
+        Raises:
+            requests.HTTPError:
+                HTTP response status code is 4xx.
+            ValueError:
+                Invalid instrument code passed to the 'instruments' parameter.
+        """
+        account_id = account_id or self.default_id
+        endpoint = "/{}/pricing/stream".format(account_id)
+
+        self.instrument_registry.validate(instruments)
+
+        url_params = {"instruments": ",".join(instruments)}
+
+        return self._stream(endpoint, url_params, heartbeat, stall_timeout)
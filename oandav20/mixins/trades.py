@@ -1,6 +1,7 @@
-from typing import List
+from functools import partial
+from typing import Any, List
 
-from oandav20.mixins.account import INSTRUMENTS
+from oandav20.bulk import BulkReport, execute_bulk
 
 
 class TradesMixin:
@@ -84,12 +85,7 @@ class TradesMixin:
 
         used_id = trade_id or own_id
         endpoint = "/{0}/trades/{1}".format(account_id, used_id)
-        response = self.send_request(endpoint)
-
-        if response.status_code >= 400:
-            response.raise_for_status()
-
-        return response.json()
+        return self._request(endpoint)
 
     def get_all_trades(self, account_id: str = "") -> dict:
         """Get list of all open trades.
@@ -132,12 +128,7 @@ class TradesMixin:
         """
         account_id = account_id or self.default_id
         endpoint = "/{}/openTrades".format(account_id)
-        response = self.send_request(endpoint)
-
-        if response.status_code >= 400:
-            response.raise_for_status()
-
-        return response.json()
+        return self._request(endpoint)
 
     def update_trade(self, trade_id: int = 0, own_id: str = "",
                      stoploss: float = 0.0, takeprofit: float = 0.0,
@@ -204,12 +195,9 @@ class TradesMixin:
                 "timeInForce": "GTC"
             }
 
-        response = self.send_request(endpoint, "PUT", json=request_body)
-
-        if response.status_code >= 400:
-            response.raise_for_status()
-
-        return response.status_code == 200
+        return self._request(
+            endpoint, "PUT", lambda response: response.status_code == 200,
+            json=request_body)
 
     def update_trade_extensions(self, trade_id: int = 0, own_id: str = "",
                                 tag: str = "", comment: str = "",
@@ -262,12 +250,9 @@ class TradesMixin:
         if comment:
             request_body["clientExtensions"]["comment"] = comment
 
-        response = self.send_request(endpoint, "PUT", json=request_body)
-
-        if response.status_code >= 400:
-            response.raise_for_status()
-
-        return response.status_code == 200
+        return self._request(
+            endpoint, "PUT", lambda response: response.status_code == 200,
+            json=request_body)
 
     def close_trade(self, trade_id: int = 0, own_id: str = "", units: int = 0,
                     account_id: str = "") \
@@ -309,23 +294,26 @@ class TradesMixin:
         used_id = trade_id or own_id
         endpoint = "/{0}/trades/{1}/close".format(account_id, used_id)
 
-        if units:
-            request_body = {"units": str(units)}
-            response = self.send_request(endpoint, "PUT", json=request_body)
-        else:
-            response = self.send_request(endpoint, "PUT")
+        # Explicit "ALL" lets the retry policy repeat the full close.
 
-        if response.status_code >= 400:
-            response.raise_for_status()
+        request_body = {"units": str(units) if units else "ALL"}
 
-        return response.status_code == 200
+        return self._request(
+            endpoint, "PUT", lambda response: response.status_code == 200,
+            json=request_body)
 
     def close_filtered_trades(self, trade_ids: List[int] = [],
                               own_ids: List[str] = [], instrument: str = "",
-                              account_id: str = "") \
-            -> None:
+                              account_id: str = "", concurrency: int = 10,
+                              by_position: bool = False) \
+            -> BulkReport:
         """Close the filtered trades.
 
+        The trades are closed concurrently and a failed closing doesn't stop
+        the rest, see the returned report instead. With the 'by_position'
+        the filtered trades which are all (at least two) trades of one side
+        of a position are closed by one 'close_position' call instead.
+
         Arguments:
             trade_ids:
                 Trade IDs provided by Oanda.
@@ -333,14 +321,24 @@ class TradesMixin:
                 Own trade IDs.
             instrument:
                 Instrument code or also single currency code.
+            account_id:
+                Oanda trading account ID.
+            concurrency:
+                Maximum number of close requests sent at once.
+            by_position:
+                Close the whole sides of positions by one request, which
+                closes also trades opened after the trades were obtained.
+
+        Returns:
+            BulkReport with the result of every 'close_trade' and
+            'close_position' call.
 
         Raises:
+            requests.HTTPError:
+                Open trades couldn't be obtained.
             TypeError:
                 Missing argument either for the 'trade_ids' or 'own_ids' or
                 'instrument' parameter.
-
-        Todo:
-            - refactor to async
         """
         account_id = account_id or self.default_id
 
@@ -349,47 +347,166 @@ class TradesMixin:
                             "'own_ids' or 'instrument'.")
 
         open_trades = self.get_all_trades(account_id)
+        selected_trades = self._select_trades(
+            open_trades["trades"], trade_ids, own_ids, instrument)
 
-        if open_trades["trades"]:
-            if trade_ids:
-                for id in trade_ids:
-                    self.close_trade(id, account_id=account_id)
+        if by_position:
+            selected_trades = self._group_by_position(
+                open_trades["trades"], selected_trades)
 
-                return
+        return execute_bulk(partial(self._close_selected,
+                                    account_id=account_id),
+                            selected_trades, concurrency)
 
-            if own_ids:
-                for id in own_ids:
-                    self.close_trade(own_id=id, account_id=account_id)
+    def _select_trades(self, trades: List[dict], trade_ids: List[int] = [],
+                       own_ids: List[str] = [], instrument: str = "") \
+            -> List[dict]:
+        """Select the open trades for the filtered bulk methods.
 
-                return
+        Only the first given filter is applied, in order 'trade_ids',
+        'own_ids' and 'instrument'.
+
+        Arguments:
+            trades:
+                List of open trades from the 'get_all_trades' method.
+            others:
+                Same arguments like for the 'close_filtered_trades'.
+
+        Returns:
+            List of keyword arguments ('trade_id' or 'own_id') for the
+            'close_trade' method.
+        """
+        if not trades:
+            return []
 
-            if instrument:
-                trades_dict = \
-                    {int(trade["id"]): trade["instrument"] for trade in
-                     open_trades["trades"]}
+        if trade_ids:
+            return [{"trade_id": id} for id in trade_ids]
 
-                for key, value in trades_dict.items():
-                    if instrument in trades_dict[key]:
-                        self.close_trade(key, account_id=account_id)
+        if own_ids:
+            return [{"own_id": id} for id in own_ids]
 
-                return
+        if instrument:
+            return [{"trade_id": int(trade["id"])} for trade in trades
+                    if instrument in trade["instrument"]]
 
-    def close_all_trades(self, account_id: str = "") -> None:
+        return [{"trade_id": int(trade["id"])} for trade in trades]
+
+    def close_all_trades(self, account_id: str = "", concurrency: int = 10,
+                         by_position: bool = False) \
+            -> BulkReport:
         """Close all the open trades if there are any.
 
+        The trades are closed concurrently and a failed closing doesn't stop
+        the rest, see the returned report instead. With the 'by_position'
+        sides of positions with at least two trades are closed by one
+        'close_position' call each.
+
         Arguments:
             account_id:
                 Oanda trading account ID.
+            concurrency:
+                Maximum number of close requests sent at once.
+            by_position:
+                Close the whole sides of positions by one request, which
+                closes also trades opened after the trades were obtained.
 
-        Todo:
-            - refactor async
+        Returns:
+            BulkReport with the result of every 'close_trade' and
+            'close_position' call.
+
+        Raises:
+            requests.HTTPError:
+                Open trades couldn't be obtained.
         """
         account_id = account_id or self.default_id
         open_trades = self.get_all_trades(account_id)
+        selected_trades = self._select_trades(open_trades["trades"])
+
+        if by_position:
+            selected_trades = self._group_by_position(
+                open_trades["trades"], selected_trades)
+
+        return execute_bulk(partial(self._close_selected,
+                                    account_id=account_id),
+                            selected_trades, concurrency)
+
+    def _group_by_position(self, trades: List[dict], calls: List[dict]) \
+            -> List[dict]:
+        """Replace the calls closing all trades of one side of a position by
+        one 'close_position' call.
+
+        Only sides with at least two trades are replaced, one trade is
+        closed by the 'close_trade' call as before.
 
-        if open_trades["trades"]:
-            trade_ids = \
-                [int(trade["id"]) for trade in open_trades["trades"]]
+        Arguments:
+            trades:
+                List of open trades from the 'get_all_trades' method.
+            calls:
+                Keyword arguments for the 'close_trade' method selected by
+                the '_select_trades'.
+
+        Returns:
+            List of keyword arguments for the 'close_trade' or
+            'close_position' method, see the '_close_selected'.
+        """
+        trades_by_ids = {}
+        position_sides = {}
+
+        for trade in trades:
+            side = "LONG" if float(trade["currentUnits"]) > 0 else "SHORT"
+            key = (trade["instrument"], side)
+            position_sides.setdefault(key, set()).add(trade["id"])
+            trades_by_ids[trade["id"]] = (trade, key)
+            own_id = trade.get("clientExtensions", {}).get("id")
+
+            if own_id:
+                trades_by_ids["@" + own_id] = (trade, key)
+
+        calls_by_sides = {}
+        selected_ids = {}
+        call_keys = []
+
+        for call in calls:
+            used_id = "@" + call["own_id"] if call.get("own_id") else \
+                str(call.get("trade_id"))
+            trade, key = trades_by_ids.get(used_id, (None, None))
+            call_keys.append((call, key))
+
+            if key is not None:
+                calls_by_sides.setdefault(key, []).append(call)
+                selected_ids.setdefault(key, set()).add(trade["id"])
+
+        grouped_calls = []
+
+        for call, key in call_keys:
+            if key is None:
+                grouped_calls.append(call)
+            elif key in calls_by_sides:
+                if len(position_sides[key]) > 1 and \
+                        selected_ids[key] == position_sides[key]:
+                    grouped_calls.append({"instrument": key[0],
+                                          "side": key[1]})
+                else:
+                    grouped_calls.extend(calls_by_sides[key])
+
+                del calls_by_sides[key]
+
+        return grouped_calls
+
+    def _close_selected(self, account_id: str = "", **arguments: Any) \
+            -> Any:
+        """Close the trade or position of one call of the bulk methods.
+
+        Arguments:
+            arguments:
+                Keyword arguments for the 'close_position' if they contain
+                the instrument, otherwise for the 'close_trade'.
+
+        Returns:
+            Result of the 'close_trade' or 'close_position' or awaitable
+            with it for the asynchronous client.
+        """
+        if "instrument" in arguments:
+            return self.close_position(account_id=account_id, **arguments)
 
-            for id in trade_ids:
-                self.close_trade(id)
+        return self.close_trade(account_id=account_id, **arguments)
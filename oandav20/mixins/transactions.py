@@ -0,0 +1,114 @@
+from typing import Any, Callable, Iterator
+
+
+class TransactionsMixin:
+    """Methods in the TransactionsMixin class handles the transactions
+    endpoints.
+    """
+
+    def get_transactions_since(self, transaction_id: int,
+                               account_id: str = "") \
+            -> dict:
+        """Get list of all transactions created after the given one.
+
+        Arguments:
+            transaction_id:
+                Transaction ID, the transaction itself is not included.
+            account_id:
+                Oanda trading account ID.
+
+        Returns:
+            JSON object (dict) with the transactions.
+
+        Example:
+            {
+                "lastTransactionID": "6411",
+                "transactions": [
+                    {
+                        "accountID": "<ACCOUNT>",
+                        "batchID": "6410",
+                        "clientExtensions": {
+                            "id": "EUR_USD_1"
+                        },
+                        "id": "6410",
+                        "instrument": "EUR_USD",
+                        "positionFill": "DEFAULT",
+                        "price": "1.10000",
+                        "reason": "CLIENT_ORDER",
+                        "time": "2016-06-22T18:41:29.294265338Z",
+                        "timeInForce": "GTC",
+                        "type": "LIMIT_ORDER",
+                        "units": "1000"
+                    },
+                    {
+                        ...
+                    }
+                ]
+            }
+
+        Raises:
+            requests.HTTPError:
+                HTTP response status code is 4xx or 5xx.
+        """
+        account_id = account_id or self.default_id
+        endpoint = "/{}/transactions/sinceid".format(account_id)
+        url_params = {"id": str(transaction_id)}
+
+        return self._request(endpoint, params=url_params)
+
+    def stream_transactions(self, heartbeat: Callable[[dict], Any] = None,
+                            stall_timeout: float = 10.0,
+                            account_id: str = "") \
+            -> Iterator[dict]:
+        """Stream transactions of the trading account as they are created.
+
+        The connection is reconnected with backoff when it breaks or stalls,
+        so the iteration never ends until user stops it. Transactions
+        created during the reconnecting are not repeated by Oanda, use the
+        'get_transactions_since' method to get them.
+
+        Arguments:
+            heartbeat:
+                Function called with every heartbeat message, otherwise the
+                heartbeats are dropped.
+            stall_timeout:
+                Maximum number of seconds without any data before
+                reconnecting.
+            account_id:
+                Oanda trading account ID.
+
+        Yields:
+            JSON object (dict) with the transaction details.
+
+        Example:
+            >>> for transaction in o.stream_transactions():
+            ...     print(transaction)
+            {
+                "accountID": "<ACCOUNT>",
+                "batchID": "6412",
+                "id": "6413",
+                "orderID": "6410",
+                "clientOrderID": "EUR_USD_1",
+                "instrument": "EUR_USD",
+                "price": "1.10000",
+                "reason": "LIMIT_ORDER",
+                "time": "2016-06-22T18:45:02.126357831Z",
+                "tradeOpened": {
+                    "clientExtensions": {
+                        "id": "EUR_USD_1"
+                    },
+                    "tradeID": "6413",
+                    "units": "1000"
+                },
+                "type": "ORDER_FILL",
+                "units": "1000"
+            }
+
+        Raises:
+            requests.HTTPError:
+                HTTP response status code is 4xx.
+        """
+        account_id = account_id or self.default_id
+        endpoint = "/{}/transactions/stream".format(account_id)
+
+        return self._stream(endpoint, None, heartbeat, stall_timeout)
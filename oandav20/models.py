@@ -0,0 +1,261 @@
+from typing import Any, Callable, List, Optional
+
+
+def to_units(value: str) -> int:
+    """Convert Oanda units such as "-10000" to int."""
+    try:
+        return int(value)
+    except ValueError:
+        return int(float(value))
+
+
+def get_first_price(buckets: List[dict]) -> Optional[float]:
+    """Get price of the first (best) bucket of the "bids" or "asks"."""
+    return float(buckets[0]["price"]) if buckets else None
+
+
+class Field:
+    """Field descriptor reading one key of the JSON object of the model.
+
+    Values with a parser are parsed on the first access and cached in the
+    slot named by the attribute with underscore prefix, the other values
+    are returned from the JSON object directly.
+    """
+
+    __slots__ = ["keys", "parser", "default", "slot"]
+
+    def __init__(self, key: str, parser: Callable[[Any], Any] = None,
+                 default: Any = None) \
+            -> None:
+        """Initialize an instance of class Field.
+
+        Arguments:
+            key:
+                Key of the JSON object, nested keys separated by dots, for
+                example "clientExtensions.id".
+            parser:
+                Function converting the raw value, for example float.
+            default:
+                Value of the missing key.
+        """
+        self.keys = key.split(".")
+        self.parser = parser
+        self.default = default
+        self.slot = ""
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        if instance is None:
+            return self
+
+        if self.parser is not None:
+            try:
+                return getattr(instance, self.slot)
+            except AttributeError:
+                pass
+
+        value = instance.data
+
+        for key in self.keys:
+            value = value.get(key) if isinstance(value, dict) else None
+
+            if value is None:
+                value = self.default
+                break
+        else:
+            if self.parser is not None:
+                value = self.parser(value)
+
+        if self.parser is not None:
+            setattr(instance, self.slot, value)
+
+        return value
+
+
+class ModelMeta(type):
+    """Metaclass adding the cache slots of the parsed fields."""
+
+    def __new__(mcs, name: str, bases: tuple, namespace: dict) -> type:
+        slots = list(namespace.get("__slots__", []))
+
+        for attribute, value in namespace.items():
+            if isinstance(value, Field):
+                value.slot = "_" + attribute
+
+                if value.parser is not None:
+                    slots.append(value.slot)
+
+        namespace["__slots__"] = slots
+
+        return super().__new__(mcs, name, bases, namespace)
+
+
+class Model(metaclass=ModelMeta):
+    """Model is the base of the typed views of the Oanda JSON objects.
+
+    The model only wraps the decoded JSON object (dict), nothing is copied
+    and the numeric strings such as "1.13028" are converted only when the
+    attribute is read for the first time. Unknown keys are still available
+    via the 'data' attribute.
+
+    Models are equal if they have the same type and equal JSON objects.
+    They may be used in sets and as dict keys, the hash is computed only
+    from the "id" and "instrument" keys, which mustn't change meanwhile.
+
+    Attributes:
+        data (dict):
+            The wrapped JSON object.
+    """
+
+    __slots__ = ["data"]
+
+    def __init__(self, data: dict) -> None:
+        """Initialize an instance of the model.
+
+        Arguments:
+            data:
+                JSON object (dict) returned by Oanda.
+        """
+        self.data = data
+
+    def __repr__(self) -> str:
+        return "<{0} {1}>".format(type(self).__name__, self.data)
+
+    def __eq__(self, other: Any) -> bool:
+        return type(self) is type(other) and self.data == other.data
+
+    def __hash__(self) -> int:
+        return hash((type(self), self.data.get("id"),
+                     self.data.get("instrument")))
+
+    @classmethod
+    def from_list(cls, items: List[dict]) -> List["Model"]:
+        """Wrap every JSON object of the list.
+
+        Example:
+            >>> Trade.from_list(o.get_all_trades()["trades"])
+            [<Trade {...}>, <Trade {...}>]
+        """
+        return [cls(item) for item in items]
+
+
+class Price(Model):
+    """Typed view of the "price" object from the 'get_pricing' and
+    'stream_pricing' methods.
+
+    Example:
+        >>> for price in o.stream_pricing(["EUR_USD"]):
+        ...     price = Price(price)
+        ...     if price.ask < 1.1:
+        ...         ...
+    """
+
+    __slots__ = []
+
+    instrument = Field("instrument")
+    time = Field("time")
+    status = Field("status")
+    tradeable = Field("tradeable")
+    bid = Field("bids", get_first_price)
+    ask = Field("asks", get_first_price)
+    closeout_bid = Field("closeoutBid", float)
+    closeout_ask = Field("closeoutAsk", float)
+
+    @property
+    def mid(self) -> float:
+        """Middle of the best bid and ask."""
+        return (self.bid + self.ask) / 2
+
+    @property
+    def spread(self) -> float:
+        """Difference of the best ask and bid."""
+        return self.ask - self.bid
+
+
+class Order(Model):
+    """Typed view of the "order" object from the 'get_order' and
+    'get_all_orders' methods."""
+
+    __slots__ = []
+
+    id = Field("id")
+    type = Field("type")
+    instrument = Field("instrument")
+    state = Field("state")
+    units = Field("units", to_units)
+    price = Field("price", float)
+    price_bound = Field("priceBound", float)
+    time_in_force = Field("timeInForce")
+    create_time = Field("createTime")
+    trade_id = Field("tradeID")
+    stoploss = Field("stopLossOnFill.price", float)
+    takeprofit = Field("takeProfitOnFill.price", float)
+    own_id = Field("clientExtensions.id", default="")
+    tag = Field("clientExtensions.tag", default="")
+    comment = Field("clientExtensions.comment", default="")
+
+
+class Trade(Model):
+    """Typed view of the "trade" object from the 'get_trade' and
+    'get_all_trades' methods."""
+
+    __slots__ = []
+
+    id = Field("id")
+    instrument = Field("instrument")
+    state = Field("state")
+    price = Field("price", float)
+    open_time = Field("openTime")
+    initial_units = Field("initialUnits", to_units)
+    current_units = Field("currentUnits", to_units)
+    realized_pl = Field("realizedPL", float)
+    unrealized_pl = Field("unrealizedPL", float)
+    financing = Field("financing", float)
+    stoploss = Field("stopLossOrder.price", float)
+    takeprofit = Field("takeProfitOrder.price", float)
+    own_id = Field("clientExtensions.id", default="")
+    tag = Field("clientExtensions.tag", default="")
+    comment = Field("clientExtensions.comment", default="")
+
+
+class Position(Model):
+    """Typed view of the "position" object from the 'get_positions'
+    method."""
+
+    __slots__ = []
+
+    instrument = Field("instrument")
+    pl = Field("pl", float)
+    unrealized_pl = Field("unrealizedPL", float)
+    long_units = Field("long.units", to_units, 0)
+    long_average_price = Field("long.averagePrice", float)
+    long_unrealized_pl = Field("long.unrealizedPL", float)
+    short_units = Field("short.units", to_units, 0)
+    short_average_price = Field("short.averagePrice", float)
+    short_unrealized_pl = Field("short.unrealizedPL", float)
+
+    @property
+    def units(self) -> int:
+        """Net units, negative for net short position."""
+        return self.long_units + self.short_units
+
+
+class AccountSummary(Model):
+    """Typed view of the "account" object from the 'get_account_summary'
+    and 'get_account' methods."""
+
+    __slots__ = []
+
+    id = Field("id")
+    alias = Field("alias")
+    currency = Field("currency")
+    balance = Field("balance", float)
+    nav = Field("NAV", float)
+    pl = Field("pl", float)
+    unrealized_pl = Field("unrealizedPL", float)
+    margin_rate = Field("marginRate", float)
+    margin_used = Field("marginUsed", float)
+    margin_available = Field("marginAvailable", float)
+    open_trade_count = Field("openTradeCount", int)
+    open_position_count = Field("openPositionCount", int)
+    pending_order_count = Field("pendingOrderCount", int)
+    last_transaction_id = Field("lastTransactionID")
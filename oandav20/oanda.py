@@ -1,16 +1,46 @@
-from typing import Any
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Callable, Iterator
 
 import requests
 
+from oandav20.bulk import is_bulk_worker
+from oandav20.instruments import InstrumentRegistry
 from oandav20.mixins.account import AccountMixin
+from oandav20.mixins.instruments import InstrumentsMixin
 from oandav20.mixins.orders import OrdersMixin
 from oandav20.mixins.trades import TradesMixin
 from oandav20.mixins.positions import PositionsMixin
 from oandav20.mixins.pricing import PricingMixin
+from oandav20.mixins.transactions import TransactionsMixin
+from oandav20.pool import PoolConfig, SessionPool
+from oandav20.ratelimit import RateLimiter
+from oandav20.retry import RetryPolicy
+from oandav20.singleflight import SingleFlight, get_request_key
+
+ENVIRONMENTS = {
+    "DEMO": "https://api-fxpractice.oanda.com/v3/accounts",
+    "REAL": "https://api-fxtrade.oanda.com/v3/accounts"
+}
+
+STREAM_ENVIRONMENTS = {
+    "DEMO": "https://stream-fxpractice.oanda.com/v3/accounts",
+    "REAL": "https://stream-fxtrade.oanda.com/v3/accounts"
+}
+
+# Delays in seconds before reconnecting a broken stream, doubled after each
+# unsuccessful attempt.
+
+RECONNECT_DELAY = 0.5
+MAX_RECONNECT_DELAY = 30.0
 
 
 class Oanda(AccountMixin, OrdersMixin, TradesMixin, PositionsMixin,
-            PricingMixin):
+            PricingMixin, TransactionsMixin, InstrumentsMixin):
     """Oanda is the main class responsible for interaction between a client
     and the Oanda trading server.
 
@@ -31,14 +61,44 @@ class Oanda(AccountMixin, OrdersMixin, TradesMixin, PositionsMixin,
     Attributes:
         base_url (str):
             Base url alias prefix for all endpoints.
+        candle_store (CandleStore):
+            Local store of candles used by the 'get_candles' method, None
+            for no store.
         client (requests.Session):
             Session object with HTTP persistent connection to the Oanda API
-            server.
+            server. In the thread-safe mode it's only the template of the
+            lent sessions.
         default_id (str):
             Default Oanda trading account ID.
+        instrument_registry (InstrumentRegistry):
+            Valid instruments used for validation of the instrument codes.
+        metrics (RequestMetrics):
+            Statistics of the requests, None for no recording.
+        order_cache (OrderCache):
+            Known pending orders used by the 'update_order' method instead
+            of getting the order, None for no cache.
+        pool (PoolConfig):
+            Configuration of the persistent connections.
+        rate_limiter (RateLimiter):
+            Limiter pacing the requests, None for no limit.
+        response_cache (ResponseCache):
+            Read-through cache of the GET responses of the mixins, None for
+            no cache.
+        retry_policy (RetryPolicy):
+            Policy for repeating requests failed by transient errors, None
+            for no retries.
+        sessions (SessionPool):
+            Sessions lent to the threads in the thread-safe mode, otherwise
+            None.
+        single_flight (SingleFlight):
+            Coalescer of the concurrent identical GET requests of the
+            mixins, None for no coalescing.
+        stream_url (str):
+            Base url alias prefix for all streaming endpoints.
     """
 
-    def __init__(self, environment: str, access_token: str, default_id: str) \
+    def __init__(self, environment: str, access_token: str, default_id: str,
+                 pool: PoolConfig = None, thread_safe: bool = False) \
             -> None:
         """Initialize an instance of class Oanda.
 
@@ -49,24 +109,133 @@ class Oanda(AccountMixin, OrdersMixin, TradesMixin, PositionsMixin,
                 Access token for user authentication.
             default_id:
                 Default Oanda trading account ID.
+            pool:
+                Configuration of the persistent connections, PoolConfig()
+                by default. If it has 'prewarm' connections, they are
+                opened before the constructor returns.
+            thread_safe:
+                Lend every request and stream its own session, so the
+                methods may be called from several threads at once. The
+                sessions copy headers of the 'client' and are reused, at
+                most 'max_connections' of the pool are kept idle.
 
         Raises:
             ValueError:
                 Value "DEMO" or "REAL" wasn't passed to the 'environment'
                 parameter.
         """
-        if environment == "DEMO":
-            self.base_url = "https://api-fxpractice.oanda.com/v3/accounts"
-        elif environment == "REAL":
-            self.base_url = "https://api-fxtrade.oanda.com/v3/accounts"
-        else:
+        if environment not in ENVIRONMENTS:
             raise ValueError("Invalid environment '{}'.".format(environment))
 
+        self.base_url = ENVIRONMENTS[environment]
+        self.stream_url = STREAM_ENVIRONMENTS[environment]
+
+        self.pool = pool or PoolConfig()
+
         self.client = requests.Session()
         self.client.headers["Authorization"] = "Bearer " + access_token
         self.client.headers["Content-Type"] = "application/json"
+        self.pool.mount(self.client)
+
+        if thread_safe:
+            self.sessions = SessionPool(self._create_session,
+                                        self.pool.max_connections)
+        else:
+            self.sessions = None
+
+        # Sessions lent to the threads of the bulk methods otherwise.
+
+        self._bulk_sessions = SessionPool(self._create_session,
+                                          self.pool.max_connections)
 
+        self.candle_store = None
         self.default_id = default_id
+        self.instrument_registry = InstrumentRegistry(self)
+        self.metrics = None
+        self.order_cache = None
+        self.rate_limiter = RateLimiter()
+        self.response_cache = None
+        self.retry_policy = RetryPolicy()
+        self.single_flight = SingleFlight()
+
+        if self.pool.prewarm:
+            self.prewarm(self.pool.prewarm)
+
+    def _create_session(self) -> requests.Session:
+        """Create a session for the thread-safe mode and the bulk methods,
+        a copy of the 'client'."""
+        session = requests.Session()
+        session.headers.update(self.client.headers)
+        self.pool.mount(session)
+
+        return session
+
+    @contextmanager
+    def _get_client(self) -> Iterator[requests.Session]:
+        """Get session for one request or stream, the 'client' or a lent
+        one in the thread-safe mode and in the threads of the bulk
+        methods. Other threads use the 'client' without the thread-safe
+        mode."""
+        sessions = self.sessions
+
+        if sessions is None and is_bulk_worker():
+            sessions = self._bulk_sessions
+
+        if sessions is None:
+            yield self.client
+        else:
+            with sessions.session() as session:
+                yield session
+
+    def close(self) -> None:
+        """Close the 'client' session and all idle lent sessions."""
+        self.client.close()
+        self._bulk_sessions.close()
+
+        if self.sessions is not None:
+            self.sessions.close()
+
+    def prewarm(self, connections: int = 1) -> int:
+        """Open connections to the Oanda server in advance.
+
+        The connections are opened by concurrent requests for the list of
+        accounts and stay in the pool, so the first real requests (for
+        example the first order of the day) don't pay the TCP and TLS
+        handshake. Failed requests are ignored, the connections are then
+        opened later as usual.
+
+        Arguments:
+            connections:
+                Number of connections, at most the 'max_connections' of the
+                pool.
+
+        Returns:
+            Number of successfully opened connections.
+        """
+        connections = min(connections, self.pool.max_connections)
+
+        if connections < 1:
+            return 0
+
+        barrier = threading.Barrier(connections)
+
+        def open_connection(_):
+            try:
+                barrier.wait(self.pool.connect_timeout or None)
+            except threading.BrokenBarrierError:
+                pass
+
+            try:
+                response = self.send_request("")
+            except requests.RequestException:
+                return False
+
+            response.close()
+
+            return response.status_code < 400
+
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            return sum(executor.map(open_connection, range(connections)))
 
     def send_request(self, endpoint: str, method: str = "GET",
                      **kwargs: Any) \
@@ -76,6 +245,10 @@ class Oanda(AccountMixin, OrdersMixin, TradesMixin, PositionsMixin,
         User may also use this method for accessing another endpoints which
         aren't covered in this package.
 
+        The request waits for the 'rate_limiter', transient errors are
+        retried by the 'retry_policy' and every attempt is recorded by the
+        'metrics', if they are set.
+
         Arguments:
             endpoint:
                 Suffix for a URL.
@@ -89,5 +262,176 @@ class Oanda(AccountMixin, OrdersMixin, TradesMixin, PositionsMixin,
             HTTP Response object from the 'requests' package.
         """
         url = self.base_url + endpoint
+        attempt = 0
+
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            started = time.perf_counter()
+
+            try:
+                with self._get_client() as client:
+                    response = client.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if self.metrics is not None:
+                    self.metrics.record(
+                        method, endpoint, 0, time.perf_counter() - started,
+                        retry=attempt > 0)
+
+                if self.retry_policy is None or \
+                        not self.retry_policy.should_retry(
+                            method, attempt, kwargs.get("json")):
+                    raise
+
+                delay = self.retry_policy.get_delay(attempt)
+            else:
+                if self.metrics is not None:
+                    self.metrics.record(
+                        method, endpoint, response.status_code,
+                        time.perf_counter() - started,
+                        len(response.request.body or b""),
+                        len(response.content), attempt > 0)
+
+                if self.retry_policy is None or \
+                        not self.retry_policy.should_retry(
+                            method, attempt, kwargs.get("json"),
+                            response.status_code):
+                    return response
+
+                delay = self.retry_policy.get_delay(
+                    attempt, response.headers.get("Retry-After", ""))
+                response.close()
+
+            time.sleep(delay)
+            attempt += 1
+
+    def _request(self, endpoint: str, method: str = "GET",
+                 parser: Callable[[requests.Response], Any] = None,
+                 **kwargs: Any) \
+            -> Any:
+        """Send an HTTP request and process the response for the mixins.
+
+        Concurrent identical GET requests share one response via the
+        'single_flight' and fresh responses are returned by the
+        'response_cache', each caller still gets its own result. Other
+        requests invalidate the cached responses and requests in flight of
+        the account.
+
+        Arguments:
+            endpoint:
+                Suffix for a URL.
+            method:
+                HTTP method written in capital letters.
+            parser:
+                Function which gets the successful response and returns the
+                method result, otherwise the decoded JSON body is returned.
+            **kwargs:
+                Same keywords arguments like for the 'send_request' method.
+
+        Returns:
+            Result of the 'parser' function or JSON object (dict).
+
+        Raises:
+            requests.HTTPError:
+                HTTP response status code is 4xx or 5xx.
+        """
+        send = partial(self.send_request, endpoint, method, **kwargs)
+
+        if method == "GET":
+            key = get_request_key(endpoint, kwargs)
+
+            if self.single_flight is not None:
+                send = partial(self.single_flight.call, key, send)
+
+            if self.response_cache is not None:
+                send = partial(self.response_cache.call, endpoint, key,
+                               send)
+
+            response = send()
+        else:
+            try:
+                response = send()
+            finally:
+                if self.single_flight is not None:
+                    self.single_flight.invalidate(endpoint)
+
+                if self.response_cache is not None:
+                    self.response_cache.invalidate(endpoint)
+
+        if response.status_code >= 400:
+            response.raise_for_status()
+
+        if parser:
+            return parser(response)
+
+        return response.json()
+
+    def _stream(self, endpoint: str, params: dict = None,
+                heartbeat: Callable[[dict], Any] = None,
+                stall_timeout: float = 10.0) \
+            -> Iterator[dict]:
+        """Yield messages from a streaming endpoint for the mixins.
+
+        The connection is opened lazily by the first iteration and whenever
+        it breaks, stalls longer than 'stall_timeout' or the server ends it,
+        a new one is opened after a growing delay. The stream is closed by
+        closing the generator, for example by 'break' in a for loop.
+
+        Arguments:
+            endpoint:
+                Suffix for a streaming URL.
+            params:
+                URL parameters.
+            heartbeat:
+                Function called with every heartbeat message, otherwise the
+                heartbeats are dropped.
+            stall_timeout:
+                Maximum number of seconds without any data (Oanda sends
+                heartbeats every 5 seconds).
+
+        Yields:
+            JSON object (dict) for every message except heartbeats.
+
+        Raises:
+            requests.HTTPError:
+                HTTP response status code is 4xx.
+        """
+        url = self.stream_url + endpoint
+        delay = RECONNECT_DELAY
+
+        while True:
+            response = None
+
+            try:
+                with self._get_client() as client:
+                    response = client.get(url, params=params, stream=True,
+                                          timeout=stall_timeout)
+
+                    if 400 <= response.status_code < 500:
+                        response.raise_for_status()
+
+                    if response.status_code < 400:
+                        for line in response.iter_lines(chunk_size=None):
+                            if not line:
+                                continue
+
+                            message = json.loads(line.decode("utf-8"))
+                            delay = RECONNECT_DELAY
+
+                            if message.get("type") == "HEARTBEAT":
+                                if heartbeat:
+                                    heartbeat(message)
+
+                                continue
+
+                            yield message
+            except (requests.ConnectionError, requests.Timeout,
+                    requests.exceptions.ChunkedEncodingError):
+                pass
+            finally:
+                if response is not None:
+                    response.close()
 
-        return self.client.request(method, url, **kwargs)
+            time.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
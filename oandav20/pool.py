@@ -0,0 +1,224 @@
+import socket
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+
+def get_keep_alive_options(idle: float) -> List[Tuple[int, int, int]]:
+    """Get socket options turning on TCP keep-alive probes.
+
+    Arguments:
+        idle:
+            Number of idle seconds before the first probe, 0 for no
+            keep-alive.
+
+    Returns:
+        List of (level, option, value) for the 'setsockopt', only the
+        options supported by the platform.
+    """
+    if not idle:
+        return []
+
+    options = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    seconds = max(1, int(idle))
+
+    for name, value in [("TCP_KEEPIDLE", seconds),
+                        ("TCP_KEEPALIVE", seconds),  # macOS
+                        ("TCP_KEEPINTVL", max(1, seconds // 4)),
+                        ("TCP_KEEPCNT", 4)]:
+        if hasattr(socket, name):
+            options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+
+    return options
+
+
+class PoolAdapter(HTTPAdapter):
+    """HTTPAdapter with default timeouts and TCP keep-alive."""
+
+    def __init__(self, config: "PoolConfig") -> None:
+        self.pool_config = config
+        super().__init__(pool_connections=config.pool_size,
+                         pool_maxsize=config.max_connections,
+                         pool_block=config.block)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        socket_options = get_keep_alive_options(self.pool_config.keep_alive)
+
+        if socket_options:
+            kwargs["socket_options"] = \
+                list(HTTPConnection.default_socket_options) + socket_options
+
+        super().init_poolmanager(*args, **kwargs)
+
+    def send(self, request: requests.PreparedRequest, *args: Any,
+             **kwargs: Any) \
+            -> requests.Response:
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.pool_config.timeout
+
+        return super().send(request, *args, **kwargs)
+
+
+class PoolConfig:
+    """PoolConfig describes the pool of persistent connections to Oanda.
+
+    The connections are kept open between the requests (HTTP keep-alive),
+    so only the first request on every connection pays the TCP and TLS
+    handshake. The pool must be large enough for all threads sending the
+    requests at once, otherwise the extra connections are opened and
+    closed again after every request.
+
+    Pass it to the Oanda or AsyncOanda constructor.
+
+    Example:
+        >>> o = Oanda("DEMO", token, account_id,
+        ...           pool=PoolConfig(max_connections=20, prewarm=4))
+
+    Attributes:
+        block (bool):
+            Wait for a free connection instead of opening an extra one
+            when all 'max_connections' are in use.
+        connect_timeout (float):
+            Maximum number of seconds to open the connection, 0 for no
+            limit.
+        keep_alive (float):
+            Number of idle seconds before the TCP keep-alive probes, which
+            keep the idle connections open through NAT and firewalls, 0 for
+            no probes.
+        max_connections (int):
+            Maximum number of connections kept open per host.
+        pool_size (int):
+            Number of hosts with cached connections (API and streaming
+            servers of both environments).
+        prewarm (int):
+            Number of connections opened already when the client is
+            created (Oanda) or entered (AsyncOanda), 0 for none.
+        read_timeout (float):
+            Maximum number of seconds to wait for the response data, 0 for
+            no limit. The streams use their own 'stall_timeout'.
+    """
+
+    def __init__(self, max_connections: int = 10, pool_size: int = 4,
+                 keep_alive: float = 60.0, connect_timeout: float = 10.0,
+                 read_timeout: float = 30.0, block: bool = False,
+                 prewarm: int = 0) \
+            -> None:
+        """Initialize an instance of class PoolConfig.
+
+        Arguments:
+            max_connections:
+                Maximum number of connections kept open per host.
+            pool_size:
+                Number of hosts with cached connections.
+            keep_alive:
+                Number of idle seconds before the TCP keep-alive probes, 0
+                for no probes.
+            connect_timeout:
+                Maximum number of seconds to open the connection, 0 for no
+                limit.
+            read_timeout:
+                Maximum number of seconds to wait for the response data, 0
+                for no limit.
+            block:
+                Wait for a free connection when all are in use.
+            prewarm:
+                Number of connections opened at start.
+
+        Raises:
+            ValueError:
+                The 'max_connections' or 'pool_size' isn't positive or the
+                'prewarm' is greater than 'max_connections'.
+        """
+        if max_connections < 1 or pool_size < 1:
+            raise ValueError("Number of connections and pool size must be "
+                             "positive numbers.")
+
+        if prewarm > max_connections:
+            raise ValueError("Cannot prewarm more connections than "
+                             "'max_connections'.")
+
+        self.max_connections = max_connections
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.block = block
+        self.prewarm = prewarm
+
+    @property
+    def timeout(self) -> Optional[Tuple[Optional[float], Optional[float]]]:
+        """Timeout for the 'requests' package, None for no limit."""
+        if not self.connect_timeout and not self.read_timeout:
+            return None
+
+        return (self.connect_timeout or None, self.read_timeout or None)
+
+    def mount(self, session: requests.Session) -> None:
+        """Use the pool for all requests of the session."""
+        adapter = PoolAdapter(self)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+
+class SessionPool:
+    """SessionPool lends sessions to the threads, so no session is used by
+    two threads at once.
+
+    The idle sessions are kept in LIFO order, so the most recently used
+    session with warm connections is lent first. Sessions are created on
+    demand, at most 'size' idle ones are kept and the rest are closed when
+    returned.
+
+    Attributes:
+        size (int):
+            Maximum number of idle sessions.
+    """
+
+    def __init__(self, factory: Callable[[], requests.Session],
+                 size: int = 10) \
+            -> None:
+        """Initialize an instance of class SessionPool.
+
+        Arguments:
+            factory:
+                Function creating a new session.
+            size:
+                Maximum number of idle sessions.
+        """
+        self.size = size
+
+        self._factory = factory
+        self._idle = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def session(self) -> Iterator[requests.Session]:
+        """Borrow a session for the duration of the with block."""
+        with self._lock:
+            session = self._idle.pop() if self._idle else None
+
+        if session is None:
+            session = self._factory()
+
+        try:
+            yield session
+        finally:
+            with self._lock:
+                if len(self._idle) < self.size:
+                    self._idle.append(session)
+                    session = None
+
+            if session is not None:
+                session.close()
+
+    def close(self) -> None:
+        """Close all idle sessions."""
+        with self._lock:
+            sessions, self._idle = self._idle, []
+
+        for session in sessions:
+            session.close()
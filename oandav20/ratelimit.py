@@ -0,0 +1,141 @@
+import struct
+import threading
+import time
+from typing import Tuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Oanda allows 120 requests per second per connection, the default rate
+# leaves some reserve.
+
+DEFAULT_RATE = 100.0
+
+# Layout of the state in the shared file, number of tokens and UNIX time of
+# the last update.
+
+STATE_FORMAT = "dd"
+
+
+class RateLimiter:
+    """RateLimiter paces the requests by the token bucket algorithm.
+
+    The bucket holds at most 'burst' tokens and is refilled by 'rate' tokens
+    per second. Every request takes one token, if there is none, the
+    request waits until the token is refilled. The waiting requests reserve
+    the tokens in advance, so they are sent in order of arrival.
+
+    The limiter is thread-safe. If 'path' is given, the state is kept in
+    that file locked by 'fcntl.flock', so all processes using the same file
+    share one bucket (POSIX only).
+
+    Every Oanda object has its own limiter in the 'rate_limiter' attribute,
+    set it to None for no limit.
+
+    Example:
+        >>> o.rate_limiter = RateLimiter(50, path="/tmp/oanda.bucket")
+
+    Attributes:
+        burst (float):
+            Maximum number of requests sent at once.
+        path (str):
+            Path to the file shared between processes, empty for no file.
+        rate (float):
+            Number of requests per second.
+    """
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: float = 0.0,
+                 path: str = "") \
+            -> None:
+        """Initialize an instance of class RateLimiter.
+
+        Arguments:
+            rate:
+                Number of requests per second.
+            burst:
+                Maximum number of requests sent at once, the same like
+                'rate' by default.
+            path:
+                Path to the file shared between processes.
+
+        Raises:
+            ImportError:
+                The 'path' is given, but the 'fcntl' module isn't available.
+            ValueError:
+                The 'rate' or 'burst' isn't positive number.
+        """
+        if rate <= 0 or burst < 0:
+            raise ValueError("Rate and burst must be positive numbers.")
+
+        if path and fcntl is None:
+            raise ImportError("Sharing the limiter between processes "
+                              "requires the 'fcntl' module.")
+
+        self.rate = rate
+        self.burst = burst or rate
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated_at = time.time()
+
+    def reserve(self) -> float:
+        """Take one token.
+
+        Returns:
+            Number of seconds the caller has to wait before sending the
+            request.
+        """
+        with self._lock:
+            if not self.path:
+                self._tokens, self._updated_at, delay = self._take(
+                    self._tokens, self._updated_at)
+                return delay
+
+            with open(self.path, "a+b") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+
+                try:
+                    f.seek(0)
+                    data = f.read()
+
+                    if len(data) == struct.calcsize(STATE_FORMAT):
+                        tokens, updated_at = struct.unpack(
+                            STATE_FORMAT, data)
+                    else:
+                        tokens, updated_at = self.burst, time.time()
+
+                    tokens, updated_at, delay = self._take(
+                        tokens, updated_at)
+
+                    f.truncate(0)
+                    f.write(struct.pack(STATE_FORMAT, tokens, updated_at))
+                    f.flush()
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+            return delay
+
+    def acquire(self) -> float:
+        """Take one token and wait until the request may be sent.
+
+        Returns:
+            Number of seconds waited.
+        """
+        delay = self.reserve()
+
+        if delay > 0:
+            time.sleep(delay)
+
+        return delay
+
+    def _take(self, tokens: float, updated_at: float) \
+            -> Tuple[float, float, float]:
+        now = time.time()
+        tokens = min(self.burst, tokens + max(0.0, now - updated_at) *
+                     self.rate)
+        tokens -= 1
+
+        return tokens, now, max(0.0, -tokens / self.rate)
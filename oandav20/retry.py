@@ -0,0 +1,177 @@
+import datetime
+import email.utils
+import random
+from typing import Any, FrozenSet
+
+# Methods which may be repeated without changing the result. PUT closes or
+# replaces trades and orders in Oanda, so it isn't one of them.
+
+IDEMPOTENT_METHODS = frozenset(["DELETE", "GET", "HEAD", "OPTIONS"])
+
+# Keys of the close requests closing all units when the value is "ALL".
+
+CLOSE_UNITS_KEYS = frozenset(["longUnits", "shortUnits", "units"])
+
+# Status codes of the transient errors.
+
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+
+def has_own_id(body: Any) -> bool:
+    """Check if the request body carries own ID in the client extensions.
+
+    Oanda rejects another order with the same own ID, so such request may
+    be repeated without creating a duplicate order.
+    """
+    if not isinstance(body, dict):
+        return False
+
+    for key, value in body.items():
+        if key == "clientExtensions" and isinstance(value, dict) and \
+                value.get("id"):
+            return True
+
+        if has_own_id(value):
+            return True
+
+    return False
+
+
+def is_full_close(body: Any) -> bool:
+    """Check if the request body closes all units of a trade or position.
+
+    Repeated full close finds nothing left to close, so it can't close any
+    units twice, unlike the partial close.
+    """
+    if not isinstance(body, dict):
+        return False
+
+    units = [value for key, value in body.items()
+             if key in CLOSE_UNITS_KEYS]
+
+    return bool(units) and all(value == "ALL" for value in units)
+
+
+def parse_retry_after(value: str) -> float:
+    """Convert the "Retry-After" header to number of seconds, 0 for empty or
+    invalid value.
+    """
+    if not value:
+        return 0.0
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+
+    return max(0.0, (retry_at - now).total_seconds())
+
+
+class RetryPolicy:
+    """RetryPolicy decides which failed requests are sent again and when.
+
+    Requests failed by a connection error or by one of the 'statuses' are
+    repeated at most 'retries' times. Only idempotent methods (GET, DELETE
+    etc.), requests carrying own ID and PUT requests closing all units are
+    repeated, because a POST or PUT request may have been already processed
+    by Oanda. The status code 429 means the request was refused, so it's
+    repeated for any method.
+
+    The delay is exponential with full jitter, but never shorter than the
+    "Retry-After" header of the response.
+
+    Every Oanda object has its own policy in the 'retry_policy' attribute,
+    set it to None for no retries.
+
+    Example:
+        >>> o.retry_policy = RetryPolicy(retries=5, max_backoff=2.0)
+
+    Attributes:
+        backoff (float):
+            Maximum delay in seconds before the first retry, doubled after
+            each attempt.
+        max_backoff (float):
+            Upper limit of the exponential delay in seconds.
+        retries (int):
+            Maximum number of repeated requests.
+        statuses (FrozenSet[int]):
+            HTTP status codes of the transient errors.
+    """
+
+    def __init__(self, retries: int = 3, backoff: float = 0.25,
+                 max_backoff: float = 10.0,
+                 statuses: FrozenSet[int] = RETRY_STATUSES) \
+            -> None:
+        """Initialize an instance of class RetryPolicy.
+
+        Arguments:
+            retries:
+                Maximum number of repeated requests.
+            backoff:
+                Maximum delay in seconds before the first retry.
+            max_backoff:
+                Upper limit of the exponential delay in seconds.
+            statuses:
+                HTTP status codes of the transient errors.
+        """
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = frozenset(statuses)
+
+    def should_retry(self, method: str, attempt: int, body: Any = None,
+                     status_code: int = 0) \
+            -> bool:
+        """Check if the failed request should be sent again.
+
+        Arguments:
+            method:
+                HTTP method written in capital letters.
+            attempt:
+                Number of already repeated requests.
+            body:
+                JSON body of the request.
+            status_code:
+                HTTP response status code, 0 for connection error.
+
+        Returns:
+            True if the request should be repeated.
+        """
+        if attempt >= self.retries:
+            return False
+
+        if status_code and status_code not in self.statuses:
+            return False
+
+        if status_code == 429:
+            return True
+
+        if method == "PUT" and is_full_close(body):
+            return True
+
+        return method in IDEMPOTENT_METHODS or has_own_id(body)
+
+    def get_delay(self, attempt: int, retry_after: str = "") -> float:
+        """Get number of seconds to wait before the next attempt.
+
+        Arguments:
+            attempt:
+                Number of already repeated requests.
+            retry_after:
+                Value of the "Retry-After" header, either seconds or HTTP
+                date.
+
+        Returns:
+            Delay in seconds.
+        """
+        delay = random.uniform(
+            0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+        return max(delay, parse_retry_after(retry_after))
@@ -0,0 +1,143 @@
+import asyncio
+import json
+import threading
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict
+
+from oandav20.cache import get_account_id
+
+
+def get_request_key(endpoint: str, kwargs: Dict[str, Any]) -> str:
+    """Get key identifying the GET request by the endpoint and keyword
+    arguments such as 'params' and 'headers'.
+    """
+    return endpoint + " " + json.dumps(kwargs, sort_keys=True, default=str)
+
+
+class _Call:
+    """One request in flight and its outcome."""
+
+    __slots__ = ["done", "result", "error"]
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """SingleFlight coalesces the concurrent identical GET requests.
+
+    The first caller (leader) sends the request, the others asking for the
+    same key while it's in flight wait for it and get the same response or
+    exception. Every caller decodes the shared response itself, so the
+    returned JSON objects are never shared between the callers. Requests
+    started after the response came are sent again, nothing is cached.
+
+    Other requests than GET of the same client call the 'invalidate'
+    method when they're done, so a request following a write never gets
+    the response of a request started before the write.
+
+    Every Oanda and AsyncOanda object has its own instance in the
+    'single_flight' attribute, set it to None for no coalescing.
+
+    Attributes:
+        coalesced (int):
+            Number of calls which got the response of another call.
+        sent (int):
+            Number of calls which sent the request.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an instance of class SingleFlight."""
+        self.coalesced = 0
+        self.sent = 0
+
+        self._calls = {}
+        self._tasks = {}
+        self._lock = threading.Lock()
+
+    def call(self, key: str, function: Callable[[], Any]) -> Any:
+        """Call the function unless a call with the same key is in flight,
+        then wait for its result instead.
+
+        Arguments:
+            key:
+                Key of the request, see 'get_request_key'.
+            function:
+                Function sending the request.
+
+        Returns:
+            Result of the function.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.sent += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+
+            if call.error is not None:
+                raise call.error
+
+            return call.result
+
+        try:
+            call.result = function()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+
+            call.done.set()
+
+        return call.result
+
+    async def call_async(self, key: str,
+                         function: Callable[[], Awaitable[Any]]) \
+            -> Any:
+        """Asynchronous variant of the 'call' method for one event loop.
+
+        The request runs in its own task, so cancelling one of the waiting
+        callers doesn't cancel the request for the others.
+        """
+        task = self._tasks.get(key)
+
+        if task is None or task.done():
+            task = self._tasks[key] = asyncio.ensure_future(function())
+            task.add_done_callback(partial(self._remove_task, key))
+            self.sent += 1
+        else:
+            self.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    def _remove_task(self, key: str, task: asyncio.Future) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+
+    def invalidate(self, endpoint: str = "") -> None:
+        """Don't let new calls join the requests of the account of the
+        endpoint which are in flight, their callers still get the result.
+
+        Arguments:
+            endpoint:
+                Any endpoint of the account, all accounts by default.
+        """
+        account_id = get_account_id(endpoint)
+
+        with self._lock:
+            for calls in [self._calls, self._tasks]:
+                for key in list(calls):
+                    if not account_id or get_account_id(key) == account_id:
+                        del calls[key]
@@ -0,0 +1,250 @@
+import datetime
+import json
+import os
+import threading
+from typing import List, Tuple, Union
+
+from oandav20.arrays import CANDLE_DTYPE, merge_candles, np, require_numpy
+from oandav20.mixins.instruments import to_unix_time
+
+
+def to_datetime64(unix_time: float) -> "np.datetime64":
+    """Convert UNIX time in seconds to datetime64[ns]."""
+    return np.datetime64(int(round(unix_time * 1e9)), "ns")
+
+
+class CandleStore:
+    """CandleStore keeps downloaded candles in local files.
+
+    Every instrument, granularity and price component has its own binary
+    file with records of the CANDLE_DTYPE sorted by time and a JSON file
+    with the time ranges already downloaded (market closures have no
+    candles, so the ranges cannot be deduced from the candles). Only
+    complete candles are saved.
+
+    Newer candles are appended to the end of the file, only filling a gap
+    before the last saved candle rewrites the file. The files are read via
+    memory mapping, so any range may be sliced without loading the whole
+    file into memory.
+
+    If the store is assigned to the 'candle_store' attribute of the Oanda
+    object, the 'get_candles' method downloads only the missing ranges.
+
+    Example:
+        >>> o.candle_store = CandleStore("candles")
+        >>> candles = o.get_candles("EUR_USD", datetime(2016, 1, 1))
+        >>> ...
+        >>> candles = o.get_candles("EUR_USD", datetime(2016, 1, 1))  # tail
+        >>> o.candle_store.read("EUR_USD", datetime(2016, 3, 1),
+        ...                     datetime(2016, 4, 1))
+        memmap([...])
+
+    Attributes:
+        path (str):
+            Path to the directory with the files.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize an instance of class CandleStore.
+
+        Arguments:
+            path:
+                Path to the directory with the files, created if it doesn't
+                exist.
+
+        Raises:
+            ImportError:
+                The 'numpy' package isn't installed.
+        """
+        require_numpy()
+        os.makedirs(path, exist_ok=True)
+
+        self.path = path
+
+        self._lock = threading.Lock()
+
+    def read(self, instrument: str,
+             start: Union[datetime.datetime, float] = 0.0,
+             end: Union[datetime.datetime, float] = 0.0,
+             granularity: str = "M1", price: str = "M") \
+            -> "np.ndarray":
+        """Read saved candles within the given range (including both
+        limits).
+
+        Arguments:
+            instrument:
+                Code of instrument.
+            start:
+                Start of the range, datetime object (naive one is considered
+                as UTC) or UNIX time, the first candle by default.
+            end:
+                End of the range, the last candle by default.
+            granularity:
+                Length of the candles.
+            price:
+                Price component.
+
+        Returns:
+            Read-only memory mapped array with dtype CANDLE_DTYPE.
+        """
+        candles = self._open(instrument, granularity, price)
+        times = candles["time"]
+        first = np.searchsorted(
+            times, to_datetime64(to_unix_time(start))) if start else 0
+        last = np.searchsorted(
+            times, to_datetime64(to_unix_time(end)), "right") \
+            if end else len(candles)
+
+        return candles[first:last]
+
+    def get_missing(self, instrument: str, start: float, end: float,
+                    granularity: str = "M1", price: str = "M") \
+            -> List[Tuple[float, float]]:
+        """Get ranges which haven't been downloaded yet.
+
+        Arguments:
+            instrument:
+                Code of instrument.
+            start:
+                Start of the range as UNIX time.
+            end:
+                End of the range as UNIX time.
+            granularity:
+                Length of the candles.
+            price:
+                Price component.
+
+        Returns:
+            Sorted list of the missing (start, end) ranges.
+        """
+        missing = []
+
+        for covered_start, covered_end in self._load_ranges(
+                instrument, granularity, price):
+            if covered_end <= start:
+                continue
+
+            if covered_start >= end:
+                break
+
+            if covered_start > start:
+                missing.append((start, covered_start))
+
+            start = covered_end
+
+        if start < end:
+            missing.append((start, end))
+
+        return missing
+
+    def write(self, instrument: str, candles: "np.ndarray", start: float,
+              end: float, granularity: str = "M1", price: str = "M") \
+            -> None:
+        """Save candles downloaded for the given range.
+
+        Incomplete candles aren't saved and the range is marked as
+        downloaded only up to the first incomplete candle.
+
+        Arguments:
+            instrument:
+                Code of instrument.
+            candles:
+                Array with dtype CANDLE_DTYPE sorted by time.
+            start:
+                Start of the downloaded range as UNIX time.
+            end:
+                End of the downloaded range as UNIX time.
+            granularity:
+                Length of the candles.
+            price:
+                Price component.
+        """
+        incomplete = candles[~candles["complete"]]
+
+        if len(incomplete):
+            end = min(end, incomplete["time"][0].astype("i8") / 1e9)
+
+        candles = candles[candles["complete"]]
+
+        with self._lock:
+            self._write_candles(instrument, granularity, price, candles)
+
+            if start < end:
+                ranges = self._load_ranges(instrument, granularity, price)
+                self._save_ranges(instrument, granularity, price,
+                                  ranges + [[start, end]])
+
+    def _get_path(self, instrument: str, granularity: str, price: str,
+                  extension: str) \
+            -> str:
+        filename = "{0}_{1}_{2}.{3}".format(
+            instrument, granularity, price, extension)
+
+        return os.path.join(self.path, filename)
+
+    def _open(self, instrument: str, granularity: str, price: str) \
+            -> "np.ndarray":
+        path = self._get_path(instrument, granularity, price, "candles")
+
+        if not os.path.exists(path) or not os.path.getsize(path):
+            return np.empty(0, dtype=CANDLE_DTYPE)
+
+        return np.memmap(path, dtype=CANDLE_DTYPE, mode="r")
+
+    def _write_candles(self, instrument: str, granularity: str, price: str,
+                       candles: "np.ndarray") \
+            -> None:
+        if not len(candles):
+            return
+
+        path = self._get_path(instrument, granularity, price, "candles")
+        saved = self._open(instrument, granularity, price)
+
+        if len(saved):
+            last_time = saved["time"][-1]
+            older = candles[candles["time"] <= last_time]
+            indexes = np.searchsorted(saved["time"], older["time"])
+
+            # Candles which are already saved are skipped, the other older
+            # ones fill a gap, so the whole file must be rewritten.
+
+            if (saved["time"][indexes] == older["time"]).all():
+                candles = candles[candles["time"] > last_time]
+            else:
+                merged = merge_candles([saved, candles])
+                temporary_path = path + ".tmp"
+                merged.tofile(temporary_path)
+                os.replace(temporary_path, path)
+                return
+
+        with open(path, "ab") as f:
+            np.ascontiguousarray(candles).tofile(f)
+
+    def _load_ranges(self, instrument: str, granularity: str, price: str) \
+            -> List[List[float]]:
+        path = self._get_path(instrument, granularity, price, "json")
+
+        if not os.path.exists(path):
+            return []
+
+        with open(path) as f:
+            return json.load(f)["ranges"]
+
+    def _save_ranges(self, instrument: str, granularity: str, price: str,
+                     ranges: List[List[float]]) \
+            -> None:
+        merged_ranges = []
+
+        for start, end in sorted(ranges):
+            if merged_ranges and start <= merged_ranges[-1][1]:
+                merged_ranges[-1][1] = max(merged_ranges[-1][1], end)
+            else:
+                merged_ranges.append([start, end])
+
+        path = self._get_path(instrument, granularity, price, "json")
+        temporary_path = path + ".tmp"
+
+        with open(temporary_path, "w") as f:
+            json.dump({"ranges": merged_ranges}, f)
+
+        os.replace(temporary_path, path)
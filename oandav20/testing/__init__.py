@@ -1 +1,2 @@
+from .server import MockServer
 from .testcase import TestCase, ID
@@ -0,0 +1,360 @@
+"""Benchmarks of the client hot paths.
+
+Run all benchmarks and save the results:
+
+    python -m oandav20.testing.benchmarks --output results.json
+
+Compare the actual results with saved ones:
+
+    python -m oandav20.testing.benchmarks --compare results.json
+
+The bulk benchmarks run against the local MockServer, so no Oanda account
+is needed. The numbers are comparable only between runs on the same machine.
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List
+
+import requests
+
+from oandav20 import Oanda
+from oandav20.instruments import INSTRUMENT_INDEX
+from oandav20.testing.server import MockServer
+
+ID = "101-004-0000000-001"
+
+# Version of the results format, increased by incompatible changes.
+
+RESULTS_VERSION = 1
+
+
+def measure(function: Callable[[], None], operations: int, repeat: int) \
+        -> dict:
+    """Call the function 'repeat' times and compute statistics.
+
+    Arguments:
+        function:
+            Function doing the given number of operations.
+        operations:
+            Number of operations done by one call.
+        repeat:
+            Number of calls.
+
+    Returns:
+        JSON object (dict) with the median and best number of seconds per
+        operation, operations per second (by the median) and durations of
+        all calls.
+    """
+    durations = []
+
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - started)
+
+    median = statistics.median(durations) / operations
+
+    return {
+        "best": min(durations) / operations,
+        "median": median,
+        "operations": operations,
+        "ops_per_second": 1 / median if median else 0.0,
+        "runs": durations
+    }
+
+
+def create_offline_client() -> Oanda:
+    """Create an Oanda object which doesn't send any request.
+
+    The '_request' method returns a pending order for every GET and the
+    keyword arguments otherwise, so only validation and building of the
+    requests is measured.
+    """
+    order = {
+        "createTime": "2016-08-19T12:00:00.000000000Z",
+        "id": "1",
+        "instrument": "EUR_USD",
+        "partialFill": "DEFAULT_FILL",
+        "positionFill": "POSITION_DEFAULT",
+        "price": "1.10000",
+        "state": "PENDING",
+        "timeInForce": "GTC",
+        "triggerCondition": "TRIGGER_DEFAULT",
+        "type": "LIMIT",
+        "units": "100"
+    }
+
+    def request(endpoint, method="GET", parser=None, **kwargs):
+        if method == "GET":
+            return {"order": order}
+
+        return kwargs
+
+    oanda = Oanda("DEMO", "benchmark", ID)
+    oanda._request = request
+
+    return oanda
+
+
+def bench_create_order(size: int, repeat: int) -> dict:
+    oanda = create_offline_client()
+
+    def run():
+        for index in range(size):
+            oanda.create_order("LIMIT", "EUR_USD", "BUY", 100, price=1.1,
+                               stoploss=1.0, takeprofit=1.2,
+                               own_id="EUR_USD_{}".format(index))
+
+    return measure(run, size, repeat)
+
+
+def bench_update_order(size: int, repeat: int) -> dict:
+    oanda = create_offline_client()
+
+    def run():
+        for index in range(size):
+            oanda.update_order(index + 1, price=1.2, stoploss=1.1,
+                               units=200)
+
+    return measure(run, size, repeat)
+
+
+def create_account_payloads(size: int) -> Dict[str, bytes]:
+    """Create bodies of large 'get_account' and 'get_pricing' responses.
+
+    Arguments:
+        size:
+            Number of the pending orders and open trades in the account.
+    """
+    server = MockServer([ID])
+    account = server.accounts[ID]
+    instruments = sorted(INSTRUMENT_INDEX)
+
+    with server.lock:
+        for index in range(size):
+            instrument = instruments[index % len(instruments)]
+            account.create_order({"instrument": instrument, "price": "0.1",
+                                  "type": "LIMIT", "units": "100"})
+            account.create_order({
+                "clientExtensions": {"id": "trade_{}".format(index)},
+                "instrument": instrument,
+                "stopLossOnFill": {"price": "0.01"},
+                "tradeClientExtensions": {"id": "trade_{}".format(index)},
+                "type": "MARKET",
+                "units": "100"
+            })
+
+        account_body = {"account": account.get_details(),
+                        "lastTransactionID": account.last_transaction_id}
+        pricing_body = {"prices": account.get_prices(instruments)}
+
+    return {"account": json.dumps(account_body).encode(),
+            "pricing": json.dumps(pricing_body).encode()}
+
+
+def bench_decode(content: bytes, size: int, repeat: int) -> dict:
+    """Measure decoding of the response body like the client does it."""
+    response = requests.Response()
+    response.status_code = 200
+    response.encoding = "utf-8"
+    response._content = content
+
+    def run():
+        for _ in range(size):
+            response.json()
+
+    result = measure(run, size, repeat)
+    result["bytes"] = len(content)
+
+    return result
+
+
+def bench_bulk(method: str, size: int, repeat: int, latency: float,
+               concurrency: int) \
+        -> dict:
+    """Measure end-to-end throughput of the bulk close or cancel against
+    the MockServer.
+
+    Arguments:
+        method:
+            Either "close_all_trades" or "cancel_all_orders".
+        size:
+            Number of the trades or orders.
+        repeat:
+            Number of measured runs.
+        latency:
+            Latency of the mock server in seconds.
+        concurrency:
+            Maximum number of concurrent requests.
+    """
+    durations = []
+
+    with MockServer([ID], latency=latency) as server:
+        oanda = server.create_client()
+        oanda.rate_limiter = None
+        account = server.accounts[ID]
+
+        for _ in range(repeat):
+            with server.lock:
+                for index in range(size):
+                    if method == "close_all_trades":
+                        account.create_order({"instrument": "EUR_USD",
+                                              "type": "MARKET",
+                                              "units": "1"})
+                    else:
+                        account.create_order({"instrument": "EUR_USD",
+                                              "price": "0.1",
+                                              "type": "LIMIT",
+                                              "units": "1"})
+
+            started = time.perf_counter()
+            report = getattr(oanda, method)(concurrency=concurrency)
+            durations.append(time.perf_counter() - started)
+
+            if report.failed:
+                raise report.failed[0].error
+
+        oanda.close()
+
+    median = statistics.median(durations)
+
+    # One GET for the list and one PUT per trade or order.
+
+    return {
+        "best": min(durations) / size,
+        "concurrency": concurrency,
+        "latency": latency,
+        "median": median / size,
+        "operations": size,
+        "ops_per_second": size / median if median else 0.0,
+        "requests": size + 1,
+        "runs": durations
+    }
+
+
+def run_benchmarks(size: int = 1000, repeat: int = 5, bulk_size: int = 200,
+                   latency: float = 0.0, concurrency: int = 10) \
+        -> Dict[str, dict]:
+    """Run all benchmarks.
+
+    Arguments:
+        size:
+            Number of operations of the micro benchmarks and number of the
+            orders and trades in the decoded account.
+        repeat:
+            Number of measured runs of every benchmark.
+        bulk_size:
+            Number of the closed trades and canceled orders.
+        latency:
+            Latency of the mock server in seconds.
+        concurrency:
+            Maximum number of concurrent requests of the bulk methods.
+
+    Returns:
+        JSON object (dict) with results by benchmark names, see 'measure'.
+    """
+    payloads = create_account_payloads(size // 10 or 1)
+
+    return {
+        "build.create_order": bench_create_order(size, repeat),
+        "build.update_order": bench_update_order(size, repeat),
+        "decode.get_account": bench_decode(
+            payloads["account"], size // 10 or 1, repeat),
+        "decode.get_pricing": bench_decode(
+            payloads["pricing"], size // 10 or 1, repeat),
+        "bulk.close_all_trades": bench_bulk(
+            "close_all_trades", bulk_size, repeat, latency, concurrency),
+        "bulk.cancel_all_orders": bench_bulk(
+            "cancel_all_orders", bulk_size, repeat, latency, concurrency)
+    }
+
+
+def get_metadata() -> dict:
+    """Describe the environment of the benchmarks."""
+    try:
+        commit = subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = ""
+
+    return {
+        "commit": commit,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "time": datetime.datetime.now(datetime.timezone.utc).strftime(
+            "%Y-%m-%dT%H:%M:%SZ"),
+        "version": RESULTS_VERSION
+    }
+
+
+def compare(old: Dict[str, dict], new: Dict[str, dict]) -> List[str]:
+    """Format table of the median times, ratio below 1 means speed-up.
+
+    Arguments:
+        old:
+            Saved results.
+        new:
+            Actual results.
+    """
+    lines = ["{:<28} {:>14} {:>14} {:>8}".format(
+        "benchmark", "old (s/op)", "new (s/op)", "ratio")]
+
+    for name, result in sorted(new.items()):
+        if name not in old:
+            continue
+
+        old_median = old[name]["median"]
+        ratio = result["median"] / old_median if old_median else 0.0
+        lines.append("{:<28} {:>14.3e} {:>14.3e} {:>8.2f}".format(
+            name, old_median, result["median"], ratio))
+
+    return lines
+
+
+def main(arguments: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmarks of the oandav20 client.")
+    parser.add_argument("--size", type=int, default=1000,
+                        help="number of operations of micro benchmarks")
+    parser.add_argument("--bulk-size", type=int, default=200,
+                        help="number of closed trades / canceled orders")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="number of measured runs")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="latency of the mock server in seconds")
+    parser.add_argument("--concurrency", type=int, default=10,
+                        help="concurrency of the bulk methods")
+    parser.add_argument("--output", help="save results to the JSON file")
+    parser.add_argument("--compare", help="compare with the JSON file")
+    options = parser.parse_args(arguments)
+
+    results = run_benchmarks(options.size, options.repeat,
+                             options.bulk_size, options.latency,
+                             options.concurrency)
+    document = {"metadata": get_metadata(), "results": results}
+
+    if options.output:
+        with open(options.output, "w") as f:
+            json.dump(document, f, indent=2, sort_keys=True)
+
+    if options.compare:
+        with open(options.compare) as f:
+            old_results = json.load(f)["results"]
+
+        print("\n".join(compare(old_results, results)))
+    elif not options.output:
+        json.dump(document, sys.stdout, indent=2, sort_keys=True)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1539 @@
+import datetime
+import json
+import math
+import random
+import re
+import threading
+import time
+import zlib
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from oandav20.instruments import INSTRUMENT_INDEX
+
+# Oanda account types of the asset classes.
+
+INSTRUMENT_TYPES = {
+    "BOND": "CFD",
+    "COMMODITY": "CFD",
+    "FOREX": "CURRENCY",
+    "INDEX": "CFD",
+    "METAL": "METAL"
+}
+
+GRANULARITY_SECONDS = {
+    "S5": 5, "S10": 10, "S15": 15, "S30": 30, "M1": 60, "M2": 120,
+    "M4": 240, "M5": 300, "M10": 600, "M15": 900, "M30": 1800, "H1": 3600,
+    "H2": 7200, "H3": 10800, "H4": 14400, "H6": 21600, "H8": 28800,
+    "H12": 43200, "D": 86400, "W": 604800, "M": 2678400
+}
+
+# Keys of the account changes.
+
+CHANGE_KEYS = [
+    "ordersCancelled", "ordersCreated", "ordersFilled", "ordersTriggered",
+    "positions", "tradesClosed", "tradesOpened", "tradesReduced",
+    "transactions"
+]
+
+TRANSACTION_ORDER_TYPES = {
+    "LIMIT": "LIMIT_ORDER",
+    "MARKET": "MARKET_ORDER",
+    "STOP": "STOP_ORDER"
+}
+
+
+class MockError(Exception):
+    """Error response of the mock server."""
+
+    def __init__(self, status: int, message: str, code: str = "") -> None:
+        super().__init__(message)
+        self.status = status
+        self.body = {"errorMessage": message}
+
+        if code:
+            self.body["errorCode"] = code
+
+
+def format_time(unix_time: float) -> str:
+    """Format UNIX time like Oanda (RFC 3339 with nanoseconds)."""
+    moment = datetime.datetime.utcfromtimestamp(unix_time)
+
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.%f") + "000Z"
+
+
+def parse_time(value: str) -> float:
+    """Parse UNIX time or RFC 3339 time from the URL parameters."""
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    moment = datetime.datetime.strptime(value[:19], "%Y-%m-%dT%H:%M:%S")
+
+    return (moment - datetime.datetime(1970, 1, 1)).total_seconds()
+
+
+def get_base_price(instrument: str) -> Decimal:
+    """Get deterministic starting mid price of the instrument."""
+    price = 1 + Decimal(zlib.crc32(instrument.encode()) % 1000) / 1000
+
+    if instrument.endswith("JPY") or instrument.endswith("HUF"):
+        price *= 100
+
+    return price
+
+
+class MockAccount:
+    """MockAccount holds in-memory state of one trading account.
+
+    All methods must be called with the server lock held.
+
+    Attributes:
+        account_id (str):
+            Oanda trading account ID.
+        balance (Decimal):
+            Account balance.
+        margin_rate (str):
+            Configured margin rate.
+        orders (Dict[str, dict]):
+            All orders by their IDs.
+        trades (Dict[str, dict]):
+            All trades by their IDs.
+        transactions (List[dict]):
+            All transactions in order of creation.
+    """
+
+    def __init__(self, server: "MockServer", account_id: str) -> None:
+        self.server = server
+        self.account_id = account_id
+        self.balance = Decimal("100000")
+        self.margin_rate = "0.01"
+        self.created_time = format_time(time.time())
+        self.orders = {}
+        self.trades = {}
+        self.transactions = []
+        self.realized_pl = {}
+        self._changes = []
+
+    # Helpers
+
+    @property
+    def last_transaction_id(self) -> str:
+        return self.transactions[-1]["id"] if self.transactions else "0"
+
+    def add_transaction(self, transaction_type: str, **fields: Any) -> dict:
+        transaction = {
+            "accountID": self.account_id,
+            "batchID": str(self.server.next_id()),
+            "time": format_time(time.time()),
+            "type": transaction_type,
+            "userID": 1
+        }
+        transaction.update(fields)
+        transaction["id"] = transaction.pop("id", None) or \
+            str(self.server.next_id())
+        self.transactions.append(transaction)
+        self.log_change("transactions", transaction)
+        self.server.notify()
+
+        return transaction
+
+    def log_change(self, key: str, item: dict) -> None:
+        transaction_id = int(self.last_transaction_id)
+        self._changes.append((transaction_id, key, json.loads(
+            json.dumps(item))))
+
+    def find_order(self, specifier: str) -> dict:
+        order = self._find(self.orders, specifier)
+
+        if order is None:
+            raise MockError(404, "The Order specified does not exist",
+                            "ORDER_DOESNT_EXIST")
+
+        return order
+
+    def find_trade(self, specifier: str) -> dict:
+        trade = self._find(self.trades, specifier)
+
+        if trade is None:
+            raise MockError(404, "The Trade specified does not exist",
+                            "TRADE_DOESNT_EXIST")
+
+        return trade
+
+    def _find(self, items: Dict[str, dict], specifier: str) \
+            -> Optional[dict]:
+        if not specifier.startswith("@"):
+            return items.get(specifier)
+
+        own_id = specifier[1:]
+
+        for item in reversed(list(items.values())):
+            if item.get("clientExtensions", {}).get("id") == own_id:
+                return item
+
+        return None
+
+    def get_price(self, instrument: str) -> Tuple[Decimal, Decimal]:
+        mid = self.server.get_mid_price(instrument)
+        half_spread = (mid * Decimal("0.0001")).quantize(Decimal("0.00001"))
+
+        return mid - half_spread, mid + half_spread
+
+    def get_unrealized_pl(self, trade: dict) -> Decimal:
+        bid, ask = self.get_price(trade["instrument"])
+        units = Decimal(trade["currentUnits"])
+        price = bid if units > 0 else ask
+
+        return ((price - Decimal(trade["price"])) * units).quantize(
+            Decimal("0.0001"))
+
+    def get_open_trades(self) -> List[dict]:
+        trades = [trade for trade in self.trades.values()
+                  if trade["state"] == "OPEN"]
+
+        for trade in trades:
+            trade["unrealizedPL"] = str(self.get_unrealized_pl(trade))
+
+        return trades
+
+    def get_pending_orders(self) -> List[dict]:
+        return [order for order in self.orders.values()
+                if order["state"] == "PENDING"]
+
+    def get_position(self, instrument: str) -> dict:
+        sides = {}
+
+        for side, sign in [("long", 1), ("short", -1)]:
+            trades = [trade for trade in self.get_open_trades()
+                      if trade["instrument"] == instrument and
+                      Decimal(trade["currentUnits"]) * sign > 0]
+            units = sum(Decimal(trade["currentUnits"]) for trade in trades)
+            unrealized_pl = sum(Decimal(trade["unrealizedPL"])
+                                for trade in trades)
+            realized_pl = self.realized_pl.get((instrument, side),
+                                               Decimal("0"))
+            sides[side] = {
+                "pl": str(realized_pl),
+                "resettablePL": str(realized_pl),
+                "tradeIDs": [trade["id"] for trade in trades],
+                "units": str(units),
+                "unrealizedPL": str(unrealized_pl)
+            }
+
+            if units:
+                average_price = sum(
+                    Decimal(trade["price"]) * Decimal(trade["currentUnits"])
+                    for trade in trades) / units
+                sides[side]["averagePrice"] = str(
+                    average_price.quantize(Decimal("0.00001")))
+
+        position = {
+            "instrument": instrument,
+            "long": sides["long"],
+            "short": sides["short"]
+        }
+
+        for key in ["pl", "resettablePL", "unrealizedPL"]:
+            position[key] = str(Decimal(sides["long"][key]) +
+                                Decimal(sides["short"][key]))
+
+        return position
+
+    def get_positions(self) -> List[dict]:
+        instruments = sorted(set(trade["instrument"]
+                                 for trade in self.trades.values()))
+
+        return [self.get_position(instrument) for instrument in instruments]
+
+    def get_summary(self) -> dict:
+        trades = self.get_open_trades()
+        unrealized_pl = sum(Decimal(trade["unrealizedPL"])
+                            for trade in trades)
+        margin_used = sum(
+            abs(Decimal(trade["currentUnits"]) * Decimal(trade["price"]))
+            for trade in trades) * Decimal(self.margin_rate)
+        nav = self.balance + unrealized_pl
+
+        return {
+            "NAV": str(nav),
+            "alias": "Primary",
+            "balance": str(self.balance),
+            "createdTime": self.created_time,
+            "currency": "USD",
+            "hedgingEnabled": True,
+            "id": self.account_id,
+            "lastTransactionID": self.last_transaction_id,
+            "marginAvailable": str(nav - margin_used),
+            "marginRate": self.margin_rate,
+            "marginUsed": str(margin_used),
+            "openPositionCount": len([
+                position for position in self.get_positions()
+                if position["long"]["units"] != "0" or
+                position["short"]["units"] != "0"]),
+            "openTradeCount": len(trades),
+            "pendingOrderCount": len(self.get_pending_orders()),
+            "unrealizedPL": str(unrealized_pl)
+        }
+
+    def get_details(self) -> dict:
+        details = self.get_summary()
+        details["orders"] = self.get_pending_orders()
+        details["positions"] = self.get_positions()
+        details["trades"] = self.get_open_trades()
+
+        return details
+
+    def get_changes(self, since_transaction_id: int) -> dict:
+        changes = {key: [] for key in CHANGE_KEYS}
+
+        for transaction_id, key, item in self._changes:
+            if transaction_id > since_transaction_id:
+                changes[key].append(item)
+
+        instruments = set(position["instrument"]
+                          for position in changes["positions"])
+        changes["positions"] = [self.get_position(instrument)
+                                for instrument in sorted(instruments)]
+
+        state = self.get_summary()
+        state["orders"] = []
+        state["trades"] = [
+            {"id": trade["id"], "unrealizedPL": trade["unrealizedPL"]}
+            for trade in self.get_open_trades()]
+        state["positions"] = [
+            {
+                "instrument": position["instrument"],
+                "longUnrealizedPL": position["long"]["unrealizedPL"],
+                "netUnrealizedPL": position["unrealizedPL"],
+                "shortUnrealizedPL": position["short"]["unrealizedPL"]
+            }
+            for position in self.get_positions()]
+
+        return {"changes": changes, "state": state}
+
+    # Orders
+
+    def validate_order(self, request: dict, replaces: dict = None) \
+            -> Decimal:
+        """Validate the order request like Oanda does.
+
+        Returns:
+            Units of the order.
+        """
+        order_type = request.get("type")
+        instrument = request.get("instrument")
+
+        if order_type not in TRANSACTION_ORDER_TYPES:
+            raise MockError(400, "Invalid value specified for 'type'",
+                            "INVALID_ORDER_TYPE")
+
+        if instrument not in INSTRUMENT_INDEX:
+            raise MockError(400, "Invalid value specified for 'instrument'",
+                            "INSTRUMENT_NOT_TRADEABLE")
+
+        try:
+            units = Decimal(request.get("units", "0"))
+        except ArithmeticError:
+            units = Decimal("0")
+
+        if not units:
+            raise MockError(400, "Invalid value specified for 'units'",
+                            "UNITS_INVALID")
+
+        if order_type != "MARKET" and "price" not in request:
+            raise MockError(400, "Order price must be specified",
+                            "PRICE_MISSING")
+
+        own_id = request.get("clientExtensions", {}).get("id")
+        existing = self._find(self.orders, "@" + own_id) if own_id else None
+
+        if existing is not None and existing is not replaces:
+            raise MockError(400, "The client Order ID specified is already "
+                            "in use", "CLIENT_ORDER_ID_ALREADY_EXISTS")
+
+        return units
+
+    def create_order(self, request: dict, replaces: dict = None) -> dict:
+        units = self.validate_order(request, replaces)
+        order_type = request["type"]
+        extensions = {key: value for key, value in
+                      request.get("clientExtensions", {}).items() if value}
+        fields = {key: value for key, value in request.items()
+                  if key not in ["clientExtensions", "tradeClientExtensions",
+                                 "type"]}
+        fields["reason"] = "REPLACEMENT" if replaces else "CLIENT_ORDER"
+
+        if extensions:
+            fields["clientExtensions"] = extensions
+
+        trade_extensions = {
+            key: value for key, value in
+            request.get("tradeClientExtensions", {}).items() if value}
+
+        if trade_extensions:
+            fields["tradeClientExtensions"] = trade_extensions
+
+        if replaces:
+            fields["replacesOrderID"] = replaces["id"]
+
+        transaction = self.add_transaction(
+            TRANSACTION_ORDER_TYPES[order_type], **fields)
+
+        order = {key: value for key, value in fields.items()
+                 if key != "reason"}
+        order.update({
+            "createTime": transaction["time"],
+            "id": transaction["id"],
+            "partialFill": "DEFAULT_FILL",
+            "positionFill": "POSITION_DEFAULT",
+            "state": "PENDING",
+            "triggerCondition": "TRIGGER_DEFAULT",
+            "type": order_type
+        })
+        self.orders[order["id"]] = order
+        response = {"orderCreateTransaction": transaction}
+
+        if order_type == "MARKET":
+            fill = self.fill_order(order, units)
+            response["orderFillTransaction"] = fill
+        else:
+            self.log_change("ordersCreated", order)
+
+        return response
+
+    def replace_order(self, specifier: str, request: dict) -> dict:
+        order = self.find_order(specifier)
+
+        if order["state"] != "PENDING":
+            raise MockError(404, "The Order specified is not pending",
+                            "ORDER_DOESNT_EXIST")
+
+        self.validate_order(request.get("order", {}), order)
+        cancel = self.cancel_order(order, "CLIENT_REQUEST_REPLACED")
+        response = self.create_order(request.get("order", {}), order)
+        order["replacedByOrderID"] = \
+            response["orderCreateTransaction"]["id"]
+        cancel["replacedByOrderID"] = order["replacedByOrderID"]
+        response["orderCancelTransaction"] = cancel
+
+        return response
+
+    def cancel_order(self, order: dict, reason: str = "CLIENT_REQUEST") \
+            -> dict:
+        if order["state"] != "PENDING":
+            raise MockError(404, "The Order specified is not pending",
+                            "ORDER_DOESNT_EXIST")
+
+        fields = {"orderID": order["id"], "reason": reason}
+
+        if "clientExtensions" in order:
+            fields["clientOrderID"] = order["clientExtensions"]["id"]
+
+        transaction = self.add_transaction("ORDER_CANCEL", **fields)
+        order["state"] = "CANCELLED"
+        order["cancellingTransactionID"] = transaction["id"]
+        order["cancelledTime"] = transaction["time"]
+        self.log_change("ordersCancelled", order)
+
+        return transaction
+
+    def update_order_extensions(self, specifier: str, request: dict) \
+            -> dict:
+        order = self.find_order(specifier)
+        extensions = request.get("clientExtensions", {})
+        trade_extensions = request.get("tradeClientExtensions", {})
+        transaction = self.add_transaction(
+            "ORDER_CLIENT_EXTENSIONS_MODIFY", orderID=order["id"],
+            clientExtensionsModify=extensions,
+            tradeClientExtensionsModify=trade_extensions)
+        order["clientExtensions"] = dict(
+            order.get("clientExtensions", {}), **extensions)
+
+        if trade_extensions:
+            order["tradeClientExtensions"] = dict(
+                order.get("tradeClientExtensions", {}), **trade_extensions)
+
+        return {"orderClientExtensionsModifyTransaction": transaction}
+
+    def fill_order(self, order: dict, units: Decimal,
+                   closed_trades: List[Tuple[dict, Decimal]] = ()) \
+            -> dict:
+        """Fill the market order, open a trade or reduce the given ones."""
+        instrument = order["instrument"]
+        bid, ask = self.get_price(instrument)
+        price = ask if units > 0 else bid
+        fields = {
+            "instrument": instrument,
+            "orderID": order["id"],
+            "price": str(price),
+            "reason": "MARKET_ORDER",
+            "units": str(units)
+        }
+        fill_id = str(self.server.next_id())
+        total_pl = Decimal("0")
+
+        if closed_trades:
+            fields["tradesClosed"] = []
+
+            for trade, closed_units in closed_trades:
+                current_units = Decimal(trade["currentUnits"])
+                realized_pl = ((price - Decimal(trade["price"])) *
+                               closed_units).quantize(Decimal("0.0001"))
+                total_pl += realized_pl
+                trade["realizedPL"] = str(
+                    Decimal(trade["realizedPL"]) + realized_pl)
+                side = "long" if current_units > 0 else "short"
+                key = (instrument, side)
+                self.realized_pl[key] = \
+                    self.realized_pl.get(key, Decimal("0")) + realized_pl
+                item = {"tradeID": trade["id"], "units": str(-closed_units),
+                        "realizedPL": str(realized_pl)}
+
+                if closed_units == current_units:
+                    trade["currentUnits"] = "0"
+                    trade["state"] = "CLOSED"
+                    trade["closeTime"] = format_time(time.time())
+                    trade["averageClosePrice"] = str(price)
+                    fields["tradesClosed"].append(item)
+                    self.close_dependent_orders(trade)
+                else:
+                    trade["currentUnits"] = str(current_units - closed_units)
+                    fields["tradeReduced"] = item
+
+                trade["closingTransactionIDs"] = \
+                    trade.get("closingTransactionIDs", []) + [fill_id]
+
+            if not fields["tradesClosed"]:
+                del fields["tradesClosed"]
+        else:
+            trade_opened = {"price": str(price), "tradeID": fill_id,
+                            "units": str(units)}
+
+            if "tradeClientExtensions" in order:
+                trade_opened["clientExtensions"] = \
+                    order["tradeClientExtensions"]
+
+            fields["tradeOpened"] = trade_opened
+
+        fields["pl"] = str(total_pl)
+        self.balance += total_pl
+        transaction = self.add_transaction("ORDER_FILL", id=fill_id,
+                                           **fields)
+
+        order["state"] = "FILLED"
+        order["filledTime"] = transaction["time"]
+        order["fillingTransactionID"] = transaction["id"]
+        self.log_change("ordersFilled", order)
+
+        if "tradeOpened" in fields:
+            trade = self.open_trade(order, transaction)
+            order["tradeOpenedID"] = trade["id"]
+
+        for item in fields.get("tradesClosed", []):
+            self.log_change("tradesClosed", self.trades[item["tradeID"]])
+
+        if "tradeReduced" in fields:
+            self.log_change("tradesReduced",
+                            self.trades[fields["tradeReduced"]["tradeID"]])
+
+        self.log_change("positions", {"instrument": instrument})
+
+        return transaction
+
+    # Trades
+
+    def open_trade(self, order: dict, transaction: dict) -> dict:
+        trade = {
+            "currentUnits": transaction["units"],
+            "financing": "0.0000",
+            "id": transaction["id"],
+            "initialUnits": transaction["units"],
+            "instrument": transaction["instrument"],
+            "openTime": transaction["time"],
+            "price": transaction["price"],
+            "realizedPL": "0.0000",
+            "state": "OPEN",
+            "unrealizedPL": "0.0000"
+        }
+
+        if "tradeClientExtensions" in order:
+            trade["clientExtensions"] = dict(order["tradeClientExtensions"])
+
+        self.trades[trade["id"]] = trade
+
+        for key, order_type in [("stopLossOnFill", "STOP_LOSS"),
+                                ("takeProfitOnFill", "TAKE_PROFIT")]:
+            if key in order:
+                self.set_dependent_order(trade, order_type, order[key])
+
+        self.log_change("tradesOpened", trade)
+
+        return trade
+
+    def set_dependent_order(self, trade: dict, order_type: str,
+                            details: Optional[dict]) \
+            -> Optional[dict]:
+        key = "stopLossOrder" if order_type == "STOP_LOSS" else \
+            "takeProfitOrder"
+
+        if key in trade:
+            self.cancel_order(self.orders[trade[key]["id"]])
+            del trade[key]
+
+        if not details or Decimal(details.get("price", "0")) == 0:
+            return None
+
+        transaction = self.add_transaction(
+            order_type + "_ORDER", tradeID=trade["id"],
+            price=details["price"],
+            timeInForce=details.get("timeInForce", "GTC"),
+            reason="CLIENT_ORDER")
+        order = {
+            "createTime": transaction["time"],
+            "id": transaction["id"],
+            "price": details["price"],
+            "state": "PENDING",
+            "timeInForce": details.get("timeInForce", "GTC"),
+            "tradeID": trade["id"],
+            "triggerCondition": "TRIGGER_DEFAULT",
+            "type": order_type
+        }
+        self.orders[order["id"]] = order
+        trade[key] = order
+        self.log_change("ordersCreated", order)
+
+        return transaction
+
+    def close_dependent_orders(self, trade: dict) -> None:
+        for key in ["stopLossOrder", "takeProfitOrder"]:
+            if key in trade:
+                self.cancel_order(self.orders[trade[key]["id"]],
+                                  "LINKED_TRADE_CLOSED")
+                del trade[key]
+
+    def update_trade_orders(self, specifier: str, request: dict) -> dict:
+        trade = self.find_trade(specifier)
+
+        if trade["state"] != "OPEN":
+            raise MockError(400, "The Trade specified is not open",
+                            "TRADE_DOESNT_EXIST")
+
+        response = {}
+
+        for key, order_type in [("stopLoss", "STOP_LOSS"),
+                                ("takeProfit", "TAKE_PROFIT")]:
+            if key in request:
+                transaction = self.set_dependent_order(
+                    trade, order_type, request[key])
+
+                if transaction:
+                    response[key + "OrderTransaction"] = transaction
+
+        return response
+
+    def update_trade_extensions(self, specifier: str, request: dict) \
+            -> dict:
+        trade = self.find_trade(specifier)
+        extensions = request.get("clientExtensions", {})
+        transaction = self.add_transaction(
+            "TRADE_CLIENT_EXTENSIONS_MODIFY", tradeID=trade["id"],
+            tradeClientExtensionsModify=extensions)
+        trade["clientExtensions"] = dict(
+            trade.get("clientExtensions", {}), **extensions)
+
+        return {"tradeClientExtensionsModifyTransaction": transaction}
+
+    def close_trade(self, specifier: str, request: dict) -> dict:
+        trade = self.find_trade(specifier)
+
+        if trade["state"] != "OPEN":
+            raise MockError(404, "The Trade specified is not open",
+                            "TRADE_DOESNT_EXIST")
+
+        current_units = Decimal(trade["currentUnits"])
+        units = request.get("units", "ALL")
+
+        if units == "ALL":
+            closed_units = current_units
+        else:
+            closed_units = abs(Decimal(units)).copy_sign(current_units)
+
+            if abs(closed_units) > abs(current_units):
+                raise MockError(400, "The units specified exceeds the open "
+                                "units", "CLOSE_TRADE_UNITS_EXCEED_TRADE_SIZE")
+
+        return self.close_units(trade["instrument"], "TRADE_CLOSE",
+                                [(trade, closed_units)])
+
+    def close_units(self, instrument: str, reason: str,
+                    closed_trades: List[Tuple[dict, Decimal]]) \
+            -> dict:
+        units = -sum(units for trade, units in closed_trades)
+        transaction = self.add_transaction(
+            "MARKET_ORDER", instrument=instrument, reason=reason,
+            timeInForce="FOK", units=str(units))
+        order = {
+            "createTime": transaction["time"],
+            "id": transaction["id"],
+            "instrument": instrument,
+            "state": "PENDING",
+            "type": "MARKET",
+            "units": str(units)
+        }
+        self.orders[order["id"]] = order
+        fill = self.fill_order(order, units, closed_trades)
+
+        return {"orderCreateTransaction": transaction,
+                "orderFillTransaction": fill}
+
+    # Positions
+
+    def close_position(self, instrument: str, request: dict) -> dict:
+        if instrument not in INSTRUMENT_INDEX:
+            raise MockError(400, "Invalid value specified for 'instrument'",
+                            "INSTRUMENT_NOT_TRADEABLE")
+
+        response = {}
+
+        for side, sign in [("long", 1), ("short", -1)]:
+            units = request.get(side + "Units", "NONE")
+
+            if units == "NONE":
+                continue
+
+            trades = sorted(
+                [trade for trade in self.get_open_trades()
+                 if trade["instrument"] == instrument and
+                 Decimal(trade["currentUnits"]) * sign > 0],
+                key=lambda trade: int(trade["id"]))
+            open_units = sum(abs(Decimal(trade["currentUnits"]))
+                             for trade in trades)
+
+            if not open_units:
+                raise MockError(400, "The Position requested to be closed "
+                                "out does not exist",
+                                "CLOSEOUT_POSITION_DOESNT_EXIST")
+
+            remaining = open_units if units == "ALL" else \
+                abs(Decimal(units))
+
+            if remaining > open_units:
+                raise MockError(400, "The units specified exceeds the open "
+                                "units",
+                                "CLOSEOUT_POSITION_UNITS_EXCEED_POSITION_SIZE")
+
+            closed_trades = []
+
+            for trade in trades:
+                if not remaining:
+                    break
+
+                trade_units = min(abs(Decimal(trade["currentUnits"])),
+                                  remaining)
+                closed_trades.append((trade, trade_units * sign))
+                remaining -= trade_units
+
+            result = self.close_units(instrument, "POSITION_CLOSEOUT",
+                                      closed_trades)
+            response[side + "OrderCreateTransaction"] = \
+                result["orderCreateTransaction"]
+            response[side + "OrderFillTransaction"] = \
+                result["orderFillTransaction"]
+
+        if not response:
+            raise MockError(400, "Either longUnits or shortUnits must be "
+                            "specified", "UNITS_INVALID")
+
+        return response
+
+    # Instruments and pricing
+
+    def get_instruments(self, codes: List[str]) -> List[dict]:
+        codes = codes or sorted(INSTRUMENT_INDEX)
+        instruments = []
+
+        for code in codes:
+            info = INSTRUMENT_INDEX.get(code)
+
+            if info is None:
+                raise MockError(400, "Invalid value specified for "
+                                "'instruments'", "INVALID_INSTRUMENTS")
+
+            pip_location = -2 if code.endswith("JPY") or \
+                code.endswith("HUF") else -4
+            instruments.append({
+                "displayName": info.display_name,
+                "displayPrecision": -pip_location + 1,
+                "marginRate": "0.05" if info.asset_class != "FOREX" else
+                              "0.02",
+                "maximumOrderUnits": "100000000",
+                "maximumPositionSize": "0",
+                "maximumTrailingStopDistance": "1.00000",
+                "minimumTradeSize": "1",
+                "minimumTrailingStopDistance": "0.00050",
+                "name": code,
+                "pipLocation": pip_location,
+                "tradeUnitsPrecision": 0,
+                "type": INSTRUMENT_TYPES[info.asset_class]
+            })
+
+        return instruments
+
+    def get_prices(self, codes: List[str], unix: bool = False) \
+            -> List[dict]:
+        prices = []
+        now = time.time()
+
+        for code in codes:
+            if code not in INSTRUMENT_INDEX:
+                raise MockError(400, "Invalid value specified for "
+                                "'instruments'", "INVALID_INSTRUMENTS")
+
+            bid, ask = self.get_price(code)
+            prices.append({
+                "asks": [{"liquidity": 10000000, "price": str(ask)}],
+                "bids": [{"liquidity": 10000000, "price": str(bid)}],
+                "closeoutAsk": str(ask),
+                "closeoutBid": str(bid),
+                "instrument": code,
+                "quoteHomeConversionFactors": {
+                    "negativeUnits": "1.00000000",
+                    "positiveUnits": "1.00000000"
+                },
+                "status": "tradeable",
+                "time": "{:.9f}".format(now) if unix else format_time(now),
+                "tradeable": True,
+                "type": "PRICE"
+            })
+
+        return prices
+
+
+class MockServer:
+    """MockServer is a local stand-in of the Oanda v20 REST API.
+
+    It implements the accounts, orders, trades, positions, pricing,
+    transactions and candles endpoints (including the streaming ones) with
+    in-memory state, so the tests and benchmarks don't need any real
+    account or network access. Market orders are filled immediately, the
+    other orders stay pending. Prices move by random walk, candles are
+    generated deterministically.
+
+    Latency and errors may be injected either randomly ('latency',
+    'error_rate') or exactly for the next requests ('fail_next'). The open
+    streams may be broken ('drop_streams') or stalled ('stall_streams').
+
+    Example:
+        >>> with MockServer() as server:
+        ...     o = server.create_client()
+        ...     o.create_order("MARKET", "EUR_USD", "BUY", 1)
+        '1'
+
+    Attributes:
+        accounts (Dict[str, MockAccount]):
+            Trading accounts by their IDs.
+        error_rate (float):
+            Probability (0 - 1) of the injected error response.
+        error_status (int):
+            HTTP status code of the injected errors.
+        heartbeat_interval (float):
+            Number of seconds between the heartbeats of the streams.
+        latency (float):
+            Number of seconds added to every response.
+        lock (threading.RLock):
+            Lock guarding the state of the accounts.
+        price_interval (float):
+            Number of seconds between the prices of the pricing stream.
+        streams (int):
+            Number of the opened streams.
+        token (str):
+            Required access token, empty for any.
+    """
+
+    def __init__(self, account_ids: List[str] = None, token: str = "",
+                 latency: float = 0.0, error_rate: float = 0.0,
+                 error_status: int = 503, heartbeat_interval: float = 5.0,
+                 price_interval: float = 0.25, seed: int = 0,
+                 host: str = "127.0.0.1", port: int = 0) \
+            -> None:
+        """Initialize an instance of class MockServer.
+
+        Arguments:
+            account_ids:
+                IDs of the trading accounts, one account by default.
+            token:
+                Required access token, any token is accepted by default.
+            latency:
+                Number of seconds added to every response.
+            error_rate:
+                Probability (0 - 1) of the injected error response.
+            error_status:
+                HTTP status code of the injected errors.
+            heartbeat_interval:
+                Number of seconds between the heartbeats of the streams.
+            price_interval:
+                Number of seconds between the prices of the pricing stream.
+            seed:
+                Seed of the random prices and injected errors.
+            host:
+                Listening address.
+            port:
+                Listening port, any free port by default.
+        """
+        self.token = token
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.heartbeat_interval = heartbeat_interval
+        self.price_interval = price_interval
+        self.lock = threading.RLock()
+        self.accounts = {}
+        self.streams = 0
+
+        for account_id in account_ids or ["101-004-0000000-001"]:
+            self.accounts[account_id] = MockAccount(self, account_id)
+
+        self._address = (host, port)
+        self._random = random.Random(seed)
+        self._prices = {}
+        self._last_id = 0
+        self._failures = []
+        self._dropped = 0
+        self._stalled_until = 0.0
+        self._changed = threading.Condition(self.lock)
+        self._server = None
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def __enter__(self) -> "MockServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        """Base URL of the accounts endpoints."""
+        host, port = self._server.server_address[:2]
+
+        return "http://{0}:{1}/v3/accounts".format(host, port)
+
+    def start(self) -> None:
+        """Start serving in a background thread."""
+        self._stopped.clear()
+        self._server = _ThreadingHTTPServer(self._address, _MockHandler)
+        self._server.mock = self
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop serving and end all streams."""
+        self._stopped.set()
+        self.notify()
+
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def connect(self, oanda: Any) -> Any:
+        """Point the Oanda or AsyncOanda object to this server.
+
+        Returns:
+            The same object.
+        """
+        oanda.base_url = self.url
+        oanda.stream_url = self.url
+
+        return oanda
+
+    def create_client(self, account_id: str = "") -> "Oanda":
+        """Create an Oanda object connected to this server.
+
+        Arguments:
+            account_id:
+                Default trading account ID, the first account by default.
+        """
+        from oandav20 import Oanda
+
+        account_id = account_id or next(iter(self.accounts))
+
+        return self.connect(Oanda("DEMO", self.token or "mock", account_id))
+
+    def fail_next(self, count: int = 1, status: int = 503,
+                  retry_after: str = "") \
+            -> None:
+        """Respond to the next requests by an error.
+
+        Arguments:
+            count:
+                Number of the failed requests.
+            status:
+                HTTP status code of the error.
+            retry_after:
+                Value of the "Retry-After" header.
+        """
+        with self.lock:
+            self._failures.extend([(status, retry_after)] * count)
+
+    def drop_streams(self) -> None:
+        """Break the connections of all open streams without the final
+        chunk, like a network failure."""
+        with self.lock:
+            self._dropped += 1
+
+        self.notify()
+
+    def stall_streams(self, duration: float) -> None:
+        """Stop sending any data (including heartbeats) by all streams for
+        the given number of seconds."""
+        with self.lock:
+            self._stalled_until = time.time() + duration
+
+    def next_id(self) -> int:
+        """Return next transaction ID shared by all accounts."""
+        with self.lock:
+            self._last_id += 1
+            return self._last_id
+
+    def notify(self) -> None:
+        """Wake up the waiting streams."""
+        with self._changed:
+            self._changed.notify_all()
+
+    def get_mid_price(self, instrument: str) -> Decimal:
+        """Get actual mid price, the price moves by every call."""
+        with self.lock:
+            price = self._prices.get(instrument) or \
+                get_base_price(instrument)
+            step = Decimal(self._random.randint(-3, 3)) / 100000 * \
+                (price.adjusted() > 1 and 100 or 1)
+            self._prices[instrument] = max(price + step, Decimal("0.001"))
+
+            return self._prices[instrument]
+
+    def get_failure(self) -> Optional[Tuple[int, str]]:
+        """Pop the injected failure for the actual request, if any."""
+        with self.lock:
+            if self._failures:
+                return self._failures.pop(0)
+
+            if self.error_rate and self._random.random() < self.error_rate:
+                return self.error_status, ""
+
+        return None
+
+    def wait(self, timeout: float) -> bool:
+        """Wait for a new transaction.
+
+        Returns:
+            False if the server was stopped.
+        """
+        with self._changed:
+            self._changed.wait(timeout)
+
+        return not self._stopped.is_set()
+
+    def get_candles(self, instrument: str, query: Dict[str, str],
+                    unix: bool) \
+            -> List[dict]:
+        """Generate deterministic candles for the candles endpoint."""
+        granularity = query.get("granularity", "S5")
+        price = query.get("price", "M")
+
+        if granularity not in GRANULARITY_SECONDS:
+            raise MockError(400, "Invalid value specified for "
+                            "'granularity'", "INVALID_GRANULARITY")
+
+        length = GRANULARITY_SECONDS[granularity]
+        now = time.time()
+        end = min(parse_time(query["to"]) if "to" in query else now, now)
+        start = parse_time(query["from"]) if "from" in query else \
+            end - length * int(query.get("count", 500))
+
+        if (end - start) / length > 5000:
+            raise MockError(400, "Maximum value for 'count' exceeded",
+                            "INVALID_RANGE")
+
+        base = float(get_base_price(instrument))
+        candle_time = math.ceil(start / length) * length
+        candles = []
+
+        def price_at(moment):
+            return base * (1 + 0.001 * math.sin(moment / 7200.0))
+
+        while candle_time <= end:
+            open_price = price_at(candle_time)
+            close_price = price_at(candle_time + length)
+            values = {
+                "c": "{:.5f}".format(close_price),
+                "h": "{:.5f}".format(max(open_price, close_price) * 1.0001),
+                "l": "{:.5f}".format(min(open_price, close_price) * 0.9999),
+                "o": "{:.5f}".format(open_price)
+            }
+            candle = {
+                "complete": candle_time + length <= now,
+                "time": "{:.9f}".format(candle_time) if unix else
+                        format_time(candle_time),
+                "volume": 1 + int(candle_time // length) % 100
+            }
+
+            for component, key in [("A", "ask"), ("B", "bid"),
+                                   ("M", "mid")]:
+                if component in price:
+                    candle[key] = values
+
+            candles.append(candle)
+            candle_time += length
+
+        return candles
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    """Handler of the requests to the MockServer."""
+
+    protocol_version = "HTTP/1.1"
+
+    # (method, path pattern, handler name)
+
+    ROUTES = [
+        ("GET", r"", "get_accounts"),
+        ("GET", r"/(?P<account>[^/]+)", "get_account"),
+        ("GET", r"/(?P<account>[^/]+)/summary", "get_summary"),
+        ("GET", r"/(?P<account>[^/]+)/changes", "get_changes"),
+        ("GET", r"/(?P<account>[^/]+)/instruments", "get_instruments"),
+        ("GET", r"/(?P<account>[^/]+)/instruments/(?P<instrument>[^/]+)"
+                r"/candles", "get_candles"),
+        ("PATCH", r"/(?P<account>[^/]+)/configuration", "configure"),
+        ("POST", r"/(?P<account>[^/]+)/orders", "create_order"),
+        ("GET", r"/(?P<account>[^/]+)/(?:orders|pendingOrders)",
+         "get_orders"),
+        ("GET", r"/(?P<account>[^/]+)/orders/(?P<id>[^/]+)", "get_order"),
+        ("PUT", r"/(?P<account>[^/]+)/orders/(?P<id>[^/]+)",
+         "replace_order"),
+        ("PUT", r"/(?P<account>[^/]+)/orders/(?P<id>[^/]+)"
+                r"/clientExtensions", "update_order_extensions"),
+        ("PUT", r"/(?P<account>[^/]+)/orders/(?P<id>[^/]+)/cancel",
+         "cancel_order"),
+        ("GET", r"/(?P<account>[^/]+)/(?:trades|openTrades)", "get_trades"),
+        ("GET", r"/(?P<account>[^/]+)/trades/(?P<id>[^/]+)", "get_trade"),
+        ("PUT", r"/(?P<account>[^/]+)/trades/(?P<id>[^/]+)/orders",
+         "update_trade_orders"),
+        ("PUT", r"/(?P<account>[^/]+)/trades/(?P<id>[^/]+)"
+                r"/clientExtensions", "update_trade_extensions"),
+        ("PUT", r"/(?P<account>[^/]+)/trades/(?P<id>[^/]+)/close",
+         "close_trade"),
+        ("GET", r"/(?P<account>[^/]+)/(?:positions|openPositions)",
+         "get_positions"),
+        ("GET", r"/(?P<account>[^/]+)/positions/(?P<instrument>[^/]+)",
+         "get_position"),
+        ("PUT", r"/(?P<account>[^/]+)/positions/(?P<instrument>[^/]+)"
+                r"/close", "close_position"),
+        ("GET", r"/(?P<account>[^/]+)/pricing", "get_pricing"),
+        ("GET", r"/(?P<account>[^/]+)/pricing/stream", "stream_pricing"),
+        ("GET", r"/(?P<account>[^/]+)/transactions/sinceid",
+         "get_transactions_since"),
+        ("GET", r"/(?P<account>[^/]+)/transactions/stream",
+         "stream_transactions")
+    ]
+
+    COMPILED_ROUTES = [(method, re.compile(pattern + "$"), name)
+                       for method, pattern, name in ROUTES]
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self.handle_method("GET")
+
+    def do_PATCH(self) -> None:
+        self.handle_method("PATCH")
+
+    def do_POST(self) -> None:
+        self.handle_method("POST")
+
+    def do_PUT(self) -> None:
+        self.handle_method("PUT")
+
+    def handle_method(self, method: str) -> None:
+        mock = self.server.mock
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in
+                 parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        raw_body = self.rfile.read(length) if length else b""
+
+        if mock.latency:
+            time.sleep(mock.latency)
+
+        try:
+            if mock.token and self.headers.get("Authorization") != \
+                    "Bearer " + mock.token:
+                raise MockError(401, "Insufficient authorization to perform "
+                                "request.")
+
+            failure = mock.get_failure()
+
+            if failure:
+                raise _InjectedError(*failure)
+
+            if not url.path.startswith("/v3/accounts"):
+                raise MockError(404, "Not found.")
+
+            path = url.path[len("/v3/accounts"):]
+            body = json.loads(raw_body.decode()) if raw_body else {}
+
+            for route_method, pattern, name in self.COMPILED_ROUTES:
+                match = pattern.match(path)
+
+                if match and route_method == method:
+                    arguments = match.groupdict()
+
+                    if "account" in arguments:
+                        account = mock.accounts.get(arguments.pop("account"))
+
+                        if account is None:
+                            raise MockError(
+                                400, "Invalid value specified for "
+                                "'accountID'", "INVALID_ACCOUNT_ID")
+
+                        arguments["account"] = account
+
+                    if name.startswith("stream_"):
+                        getattr(self, name)(query=query, **arguments)
+                        return
+
+                    with mock.lock:
+                        status, response = getattr(self, name)(
+                            query=query, body=body, **arguments)
+
+                    self.send_json(status, response)
+                    return
+
+            raise MockError(404, "Not found.")
+        except _InjectedError as error:
+            self.send_json(error.status, error.body, error.headers)
+        except MockError as error:
+            self.send_json(error.status, error.body)
+        except (ValueError, KeyError, ArithmeticError) as error:
+            self.send_json(400, {"errorMessage": "Invalid request: {}".format(
+                error)})
+
+    def send_json(self, status: int, body: dict,
+                  headers: Dict[str, str] = {}) \
+            -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+
+        for key, value in headers.items():
+            self.send_header(key, value)
+
+        self.end_headers()
+
+        try:
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def send_stream(self, messages: Any) -> None:
+        """Send the messages by chunked transfer encoding until the client
+        disconnects or the server stops.
+        """
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self.close_connection = True
+        mock = self.server.mock
+
+        with mock.lock:
+            mock.streams += 1
+            dropped = mock._dropped
+
+        try:
+            for message in messages:
+                while time.time() < mock._stalled_until and \
+                        not mock._stopped.is_set():
+                    time.sleep(0.01)
+
+                if mock._dropped != dropped:
+                    return
+
+                data = json.dumps(message).encode() + b"\n"
+                self.wfile.write("{:x}\r\n".format(len(data)).encode() +
+                                 data + b"\r\n")
+                self.wfile.flush()
+
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    # Accounts
+
+    def get_accounts(self, query: dict, body: dict) -> Tuple[int, dict]:
+        return 200, {"accounts": [{"id": account_id, "tags": []}
+                                  for account_id in self.server.mock.accounts]}
+
+    def get_account(self, account: MockAccount, query: dict, body: dict) \
+            -> Tuple[int, dict]:
+        return 200, {"account": account.get_details(),
+                     "lastTransactionID": account.last_transaction_id}
+
+    def get_summary(self, account: MockAccount, query: dict, body: dict) \
+            -> Tuple[int, dict]:
+        return 200, {"account": account.get_summary(),
+                     "lastTransactionID": account.last_transaction_id}
+
+    def get_changes(self, account: MockAccount, query: dict, body: dict) \
+            -> Tuple[int, dict]:
+        response = account.get_changes(int(query["sinceTransactionID"]))
+        response["lastTransactionID"] = account.last_transaction_id
+
+        return 200, response
+
+    def get_instruments(self, account: MockAccount, query: dict,
+                        body: dict) \
+            -> Tuple[int, dict]:
+        codes = [code for code in query.get("instruments", "").split(",")
+                 if code]
+
+        return 200, {"instruments": account.get_instruments(codes),
+                     "lastTransactionID": account.last_transaction_id}
+
+    def get_candles(self, account: MockAccount, instrument: str,
+                    query: dict, body: dict) \
+            -> Tuple[int, dict]:
+        if instrument not in INSTRUMENT_INDEX:
+            raise MockError(400, "Invalid value specified for 'instrument'",
+                            "INVALID_INSTRUMENT")
+
+        unix = self.headers.get("Accept-Datetime-Format") == "UNIX"
+        candles = self.server.mock.get_candles(instrument, query, unix)
+
+        return 200, {"candles": candles,
+                     "granularity": query.get("granularity", "S5"),
+                     "instrument": instrument}
+
+    def configure(self, account: MockAccount, query: dict, body: dict) \
+            -> Tuple[int, dict]:
+        account.margin_rate = body["marginRate"]
+        transaction = account.add_transaction(
+            "CLIENT_CONFIGURE", marginRate=body["marginRate"])
+
+        return 200, {"clientConfigureTransaction": transaction,
+                     "lastTransactionID": account.last_transaction_id}
+
+    # Orders
+
+    def create_order(self, account: MockAccount, query: dict, body: dict) \
+            -> Tuple[int, dict]:
+        response = account.create_order(body.get("order", {}))
+        response["lastTransactionID"] = account.last_transaction_id
+
+        return 201, response
+
+    def get_orders(self, account: MockAccount, query: dict, body: dict) \
+            -> Tuple[int, dict]:
+        return 200, {"orders": account.get_pending_orders(),
+                     "lastTransactionID": account.last_transaction_id}
+
+    def get_order(self, account: MockAccount, id: str, query: dict,
+                  body: dict) \
+            -> Tuple[int, dict]:
+        return 200, {"order": account.find_order(id),
+                     "lastTransactionID": account.last_transaction_id}
+
+    def replace_order(self, account: MockAccount, id: str, query: dict,
+                      body: dict) \
+            -> Tuple[int, dict]:
+        response = account.replace_order(id, body)
+        response["lastTransactionID"] = account.last_transaction_id
+
+        return 201, response
+
+    def update_order_extensions(self, account: MockAccount, id: str,
+                                query: dict, body: dict) \
+            -> Tuple[int, dict]:
+        response = account.update_order_extensions(id, body)
+        response["lastTransactionID"] = account.last_transaction_id
+
+        return 200, response
+
+    def cancel_order(self, account: MockAccount, id: str, query: dict,
+                     body: dict) \
+            -> Tuple[int, dict]:
+        transaction = account.cancel_order(account.find_order(id))
+
+        return 200, {"orderCancelTransaction": transaction,
+                     "lastTransactionID": account.last_transaction_id}
+
+    # Trades
+
+    def get_trades(self, account: MockAccount, query: dict, body: dict) \
+            -> Tuple[int, dict]:
+        return 200, {"trades": account.get_open_trades(),
+                     "lastTransactionID": account.last_transaction_id}
+
+    def get_trade(self, account: MockAccount, id: str, query: dict,
+                  body: dict) \
+            -> Tuple[int, dict]:
+        trade = account.find_trade(id)
+
+        if trade["state"] == "OPEN":
+            trade["unrealizedPL"] = str(account.get_unrealized_pl(trade))
+
+        return 200, {"trade": trade,
+                     "lastTransactionID": account.last_transaction_id}
+
+    def update_trade_orders(self, account: MockAccount, id: str,
+                            query: dict, body: dict) \
+            -> Tuple[int, dict]:
+        response = account.update_trade_orders(id, body)
+        response["lastTransactionID"] = account.last_transaction_id
+
+        return 200, response
+
+    def update_trade_extensions(self, account: MockAccount, id: str,
+                                query: dict, body: dict) \
+            -> Tuple[int, dict]:
+        response = account.update_trade_extensions(id, body)
+        response["lastTransactionID"] = account.last_transaction_id
+
+        return 200, response
+
+    def close_trade(self, account: MockAccount, id: str, query: dict,
+                    body: dict) \
+            -> Tuple[int, dict]:
+        response = account.close_trade(id, body)
+        response["lastTransactionID"] = account.last_transaction_id
+
+        return 200, response
+
+    # Positions
+
+    def get_positions(self, account: MockAccount, query: dict, body: dict) \
+            -> Tuple[int, dict]:
+        return 200, {"positions": account.get_positions(),
+                     "lastTransactionID": account.last_transaction_id}
+
+    def get_position(self, account: MockAccount, instrument: str,
+                     query: dict, body: dict) \
+            -> Tuple[int, dict]:
+        if instrument not in INSTRUMENT_INDEX:
+            raise MockError(400, "Invalid value specified for 'instrument'",
+                            "INVALID_INSTRUMENT")
+
+        return 200, {"position": account.get_position(instrument),
+                     "lastTransactionID": account.last_transaction_id}
+
+    def close_position(self, account: MockAccount, instrument: str,
+                       query: dict, body: dict) \
+            -> Tuple[int, dict]:
+        response = account.close_position(instrument, body)
+        response["lastTransactionID"] = account.last_transaction_id
+
+        return 200, response
+
+    # Pricing
+
+    def get_pricing(self, account: MockAccount, query: dict, body: dict) \
+            -> Tuple[int, dict]:
+        codes = query.get("instruments", "").split(",")
+        unix = self.headers.get("Accept-Datetime-Format") == "UNIX"
+
+        return 200, {"prices": account.get_prices(codes, unix)}
+
+    def stream_pricing(self, account: MockAccount, query: dict) -> None:
+        mock = self.server.mock
+        codes = query.get("instruments", "").split(",")
+
+        with mock.lock:
+            account.get_prices(codes)
+
+        def messages():
+            last_heartbeat = time.time()
+
+            while not mock._stopped.is_set():
+                with mock.lock:
+                    prices = account.get_prices(codes)
+
+                for price in prices:
+                    yield price
+
+                if time.time() - last_heartbeat >= mock.heartbeat_interval:
+                    last_heartbeat = time.time()
+                    yield {"time": format_time(last_heartbeat),
+                           "type": "HEARTBEAT"}
+
+                mock._stopped.wait(mock.price_interval)
+
+        self.send_stream(messages())
+
+    # Transactions
+
+    def get_transactions_since(self, account: MockAccount, query: dict,
+                               body: dict) \
+            -> Tuple[int, dict]:
+        since_id = int(query["id"])
+        transactions = [transaction for transaction in account.transactions
+                        if int(transaction["id"]) > since_id]
+
+        return 200, {"transactions": transactions,
+                     "lastTransactionID": account.last_transaction_id}
+
+    def stream_transactions(self, account: MockAccount, query: dict) \
+            -> None:
+        mock = self.server.mock
+
+        with mock.lock:
+            sent = len(account.transactions)
+
+        def messages():
+            nonlocal sent
+
+            while True:
+                with mock.lock:
+                    new_transactions = account.transactions[sent:]
+                    sent = len(account.transactions)
+                    last_transaction_id = account.last_transaction_id
+
+                for transaction in new_transactions:
+                    yield transaction
+
+                if new_transactions:
+                    continue
+
+                if not mock.wait(mock.heartbeat_interval):
+                    return
+
+                with mock.lock:
+                    has_new = len(account.transactions) > sent
+
+                if not has_new:
+                    yield {"lastTransactionID": last_transaction_id,
+                           "time": format_time(time.time()),
+                           "type": "HEARTBEAT"}
+
+        self.send_stream(messages())
+
+
+class _InjectedError(MockError):
+    """Injected error response with optional "Retry-After" header."""
+
+    def __init__(self, status: int, retry_after: str = "") -> None:
+        super().__init__(status, "Injected error.")
+        self.headers = {"Retry-After": retry_after} if retry_after else {}
@@ -1,18 +1,39 @@
+import os
 import unittest
 
 from oandav20 import Oanda
+from oandav20.testing.server import MockServer
 
-TOKEN = "daa5353bd6b4f58bfdf12cfb92cfd3a9-1db8ed54245cc325f87287a6f5863ca3"
-ID = "101-004-3881593-001"
+# The tests run against the local MockServer, set the environment variables
+# to run them against the real DEMO account instead.
+
+TOKEN = os.environ.get("OANDAV20_TOKEN", "")
+ID = os.environ.get("OANDAV20_ACCOUNT_ID", "101-004-3881593-001")
+SECOND_ID = "101-004-3881593-002"
 
 
 class TestCase(unittest.TestCase):
-    """Custom TestCase class for unittesting package Oandav20."""
+    """Custom TestCase class for unittesting package Oandav20.
+
+    Attributes:
+        server (MockServer):
+            Local mock server, None if the tests run against the real DEMO
+            account.
+    """
+
+    server = None
 
     @classmethod
     def setUpClass(cls):
-        """Create an HTTP session connection with the Oanda server."""
-        cls.oanda = Oanda("DEMO", TOKEN, ID)
+        """Start the mock server if needed and create an HTTP session
+        connection with it.
+        """
+        cls.oanda = Oanda("DEMO", TOKEN or "mock", ID)
+
+        if not TOKEN:
+            cls.server = MockServer([ID, SECOND_ID])
+            cls.server.start()
+            cls.server.connect(cls.oanda)
 
     @classmethod
     def tearDownClass(cls):
@@ -21,4 +42,17 @@ class TestCase(unittest.TestCase):
         """
         cls.oanda.close_all_trades()
         cls.oanda.cancel_all_orders()
-        cls.oanda.client.close()
+        cls.oanda.close()
+
+        if cls.server is not None:
+            cls.server.stop()
+            cls.server = None
+
+    def get_own_id(self, prefix: str) -> str:
+        """Create own ID unique within the account, for example
+        "EUR_USD_1".
+        """
+        TestCase._last_own_id = getattr(TestCase, "_last_own_id", 0) + 1
+
+        return "{0}_{1}_{2}".format(prefix, os.getpid(),
+                                    TestCase._last_own_id)
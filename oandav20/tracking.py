@@ -0,0 +1,649 @@
+import threading
+import time
+from decimal import Decimal
+from typing import List, Optional
+
+import requests
+
+# Transaction types creating an order and the type of the created order.
+
+ORDER_TRANSACTIONS = {
+    "MARKET_ORDER": "MARKET",
+    "LIMIT_ORDER": "LIMIT",
+    "STOP_ORDER": "STOP",
+    "MARKET_IF_TOUCHED_ORDER": "MARKET_IF_TOUCHED",
+    "TAKE_PROFIT_ORDER": "TAKE_PROFIT",
+    "STOP_LOSS_ORDER": "STOP_LOSS",
+    "TRAILING_STOP_LOSS_ORDER": "TRAILING_STOP_LOSS"
+}
+
+# Keys describing the transaction itself, not the created order.
+
+TRANSACTION_KEYS = [
+    "accountID", "batchID", "id", "reason", "requestID", "time", "type",
+    "userID"
+]
+
+
+class _Stopped(Exception):
+    """Raised by the heartbeat callback to end the stream after 'stop'."""
+
+
+def get_order_from_transaction(transaction: dict) -> dict:
+    """Build the pending order details from the transaction creating the
+    order, with the same keys like the details from the 'get_order'
+    method.
+    """
+    order = {key: value for key, value in transaction.items()
+             if key not in TRANSACTION_KEYS}
+    order["id"] = transaction["id"]
+    order["type"] = ORDER_TRANSACTIONS[transaction["type"]]
+    order["state"] = "PENDING"
+    order["createTime"] = transaction["time"]
+
+    return order
+
+
+class TransactionTracker:
+    """TransactionTracker keeps state of orders and trades from the
+    transaction stream.
+
+    Every order goes through the states "PENDING" -> "FILLED" or
+    "CANCELLED" and every trade opened by a fill through "OPEN" ->
+    "CLOSED". The records have the same keys like the order and trade
+    details from the 'get_order' and 'get_trade' methods, so the state may
+    be checked locally without any HTTP request.
+
+    Transactions missed during reconnecting of the stream are detected by
+    their sequential IDs (or by the heartbeats) and fetched via the
+    'get_transactions_since' method.
+
+    Example:
+        >>> tracker = TransactionTracker(o)
+        >>> tracker.start()
+        >>> o.create_order("LIMIT", "EUR_USD", "BUY", 1000, 1.1,
+        ...                own_id="EUR_USD_1")
+        >>> ...
+        >>> tracker.get_order(own_id="EUR_USD_1")["state"]
+        'FILLED'
+        >>> tracker.get_trade(own_id="EUR_USD_1")["state"]
+        'OPEN'
+
+    Attributes:
+        account_id (str):
+            Oanda trading account ID.
+        error (Exception):
+            Exception which stopped the background thread, if any.
+        last_transaction_id (int):
+            ID of the last applied transaction.
+        oanda (Oanda):
+            Oanda object used for the requests.
+    """
+
+    def __init__(self, oanda: "Oanda", account_id: str = "") -> None:
+        """Initialize an instance of class TransactionTracker.
+
+        Arguments:
+            oanda:
+                Oanda object (not AsyncOanda) used for the requests.
+            account_id:
+                Oanda trading account ID, otherwise 'default_id' of the
+                Oanda object will be used.
+        """
+        self.oanda = oanda
+        self.account_id = account_id or oanda.default_id
+        self.error = None
+        self.last_transaction_id = 0
+
+        self._lock = threading.RLock()
+        self._orders = {}
+        self._trades = {}
+        self._orders_own_ids = {}
+        self._trades_own_ids = {}
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def seed(self) -> None:
+        """Load the current pending orders and open trades.
+
+        Raises:
+            requests.HTTPError:
+                HTTP response status code is 4xx or 5xx.
+        """
+        pending_orders = self.oanda.get_all_orders(self.account_id)
+        open_trades = self.oanda.get_all_trades(self.account_id)
+
+        with self._lock:
+            for order in pending_orders["orders"]:
+                self._add_order(dict(order))
+
+            for trade in open_trades["trades"]:
+                self._add_trade(dict(trade))
+
+            # Transactions between both requests are applied again by the
+            # catching up, so the older ID is used.
+
+            self.last_transaction_id = int(
+                pending_orders["lastTransactionID"])
+
+    def start(self) -> None:
+        """Seed the state and consume the transaction stream in a
+        background thread.
+
+        Raises:
+            requests.HTTPError:
+                HTTP response status code is 4xx or 5xx.
+        """
+        self.seed()
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread.
+
+        The thread ends by the next transaction or heartbeat, Oanda sends
+        the heartbeats every 5 seconds.
+        """
+        self._stopped.set()
+
+    def join(self, timeout: float = None) -> bool:
+        """Wait until the background thread ends.
+
+        Arguments:
+            timeout:
+                Maximum number of seconds to wait, no limit by default.
+
+        Returns:
+            True if the thread isn't running.
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+        return self._thread is None or not self._thread.is_alive()
+
+    def run(self) -> None:
+        """Consume the transaction stream until the 'stop' method is
+        called.
+        """
+        stream = self.oanda.stream_transactions(
+            heartbeat=self._on_heartbeat, account_id=self.account_id)
+
+        try:
+            for transaction in stream:
+                if self._stopped.is_set():
+                    break
+
+                transaction_id = int(transaction["id"])
+
+                # The transaction isn't applied over an unfilled gap, so
+                # its ID doesn't hide the missed ones from the next check.
+
+                if self.last_transaction_id and \
+                        transaction_id > self.last_transaction_id + 1 and \
+                        not self.catch_up():
+                    continue
+
+                self.apply(transaction)
+        except _Stopped:
+            pass
+        except Exception as error:
+            self.error = error
+        finally:
+            stream.close()
+
+    def catch_up(self) -> bool:
+        """Apply transactions missed since the last applied one.
+
+        Failed request leaves the 'last_transaction_id' as it was, so the
+        next gap detection will try it again.
+
+        Returns:
+            True if the missed transactions were applied.
+        """
+        try:
+            response = self.oanda.get_transactions_since(
+                self.last_transaction_id, self.account_id)
+        except requests.RequestException:
+            return False
+
+        for transaction in response["transactions"]:
+            self.apply(transaction)
+
+        return True
+
+    def apply(self, transaction: dict) -> None:
+        """Update the orders and trades by the given transaction.
+
+        Already applied transactions and transactions which don't relate to
+        orders or trades are ignored.
+
+        Arguments:
+            transaction:
+                Transaction details from the stream or from the
+                'get_transactions_since' method.
+        """
+        transaction_id = int(transaction["id"])
+
+        with self._lock:
+            if transaction_id <= self.last_transaction_id:
+                return
+
+            transaction_type = transaction.get("type")
+
+            if transaction_type in ORDER_TRANSACTIONS:
+                self._apply_order_create(transaction)
+            elif transaction_type == "ORDER_FILL":
+                self._apply_order_fill(transaction)
+            elif transaction_type == "ORDER_CANCEL":
+                self._apply_order_cancel(transaction)
+            elif transaction_type == "ORDER_CLIENT_EXTENSIONS_MODIFY":
+                self._apply_order_extensions(transaction)
+            elif transaction_type == "TRADE_CLIENT_EXTENSIONS_MODIFY":
+                self._apply_trade_extensions(transaction)
+
+            order_cache = getattr(self.oanda, "order_cache", None)
+
+            if order_cache is not None:
+                order_cache.apply(transaction, self.account_id)
+
+            self.last_transaction_id = transaction_id
+
+    def get_order(self, order_id: int = 0, own_id: str = "") \
+            -> Optional[dict]:
+        """Get the tracked order details.
+
+        Arguments:
+            order_id:
+                Order ID provided by Oanda.
+            own_id:
+                Own ID.
+
+        Returns:
+            Copy of the order details or None if the order isn't tracked.
+
+        Raises:
+            TypeError:
+                Missing argument either for the 'order_id' or 'own_id'
+                parameter.
+        """
+        if not order_id and not own_id:
+            raise TypeError("Missing argument either for the 'order_id' or "
+                            "'own_id'.")
+
+        with self._lock:
+            if own_id:
+                order_id = self._orders_own_ids.get(own_id)
+
+            order = self._orders.get(str(order_id))
+
+            return dict(order) if order else None
+
+    def get_trade(self, trade_id: int = 0, own_id: str = "") \
+            -> Optional[dict]:
+        """Get the tracked trade details.
+
+        Arguments:
+            trade_id:
+                Trade ID provided by Oanda.
+            own_id:
+                Own ID.
+
+        Returns:
+            Copy of the trade details or None if the trade isn't tracked.
+
+        Raises:
+            TypeError:
+                Missing argument either for the 'trade_id' or 'own_id'
+                parameter.
+        """
+        if not trade_id and not own_id:
+            raise TypeError("Missing argument either for the 'trade_id' or "
+                            "'own_id'.")
+
+        with self._lock:
+            if own_id:
+                trade_id = self._trades_own_ids.get(own_id)
+
+            trade = self._trades.get(str(trade_id))
+
+            return dict(trade) if trade else None
+
+    def get_pending_orders(self) -> List[dict]:
+        """Get copies of all tracked pending orders."""
+        with self._lock:
+            return [dict(order) for order in self._orders.values()
+                    if order["state"] == "PENDING"]
+
+    def get_open_trades(self) -> List[dict]:
+        """Get copies of all tracked open trades."""
+        with self._lock:
+            return [dict(trade) for trade in self._trades.values()
+                    if trade["state"] == "OPEN"]
+
+    def _on_heartbeat(self, heartbeat: dict) -> None:
+        if self._stopped.is_set():
+            raise _Stopped()
+
+        last_transaction_id = int(heartbeat.get("lastTransactionID", 0))
+
+        if last_transaction_id > self.last_transaction_id:
+            self.catch_up()
+
+    def _add_order(self, order: dict) -> None:
+        self._orders[order["id"]] = order
+        own_id = order.get("clientExtensions", {}).get("id")
+
+        if own_id:
+            self._orders_own_ids[own_id] = order["id"]
+
+    def _add_trade(self, trade: dict) -> None:
+        self._trades[trade["id"]] = trade
+        own_id = trade.get("clientExtensions", {}).get("id")
+
+        if own_id:
+            self._trades_own_ids[own_id] = trade["id"]
+
+    def _apply_order_create(self, transaction: dict) -> None:
+        self._add_order(get_order_from_transaction(transaction))
+
+    def _apply_order_fill(self, transaction: dict) -> None:
+        order = self._orders.get(transaction["orderID"])
+
+        if order:
+            order["state"] = "FILLED"
+            order["fillingTransactionID"] = transaction["id"]
+            order["filledTime"] = transaction["time"]
+
+        trade_opened = transaction.get("tradeOpened")
+
+        if trade_opened and trade_opened["tradeID"] not in self._trades:
+            self._add_trade({
+                "clientExtensions": trade_opened.get("clientExtensions", {}),
+                "currentUnits": trade_opened["units"],
+                "id": trade_opened["tradeID"],
+                "initialUnits": trade_opened["units"],
+                "instrument": transaction["instrument"],
+                "openTime": transaction["time"],
+                "price": trade_opened.get("price", transaction.get("price")),
+                "realizedPL": "0",
+                "state": "OPEN"
+            })
+
+            if order:
+                order["tradeOpenedID"] = trade_opened["tradeID"]
+
+        for trade_closed in transaction.get("tradesClosed", []):
+            trade = self._trades.get(trade_closed["tradeID"])
+
+            if trade:
+                trade["state"] = "CLOSED"
+                trade["currentUnits"] = "0"
+                trade["closeTime"] = transaction["time"]
+                trade["closingTransactionIDs"] = \
+                    trade.get("closingTransactionIDs", []) + \
+                    [transaction["id"]]
+                trade["realizedPL"] = str(
+                    Decimal(trade.get("realizedPL", "0")) +
+                    Decimal(trade_closed.get("realizedPL", "0")))
+
+            if order:
+                order["tradeClosedIDs"] = \
+                    order.get("tradeClosedIDs", []) + \
+                    [trade_closed["tradeID"]]
+
+        trade_reduced = transaction.get("tradeReduced")
+
+        if trade_reduced:
+            trade = self._trades.get(trade_reduced["tradeID"])
+
+            if trade:
+                current_units = Decimal(trade["currentUnits"])
+                reduced_units = abs(Decimal(trade_reduced["units"]))
+                remaining_units = abs(current_units) - reduced_units
+
+                if current_units < 0:
+                    remaining_units = -remaining_units
+
+                trade["currentUnits"] = str(remaining_units)
+                trade["closingTransactionIDs"] = \
+                    trade.get("closingTransactionIDs", []) + \
+                    [transaction["id"]]
+                trade["realizedPL"] = str(
+                    Decimal(trade.get("realizedPL", "0")) +
+                    Decimal(trade_reduced.get("realizedPL", "0")))
+
+            if order:
+                order["tradeReducedID"] = trade_reduced["tradeID"]
+
+    def _apply_order_cancel(self, transaction: dict) -> None:
+        order = self._orders.get(transaction["orderID"])
+
+        if order:
+            order["state"] = "CANCELLED"
+            order["cancellingTransactionID"] = transaction["id"]
+            order["cancelledTime"] = transaction["time"]
+
+            if "replacedByOrderID" in transaction:
+                order["replacedByOrderID"] = transaction["replacedByOrderID"]
+
+    def _apply_order_extensions(self, transaction: dict) -> None:
+        order = self._orders.get(transaction["orderID"])
+
+        if order:
+            extensions = dict(order.get("clientExtensions", {}))
+            extensions.update(transaction.get("clientExtensionsModify", {}))
+            order["clientExtensions"] = extensions
+            self._add_order(order)
+
+    def _apply_trade_extensions(self, transaction: dict) -> None:
+        trade = self._trades.get(transaction["tradeID"])
+
+        if trade:
+            extensions = dict(trade.get("clientExtensions", {}))
+            extensions.update(
+                transaction.get("tradeClientExtensionsModify", {}))
+            trade["clientExtensions"] = extensions
+            self._add_trade(trade)
+
+
+class OrderCache:
+    """OrderCache keeps the details of the known pending orders, so the
+    'update_order' method doesn't need to get the order before replacing
+    it.
+
+    The cache is filled by the responses of the 'create_order',
+    'create_orders', 'update_order', 'get_order' and 'get_all_orders'
+    methods of the client it's assigned to and by the transactions from
+    the TransactionTracker of that client. Orders older than 'max_age' are
+    considered stale and got again by the 'update_order'.
+
+    Example:
+        >>> o.order_cache = OrderCache(max_age=60.0)
+        >>> o.create_order("LIMIT", "EUR_USD", "BUY", 1000, 1.1,
+        ...                own_id="EUR_USD_1")
+        >>> o.update_order(own_id="EUR_USD_1", price=1.09)  # only PUT
+
+    Attributes:
+        hits (int):
+            Number of orders found in the cache.
+        max_age (float):
+            Maximum number of seconds since the order was stored, 0 for no
+            limit.
+        misses (int):
+            Number of orders missing in the cache or stale.
+    """
+
+    def __init__(self, max_age: float = 60.0) -> None:
+        """Initialize an instance of class OrderCache.
+
+        Arguments:
+            max_age:
+                Maximum number of seconds since the order was stored, 0 for
+                no limit.
+        """
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._orders = {}
+        self._own_ids = {}
+
+    def get(self, account_id: str, order_id: int = 0, own_id: str = "") \
+            -> Optional[dict]:
+        """Get the cached pending order.
+
+        Arguments:
+            account_id:
+                Oanda trading account ID.
+            order_id:
+                Order ID provided by Oanda.
+            own_id:
+                Own ID.
+
+        Returns:
+            Copy of the order details or None if the order is missing or
+            stale.
+        """
+        with self._lock:
+            if own_id:
+                order_id = self._own_ids.get((account_id, own_id))
+
+            entry = self._orders.get((account_id, str(order_id)))
+
+            if entry is None or self.max_age and \
+                    time.monotonic() - entry[1] > self.max_age:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+
+            return dict(entry[0])
+
+    def put(self, account_id: str, order: dict) -> None:
+        """Store the order details, only pending orders are stored.
+
+        Arguments:
+            account_id:
+                Oanda trading account ID.
+            order:
+                The "order" object from the 'get_order' method.
+        """
+        if order.get("state", "PENDING") != "PENDING":
+            self.remove(account_id, order["id"])
+            return
+
+        with self._lock:
+            self._put(account_id, dict(order))
+
+    def _put(self, account_id: str, order: dict) -> None:
+        self._orders[(account_id, order["id"])] = (order, time.monotonic())
+        own_id = order.get("clientExtensions", {}).get("id")
+
+        if own_id:
+            self._own_ids[(account_id, own_id)] = order["id"]
+
+    def remove(self, account_id: str, order_id: int = 0, own_id: str = "") \
+            -> None:
+        """Remove the order from the cache, if it's there.
+
+        Arguments:
+            account_id:
+                Oanda trading account ID.
+            order_id:
+                Order ID provided by Oanda.
+            own_id:
+                Own ID.
+        """
+        with self._lock:
+            if own_id:
+                order_id = self._own_ids.get((account_id, own_id))
+
+            entry = self._orders.pop((account_id, str(order_id)), None)
+
+            if entry is None:
+                return
+
+            own_id = entry[0].get("clientExtensions", {}).get("id")
+
+            if own_id and self._own_ids.get((account_id, own_id)) == \
+                    entry[0]["id"]:
+                del self._own_ids[(account_id, own_id)]
+
+    def replace_all(self, account_id: str, orders: List[dict]) -> None:
+        """Replace all cached orders of the account.
+
+        Arguments:
+            account_id:
+                Oanda trading account ID.
+            orders:
+                The "orders" list from the 'get_all_orders' method.
+        """
+        with self._lock:
+            for key in [key for key in self._orders if key[0] == account_id]:
+                del self._orders[key]
+
+            for key in [key for key in self._own_ids if key[0] == account_id]:
+                del self._own_ids[key]
+
+            for order in orders:
+                self._put(account_id, dict(order))
+
+    def apply(self, transaction: dict, account_id: str = "") -> None:
+        """Update the cache by the transaction.
+
+        Transactions creating orders add the orders, fills and cancels
+        remove them and modifications of the client extensions update them.
+
+        Arguments:
+            transaction:
+                Transaction details from the stream or any response.
+            account_id:
+                Oanda trading account ID, otherwise the "accountID" of the
+                transaction.
+        """
+        account_id = account_id or transaction.get("accountID", "")
+        transaction_type = transaction.get("type")
+
+        if transaction_type in ORDER_TRANSACTIONS:
+            self.put(account_id, get_order_from_transaction(transaction))
+        elif transaction_type in ("ORDER_FILL", "ORDER_CANCEL"):
+            self.remove(account_id, transaction["orderID"])
+        elif transaction_type == "ORDER_CLIENT_EXTENSIONS_MODIFY":
+            with self._lock:
+                entry = self._orders.get((account_id,
+                                          transaction["orderID"]))
+
+                if entry is not None:
+                    order = dict(entry[0])
+                    old_own_id = order.get("clientExtensions", {}).get("id")
+                    self._own_ids.pop((account_id, old_own_id), None)
+                    order["clientExtensions"] = dict(
+                        order.get("clientExtensions", {}),
+                        **transaction.get("clientExtensionsModify", {}))
+                    self._put(account_id, order)
+
+    def apply_response(self, account_id: str, response_body: dict) -> None:
+        """Update the cache by all transactions of the response, for
+        example "orderCreateTransaction" and "orderFillTransaction".
+
+        Arguments:
+            account_id:
+                Oanda trading account ID.
+            response_body:
+                JSON object (dict) of the response.
+        """
+        transactions = [value for key, value in response_body.items()
+                        if key.endswith("Transaction") and
+                        isinstance(value, dict) and "id" in value]
+
+        for transaction in sorted(transactions,
+                                  key=lambda value: int(value["id"])):
+            self.apply(transaction, account_id)
+
+    def clear(self) -> None:
+        """Remove all cached orders."""
+        with self._lock:
+            self._orders.clear()
+            self._own_ids.clear()
@@ -24,6 +24,10 @@ setup(
     install_requires=[
         "requests"
     ],
+    extras_require={
+        "async": ["aiohttp"],
+        "numpy": ["numpy"]
+    },
     classifiers=[
         "Development Status :: 1 - Planning",
         "Intended Audience :: Developers",
@@ -32,6 +32,16 @@ class TestAccountMixin(TestCase):
         with self.assertRaises(HTTPError):
             self.oanda.get_account_summary(account_id=fake_id)
 
+    def test_get_account_changes_method(self):
+        last_transaction_id = \
+            self.oanda.get_account()["account"]["lastTransactionID"]
+        self.oanda.create_limit_order("EUR_USD", "BUY", 1, price=0.1)
+
+        account_changes = \
+            self.oanda.get_account_changes(last_transaction_id)
+        assert len(account_changes["changes"]["ordersCreated"]) >= 1
+        assert "NAV" in account_changes["state"]
+
     def test_get_instruments_method(self):
         single_instrument = self.oanda.get_instruments(["AUD_USD"])
         assert "AUD_USD" in single_instrument["instruments"][0]["name"]
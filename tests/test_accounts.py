@@ -0,0 +1,112 @@
+import asyncio
+import unittest
+
+from requests import HTTPError
+
+from oandav20 import AsyncOanda, Oanda
+from oandav20.accounts import AccountGroup, AsyncAccountGroup
+from oandav20.testing import MockServer
+
+IDS = ["101-004-0000000-001", "101-004-0000000-002", "101-004-0000000-003"]
+
+
+class TestAccountGroup(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockServer(IDS)
+        self.server.start()
+
+        for index, account_id in enumerate(IDS):
+            for _ in range(index + 1):
+                self.server.accounts[account_id].create_order({
+                    "instrument": "EUR_USD", "type": "MARKET",
+                    "units": "10"})
+                self.server.accounts[account_id].create_order({
+                    "instrument": "EUR_USD", "price": "0.1", "type": "LIMIT",
+                    "units": "10"})
+
+        self.oanda = self.server.connect(
+            Oanda("DEMO", "mock", IDS[0], thread_safe=True))
+        self.group = AccountGroup(self.oanda, IDS + ["foo"])
+
+    def tearDown(self):
+        self.oanda.close()
+        self.server.stop()
+
+    def test_get_account_summary_method(self):
+        report = self.group.get_account_summary()
+
+        assert sorted(report.results) == IDS
+        assert isinstance(report.errors["foo"], HTTPError)
+        assert [account["id"] for account in report.merged("account")] == \
+            IDS
+
+    def test_get_positions_method(self):
+        positions = self.group.get_positions().merged("positions")
+
+        assert [position["accountID"] for position in positions] == IDS
+        assert [position["long"]["units"] for position in positions] == \
+            ["10", "20", "30"]
+
+    def test_get_all_trades_method(self):
+        trades = self.group.get_all_trades().merged("trades")
+
+        assert len(trades) == 6
+        assert trades[-1]["accountID"] == IDS[2]
+
+    def test_merged_method(self):
+        report = self.group.get_all_trades()
+        trades = report.merged("trades")
+
+        assert report.merged("trades") == trades
+        assert all("accountID" not in trade
+                   for result in report.results.values()
+                   for trade in result["trades"])
+
+    def test_close_all_trades_method(self):
+        report = self.group.close_all_trades()
+
+        assert len(report.succeeded) == 6
+        assert [item.arguments for item in report.failed] == \
+            [{"account_id": "foo"}]
+        assert self.group.get_all_trades().merged("trades") == []
+
+    def test_close_all_trades_by_position(self):
+        report = self.group.close_all_trades(by_position=True)
+
+        # One trade of the first account, one position close of the others.
+        assert len(report.succeeded) == 3
+        assert report.succeeded[-1].arguments == \
+            {"instrument": "EUR_USD", "side": "LONG", "account_id": IDS[2]}
+        assert [item.arguments for item in report.failed] == \
+            [{"account_id": "foo"}]
+        assert self.group.get_all_trades().merged("trades") == []
+
+    def test_cancel_all_orders_method(self):
+        report = self.group.cancel_all_orders()
+
+        assert len(report.succeeded) == 6
+        assert len(report.failed) == 1
+        assert self.group.get_all_orders().merged("orders") == []
+
+    def test_async_group(self):
+        loop = asyncio.new_event_loop()
+        oanda = self.server.connect(AsyncOanda("DEMO", "mock", IDS[0]))
+        group = AsyncAccountGroup(oanda, IDS)
+
+        async def run():
+            async with oanda:
+                summaries = await group.get_account_summary()
+                report = await group.close_all_trades()
+
+            return summaries, report
+
+        summaries, report = loop.run_until_complete(run())
+        loop.close()
+
+        assert sorted(summaries.results) == IDS
+        assert len(report.succeeded) == 6
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import datetime
+import unittest
+
+import numpy as np
+
+from oandav20.arrays import (candles_to_array, merge_candles,
+                             parse_unix_times, prices_to_array)
+from oandav20.mixins.instruments import to_unix_time
+
+
+def make_candle(time, close, complete=True):
+    return {
+        "complete": complete,
+        "mid": {"c": str(close), "h": str(close + 1), "l": str(close - 1),
+                "o": str(close)},
+        "time": "{:.9f}".format(time),
+        "volume": 10
+    }
+
+
+class TestArrays(unittest.TestCase):
+
+    def test_candles_to_array_function(self):
+        candles = candles_to_array([make_candle(1502916000, 1.5),
+                                    make_candle(1502916060.5, 2.5, False)])
+
+        assert candles["time"][0] == np.datetime64("2017-08-16T20:40:00")
+        assert candles["time"][1] == np.datetime64(
+            "2017-08-16T20:41:00.500")
+        assert list(candles["close"]) == [1.5, 2.5]
+        assert list(candles["high"]) == [2.5, 3.5]
+        assert list(candles["complete"]) == [True, False]
+        assert len(candles_to_array([])) == 0
+
+    def test_merge_candles_function(self):
+        first = candles_to_array([make_candle(60, 1), make_candle(120, 2,
+                                                                  False)])
+        second = candles_to_array([make_candle(120, 3), make_candle(0, 4)])
+
+        merged = merge_candles([first, second])
+        assert list(merged["close"]) == [4, 1, 3]
+        assert merged["complete"].all()
+        assert merged.flags["C_CONTIGUOUS"]
+        assert len(merge_candles([])) == 0
+
+    def test_parse_unix_times_function(self):
+        times = parse_unix_times(["1483228801.500000000", "1483228801.5",
+                                  "1483228801.000001", "1483228801"])
+        expected = np.datetime64("2017-01-01T00:00:01", "ns")
+
+        assert list(times - expected) == [
+            np.timedelta64(500000000, "ns"), np.timedelta64(500000000, "ns"),
+            np.timedelta64(1000, "ns"), np.timedelta64(0, "ns")]
+
+        with self.assertRaises(ValueError):
+            parse_unix_times(["1483228801.0000000001"])
+
+    def test_to_unix_time_function(self):
+        naive = datetime.datetime(2017, 1, 1, 0, 0, 1, 500000)
+        aware = naive.replace(tzinfo=datetime.timezone.utc)
+
+        assert to_unix_time(naive) == 1483228801.5
+        assert to_unix_time(aware) == 1483228801.5
+        assert to_unix_time(1483228801) == 1483228801.0
+
+    def test_prices_to_array_function(self):
+        prices = prices_to_array([
+            {
+                "asks": [{"liquidity": 10000000, "price": "1.13028"},
+                         {"liquidity": 50000000, "price": "1.13030"}],
+                "bids": [{"liquidity": 10000000, "price": "1.13015"}],
+                "closeoutAsk": "1.13032",
+                "closeoutBid": "1.13011",
+                "instrument": "EUR_USD",
+                "quoteHomeConversionFactors": {"negativeUnits": "0.95904",
+                                               "positiveUnits": "0.95886"},
+                "status": "tradeable",
+                "time": "1466620896.201836422"
+            },
+            {
+                "asks": [],
+                "bids": [],
+                "instrument": "AUD_USD",
+                "status": "non-tradeable",
+                "time": "1466620896.000000000"
+            }
+        ], ["AUD_USD", "EUR_USD"], depth=2)
+
+        assert list(prices["instrument"]) == [1, 0]
+        assert prices["time"][0] == np.datetime64(
+            "2016-06-22T18:41:36.201836422")
+        assert list(prices["tradeable"]) == [True, False]
+        assert prices["bid"][0] == 1.13015
+        assert prices["ask"][0] == 1.13028
+        assert list(prices["asks"][0]) == [1.13028, 1.1303]
+        assert list(prices["ask_liquidity"][0]) == [1e7, 5e7]
+        assert np.isnan(prices["bids"][0][1])
+        assert prices["closeout_bid"][0] == 1.13011
+        assert prices["positive_units_factor"][0] == 0.95886
+        assert np.isnan(prices["bid"][1])
+
+        assert len(prices_to_array([], ["EUR_USD"])) == 0
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import asyncio
+import unittest
+
+from requests import HTTPError
+
+from oandav20 import AsyncOanda
+from oandav20.testing import MockServer
+from oandav20.testing.testcase import TOKEN, ID
+
+
+class TestAsyncOanda(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.oanda = AsyncOanda("DEMO", TOKEN or "mock", ID)
+        self.server = None
+
+        if not TOKEN:
+            self.server = MockServer([ID])
+            self.server.start()
+            self.server.connect(self.oanda)
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.oanda.close())
+        self.loop.close()
+
+        if self.server is not None:
+            self.server.stop()
+
+    def run_async(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def test_get_account_summary_method(self):
+        account_details = self.run_async(self.oanda.get_account_summary())
+        assert ID == account_details["account"]["id"]
+
+        with self.assertRaises(HTTPError):
+            self.run_async(self.oanda.get_account_summary("foo"))
+
+    def test_concurrent_requests(self):
+        async def gather():
+            return await asyncio.gather(
+                self.oanda.get_account_summary(),
+                self.oanda.get_pricing(["EUR_USD"]),
+                self.oanda.get_all_orders())
+
+        results = self.run_async(gather())
+
+        assert ID == results[0]["account"]["id"]
+        assert "EUR_USD" == results[1]["prices"][0]["instrument"]
+        assert "orders" in results[2]
+
+    def test_update_order_method(self):
+        order_id = self.run_async(self.oanda.create_limit_order(
+            "EUR_ZAR", "BUY", 1, price=0.1))
+
+        new_order_id = self.run_async(self.oanda.update_order(
+            order_id, price=0.11, units=2))
+        assert new_order_id
+
+        self.run_async(self.oanda.cancel_all_orders())
+        pending_orders = self.run_async(self.oanda.get_all_orders())
+        assert not len(pending_orders["orders"])
+
+    def test_update_orders_method(self):
+        order_id = self.run_async(self.oanda.create_order(
+            "LIMIT", "EUR_ZAR", "BUY", 1, price=0.1))
+        other_id = self.run_async(self.oanda.create_order(
+            "LIMIT", "EUR_ZAR", "SELL", 1, price=100))
+
+        report = self.run_async(self.oanda.update_orders([
+            {"order_id": order_id, "price": 0.1},
+            {"order_id": other_id, "price": 101, "units": 2}]))
+
+        assert report.items[0].result == (order_id, "", False)
+        assert report.items[1].result.replaced
+
+        order_details = self.run_async(self.oanda.get_order(
+            report.items[1].result.order_id))["order"]
+        assert order_details["units"] == "-2"
+
+        with self.assertRaises(ValueError):
+            self.run_async(self.oanda.update_orders([
+                {"order_id": order_id, "price": 0.11},
+                {"order_id": order_id, "price": 0.12}]))
+
+    def test_create_orders_method(self):
+        report = self.run_async(self.oanda.create_orders([
+            {"order_type": "LIMIT", "instrument": "EUR_ZAR", "side": "BUY",
+             "units": 1, "price": 0.1},
+            {"order_type": "LIMIT", "instrument": "EUR_ZAR", "side": "SELL",
+             "units": 1, "price": 100}]))
+        assert len(report.succeeded) == 2
+
+        self.run_async(self.oanda.cancel_all_orders())
+
+    def test_stream_pricing_method(self):
+        if self.server is None:
+            self.skipTest("Only against the mock server.")
+
+        self.server.heartbeat_interval = 0.05
+        self.server.price_interval = 0.05
+        heartbeats = []
+        stream = self.oanda.stream_pricing(
+            ["EUR_USD"], heartbeat=heartbeats.append, stall_timeout=0.3)
+
+        async def wait_for_heartbeat():
+            count = len(heartbeats)
+
+            async for price in stream:
+                assert price["instrument"] == "EUR_USD"
+
+                if len(heartbeats) > count:
+                    return
+
+        async def run():
+            await wait_for_heartbeat()
+            assert self.server.streams == 1
+
+            self.server.drop_streams()
+            await wait_for_heartbeat()
+            assert self.server.streams == 2
+
+            self.server.fail_next(1, status=503)
+            self.server.drop_streams()
+            await wait_for_heartbeat()
+            assert self.server.streams == 3
+
+            self.server.stall_streams(0.5)
+            await wait_for_heartbeat()
+            assert self.server.streams >= 4
+
+            await stream.close()
+
+        self.run_async(run())
+        assert heartbeats[0]["type"] == "HEARTBEAT"
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            self.oanda.get_pricing(["foo"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+import json
+import os
+import tempfile
+import unittest
+
+from oandav20.testing import benchmarks
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_main_function(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.json")
+            arguments = ["--size", "10", "--bulk-size", "3", "--repeat", "1"]
+            benchmarks.main(arguments + ["--output", path])
+
+            with open(path) as f:
+                document = json.load(f)
+
+        results = document["results"]
+        assert document["metadata"]["version"] == benchmarks.RESULTS_VERSION
+        assert results["bulk.close_all_trades"]["operations"] == 3
+        assert results["decode.get_account"]["bytes"] > 0
+
+        lines = benchmarks.compare(results, results)
+        assert len(lines) == len(results) + 1
+        assert lines[1].endswith("1.00")
+
+
+if __name__ == "__main__":
+    unittest.main()
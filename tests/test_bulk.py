@@ -0,0 +1,85 @@
+import asyncio
+import random
+import threading
+import time
+import unittest
+
+from oandav20.bulk import execute_bulk, execute_bulk_async, is_bulk_worker
+from oandav20.testing import MockServer
+
+
+def call(number):
+    time.sleep(random.uniform(0, 0.02))
+
+    if number % 3 == 0:
+        raise ValueError(number)
+
+    return number * 10
+
+
+async def call_async(number):
+    await asyncio.sleep(random.uniform(0, 0.02))
+    return call(number)
+
+
+class TestExecuteBulk(unittest.TestCase):
+
+    def check_report(self, report):
+        assert [item.arguments for item in report] == \
+            [{"number": number} for number in range(1, 21)]
+        assert [item.result for item in report.succeeded] == \
+            [number * 10 for number in range(1, 21) if number % 3]
+        assert [item.error.args[0] for item in report.failed] == \
+            [number for number in range(1, 21) if not number % 3]
+        assert all(item.result is None for item in report.failed)
+        assert all(item.elapsed >= 0 for item in report)
+
+    def test_execute_bulk_function(self):
+        calls = [{"number": number} for number in range(1, 21)]
+
+        self.check_report(execute_bulk(call, calls, concurrency=8))
+        self.check_report(execute_bulk(call, calls, concurrency=1))
+
+    def test_execute_bulk_async_function(self):
+        calls = [{"number": number} for number in range(1, 21)]
+        loop = asyncio.new_event_loop()
+        report = loop.run_until_complete(
+            execute_bulk_async(call_async, calls, concurrency=8))
+        loop.close()
+
+        self.check_report(report)
+
+    def test_is_bulk_worker_function(self):
+        report = execute_bulk(lambda: is_bulk_worker(), [{}, {}])
+
+        assert [item.result for item in report] == [True, True]
+        assert not is_bulk_worker()
+
+    def test_lent_sessions(self):
+        with MockServer() as server:
+            oanda = server.create_client()
+            sessions = set()
+            lock = threading.Lock()
+
+            def get_session():
+                with oanda._get_client() as session:
+                    with lock:
+                        sessions.add(id(session))
+
+                    time.sleep(0.05)
+
+            execute_bulk(get_session, [{}] * 4, concurrency=4)
+
+            for _ in range(4):
+                oanda.create_market_order("EUR_USD", "BUY", 1)
+
+            report = oanda.close_all_trades(concurrency=4)
+            oanda.close()
+
+        assert len(sessions) == 4
+        assert id(oanda.client) not in sessions
+        assert len(report.succeeded) == 4
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import asyncio
+import time
+import unittest
+
+import requests
+
+from oandav20 import AsyncOanda
+from oandav20.cache import ResponseCache, get_account_id
+from oandav20.testing import MockServer
+
+ID = "101-004-0000000-001"
+SECOND_ID = "101-004-0000000-002"
+
+
+def create_response(status_code=200):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = b"{}"
+
+    return response
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def test_get_account_id_function(self):
+        assert get_account_id("/123/summary") == "123"
+        assert get_account_id("/123") == "123"
+        assert get_account_id("") == ""
+
+    def test_call_method(self):
+        cache = ResponseCache({"/{id}/summary": 60})
+        responses = []
+
+        def send():
+            responses.append(create_response())
+            return responses[-1]
+
+        assert cache.call("/1/summary", "a", send) is responses[0]
+        assert cache.call("/1/summary", "a", send) is responses[0]
+        assert cache.call("/1/summary", "b", send) is responses[1]
+        assert cache.call("/1/openTrades", "c", send) is responses[2]
+        assert cache.call("/1/openTrades", "c", send) is responses[3]
+        assert (cache.hits, cache.misses) == (1, 2)
+
+        cache.invalidate("/2/orders")
+        assert cache.call("/1/summary", "a", send) is responses[0]
+
+        cache.invalidate("/1/orders")
+        assert cache.call("/1/summary", "a", send) is responses[4]
+
+        cache.invalidate()
+        assert cache.call("/1/summary", "a", send) is responses[5]
+
+    def test_call_method_with_ttl(self):
+        cache = ResponseCache({"/{id}/summary": 0.05})
+        send = create_response
+
+        first_response = cache.call("/1/summary", "a", send)
+        time.sleep(0.1)
+        assert cache.call("/1/summary", "a", send) is not first_response
+
+    def test_invalidation_during_request(self):
+        cache = ResponseCache()
+
+        def send():
+            cache.invalidate("/1/orders")
+            return create_response()
+
+        cache.call("/1/summary", "a", send)
+        assert cache._entries == {}
+
+    def test_max_staleness(self):
+        cache = ResponseCache({"/{id}/summary": 0}, max_staleness=60)
+        response = cache.call("/1/summary", "a", create_response)
+
+        def fail():
+            raise requests.ConnectionError()
+
+        assert cache.call("/1/summary", "a", fail) is response
+        assert cache.call("/1/summary", "a",
+                          lambda: create_response(503)) is response
+        assert cache.stale_hits == 2
+        assert cache.call("/1/summary", "a",
+                          lambda: create_response(404)).status_code == 404
+
+        cache.max_staleness = 0
+
+        with self.assertRaises(requests.ConnectionError):
+            cache.call("/1/summary", "a", fail)
+
+    def test_client_integration(self):
+        with MockServer([ID, SECOND_ID]) as server:
+            oanda = server.create_client()
+            oanda.response_cache = ResponseCache()
+
+            summary = oanda.get_account_summary()
+            summary["account"]["balance"] = "foo"
+            assert oanda.get_account_summary()["account"]["balance"] != "foo"
+            assert oanda.response_cache.hits == 1
+
+            oanda.get_positions(SECOND_ID)
+            oanda.create_order("MARKET", "EUR_USD", "BUY", 10)
+            assert oanda.get_account_summary()["account"][
+                "openTradeCount"] == 1
+            assert oanda.response_cache.misses == 3
+
+            oanda.get_positions(SECOND_ID)
+            assert oanda.response_cache.hits == 2
+
+            oanda.close()
+
+    def test_async_client_integration(self):
+        loop = asyncio.new_event_loop()
+
+        async def run(oanda):
+            async with oanda:
+                await oanda.get_pricing(["EUR_USD"])
+                await oanda.get_pricing(["EUR_USD"])
+                await oanda.create_order("MARKET", "EUR_USD", "BUY", 10)
+                await oanda.get_pricing(["EUR_USD"])
+
+        with MockServer([ID]) as server:
+            oanda = server.connect(AsyncOanda("DEMO", "mock", ID))
+            oanda.response_cache = ResponseCache({"/{id}/pricing": 60})
+            loop.run_until_complete(run(oanda))
+
+        loop.close()
+
+        assert (oanda.response_cache.hits, oanda.response_cache.misses) == \
+            (1, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
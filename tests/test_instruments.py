@@ -0,0 +1,147 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from oandav20.instruments import (INSTRUMENTS, INSTRUMENT_CODES,
+                                  INSTRUMENT_INDEX, InstrumentRegistry,
+                                  get_instruments_by_currency,
+                                  validate_instruments)
+
+
+class TestInstruments(unittest.TestCase):
+
+    def test_instrument_index(self):
+        assert INSTRUMENT_CODES == set(INSTRUMENTS.values())
+
+        info = INSTRUMENT_INDEX["XAU_USD"]
+        assert info.display_name == "Gold"
+        assert info.asset_class == "METAL"
+        assert info.base_currency == "XAU"
+        assert info.quote_currency == "USD"
+
+    def test_get_instruments_by_currency_function(self):
+        assert get_instruments_by_currency("CZK") == {"EUR_CZK", "USD_CZK"}
+        assert not get_instruments_by_currency("foo")
+        assert get_instruments_by_currency(
+            "USD", frozenset(["EUR_USD", "NEW_USD", "EUR_GBP"])) == \
+            {"EUR_USD", "NEW_USD"}
+
+    def test_validate_instruments_function(self):
+        validate_instruments(["EUR_USD", "DE30_EUR"])
+
+        with self.assertRaises(ValueError):
+            validate_instruments(["EUR_USD", "foo"])
+
+        with self.assertRaises(ValueError):
+            validate_instruments(["EUR_USD"], frozenset(["foo"]))
+
+
+class FakeOanda:
+    """Replacement of the Oanda object counting the 'get_instruments'
+    calls."""
+
+    default_id = "foo"
+
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+
+    def send_request(self, *args, **kwargs):
+        pass
+
+    def get_instruments(self, account_id=""):
+        self.calls += 1
+        time.sleep(self.delay)
+
+        return {"instruments": [{"name": "EUR_USD", "pipLocation": -4},
+                                {"name": "NEW_USD", "pipLocation": -4}]}
+
+
+class FakeAsyncOanda(FakeOanda):
+
+    async def send_request(self, *args, **kwargs):
+        pass
+
+    async def get_instruments(self, account_id=""):
+        return FakeOanda.get_instruments(self, account_id)
+
+
+class TestInstrumentRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.oanda = FakeOanda()
+        self.path = os.path.join(tempfile.mkdtemp(), "instruments.json")
+
+    def test_static_instruments_before_loading(self):
+        registry = InstrumentRegistry(self.oanda)
+
+        assert "GBP_USD" in registry
+        assert "NEW_USD" not in registry
+        assert not self.oanda.calls
+
+    def test_load_method(self):
+        registry = InstrumentRegistry(self.oanda, path=self.path)
+        registry.load()
+
+        assert registry.codes == {"EUR_USD", "NEW_USD"}
+        assert registry.get("NEW_USD")["pipLocation"] == -4
+        assert self.oanda.calls == 1
+
+        with self.assertRaises(ValueError):
+            registry.validate(["GBP_USD"])
+
+        # Warm start from the saved file
+
+        registry = InstrumentRegistry(self.oanda, path=self.path)
+        registry.load()
+
+        assert "NEW_USD" in registry
+        assert registry.get_by_currency("USD") == {"EUR_USD", "NEW_USD"}
+        assert self.oanda.calls == 1
+
+    def test_concurrent_expiration(self):
+        self.oanda.delay = 0.2
+        registry = InstrumentRegistry(self.oanda, ttl=60.0)
+        registry.update([], loaded_at=time.time() - 120.0)
+        threads = [threading.Thread(target=lambda: "EUR_USD" in registry)
+                   for _ in range(20)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        while registry._refreshing:
+            time.sleep(0.01)
+
+        assert self.oanda.calls == 1
+        assert "NEW_USD" in registry
+
+    def test_async_expiration(self):
+        oanda = FakeAsyncOanda()
+        registry = InstrumentRegistry(oanda, ttl=60.0)
+        registry.update([], loaded_at=time.time() - 120.0)
+
+        # No running event loop, so nothing is scheduled.
+
+        assert "NEW_USD" not in registry
+        assert registry._task is None
+
+        async def run():
+            assert "NEW_USD" not in registry
+            await registry._task
+
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(run())
+        loop.close()
+
+        assert "NEW_USD" in registry
+        assert oanda.calls == 1
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import datetime
+import unittest
+
+from oandav20.testing import TestCase
+
+
+class TestInstrumentsMixin(TestCase):
+
+    def test_get_candles_method(self):
+        start = datetime.datetime(2017, 1, 2)
+        end = datetime.datetime(2017, 1, 16)
+
+        candles = self.oanda.get_candles("EUR_USD", start, end, "M1",
+                                         concurrency=2)
+        assert len(candles) > 4999
+        assert candles.flags["C_CONTIGUOUS"]
+        assert (candles["time"][1:] > candles["time"][:-1]).all()
+        assert (candles["high"] >= candles["low"]).all()
+
+        bid_candles = self.oanda.get_candles("EUR_USD", start, end, "D",
+                                             price="B")
+        assert (bid_candles["close"] > 0).all()
+
+        with self.assertRaises(ValueError):
+            self.oanda.get_candles("foo", start, end)
+
+        with self.assertRaises(ValueError):
+            self.oanda.get_candles("EUR_USD", start, end, "foo")
+
+        with self.assertRaises(ValueError):
+            self.oanda.get_candles("EUR_USD", start, end, price="foo")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+
+import requests
+
+from oandav20 import Oanda
+from oandav20.metrics import (RequestMetrics, get_body_size,
+                              get_endpoint_template)
+from oandav20.retry import RetryPolicy
+
+
+class TestRequestMetrics(unittest.TestCase):
+
+    def test_get_endpoint_template_function(self):
+        assert get_endpoint_template("") == ""
+        assert get_endpoint_template("/101-004-1-001/summary") == \
+            "/{id}/summary"
+        assert get_endpoint_template("/101-004-1-001/orders/@foo/cancel") == \
+            "/{id}/orders/{id}/cancel"
+        assert get_endpoint_template("/101-004-1-001/trades/6411/close") == \
+            "/{id}/trades/{id}/close"
+        assert get_endpoint_template(
+            "/101-004-1-001/instruments/EUR_USD/candles") == \
+            "/{id}/instruments/{instrument}/candles"
+
+    def test_get_body_size_function(self):
+        assert get_body_size({}) == 0
+        assert get_body_size({"json": {"units": "1"}}) == 14
+        assert get_body_size({"data": "foo"}) == 3
+
+    def test_snapshot_method(self):
+        metrics = RequestMetrics()
+        metrics.record("GET", "/1/orders/2", 200, 0.02, 0, 100)
+        metrics.record("GET", "/1/orders/3", 503, 0.3, 0, 10)
+        metrics.record("GET", "/1/orders/3", 0, 20.0, retry=True)
+
+        stats = metrics.snapshot()["GET /{id}/orders/{id}"]
+        assert stats["count"] == 3
+        assert stats["errors"] == 2
+        assert stats["retries"] == 1
+        assert stats["bytes_received"] == 110
+        assert stats["statuses"] == {"200": 1, "503": 1, "0": 1}
+        assert stats["latency_buckets"]["0.01"] == 0
+        assert stats["latency_buckets"]["0.025"] == 1
+        assert stats["latency_buckets"]["0.5"] == 2
+        assert stats["latency_buckets"]["inf"] == 3
+
+        metrics.reset()
+        assert metrics.snapshot() == {}
+
+    def test_to_prometheus_method(self):
+        metrics = RequestMetrics()
+        metrics.record("PUT", "/1/trades/2/close", 200, 0.02, 20, 100)
+        text = metrics.to_prometheus()
+        labels = 'method="PUT",endpoint="/{id}/trades/{id}/close"'
+
+        assert "# TYPE oandav20_request_duration_seconds histogram" in text
+        assert 'oandav20_request_duration_seconds_bucket{' + labels + \
+            ',le="+Inf"} 1' in text
+        assert "oandav20_request_duration_seconds_count{" + labels + \
+            "} 1" in text
+        assert "oandav20_request_sent_bytes_total{" + labels + "} 20" in text
+        assert 'oandav20_responses_total{' + labels + ',status="200"} 1' in \
+            text
+
+    def test_send_request_method(self):
+        oanda = Oanda("DEMO", "foo", "bar")
+        oanda.retry_policy = RetryPolicy(backoff=0.001)
+        oanda.metrics = RequestMetrics()
+        statuses = [503, 200]
+
+        def request(method, url, **kwargs):
+            response = requests.Response()
+            response.status_code = statuses.pop(0)
+            response.request = requests.Request(
+                method, url, json=kwargs.get("json")).prepare()
+            response._content = b'{"foo": "bar"}'
+            response._content_consumed = True
+
+            return response
+
+        oanda.client.request = request
+        oanda.send_request("/1/trades/2", "PUT", json={"units": "ALL"})
+
+        stats = oanda.metrics.snapshot()["PUT /{id}/trades/{id}"]
+        assert stats["count"] == 2
+        assert stats["retries"] == 1
+        assert stats["bytes_sent"] == 32
+        assert stats["bytes_received"] == 28
+
+        oanda.client.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import time
+import unittest
+
+from oandav20.mirror import AccountMirror
+
+
+def position(instrument, long_units, short_units):
+    return {
+        "instrument": instrument,
+        "long": {"units": long_units, "unrealizedPL": "0.0000"},
+        "short": {"units": short_units, "unrealizedPL": "0.0000"},
+        "unrealizedPL": "0.0000"
+    }
+
+
+class TestAccountMirror(unittest.TestCase):
+
+    def setUp(self):
+        self.mirror = AccountMirror(None, account_id="foo")
+        self.mirror.account = {
+            "NAV": "1000.0000",
+            "orders": [{"id": "1", "state": "PENDING"},
+                       {"id": "2", "state": "PENDING"}],
+            "positions": [position("EUR_USD", "100", "0")],
+            "trades": [{"id": "3", "currentUnits": "100",
+                        "unrealizedPL": "0.0000"}]
+        }
+
+    def test_apply_method(self):
+        changes = {
+            "ordersCreated": [{"id": "4", "state": "PENDING"},
+                              {"id": "5", "state": "FILLED"}],
+            "ordersCancelled": [{"id": "1"}],
+            "ordersFilled": [{"id": "2"}, {"id": "5"}],
+            "tradesOpened": [{"id": "6", "currentUnits": "-10"}],
+            "tradesReduced": [{"id": "3", "currentUnits": "40"}],
+            "tradesClosed": [],
+            "positions": [position("EUR_USD", "40", "0"),
+                          position("GBP_USD", "0", "-10")]
+        }
+        state = {
+            "NAV": "1001.5000",
+            "trades": [{"id": "3", "unrealizedPL": "1.5000"}],
+            "positions": [{"instrument": "EUR_USD",
+                           "netUnrealizedPL": "1.5000",
+                           "longUnrealizedPL": "1.5000",
+                           "shortUnrealizedPL": "0.0000"}]
+        }
+        self.mirror.apply(changes, state)
+        account = self.mirror.account
+
+        assert [order["id"] for order in account["orders"]] == ["4"]
+        assert [trade["id"] for trade in account["trades"]] == ["3", "6"]
+        assert account["trades"][0]["currentUnits"] == "40"
+        assert account["trades"][0]["unrealizedPL"] == "1.5000"
+        assert account["positions"][0]["long"]["unrealizedPL"] == "1.5000"
+        assert account["NAV"] == "1001.5000"
+        assert account["pendingOrderCount"] == 1
+        assert account["openTradeCount"] == 2
+        assert account["openPositionCount"] == 2
+
+        self.mirror.apply({"tradesClosed": [{"id": "3"}, {"id": "6"}]}, {})
+        assert not self.mirror.account["trades"]
+
+    def test_failed_refresh_keeps_thread(self):
+        calls = []
+
+        class StubOanda:
+
+            def get_account_changes(self, transaction_id, account_id):
+                calls.append(transaction_id)
+
+                if len(calls) == 1:
+                    return {"lastTransactionID": "1"}  # missing changes
+
+                return {"changes": {}, "state": {"NAV": "1001.0000"},
+                        "lastTransactionID": "2"}
+
+        self.mirror.oanda = StubOanda()
+        self.mirror.last_transaction_id = "0"
+        self.mirror.start(interval=0.01)
+
+        while len(calls) < 3:
+            time.sleep(0.01)
+
+        self.mirror.stop()
+
+        assert isinstance(self.mirror.error, KeyError)
+        assert self.mirror.last_transaction_id == "2"
+        assert self.mirror.account["NAV"] == "1001.0000"
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+
+from oandav20.models import AccountSummary, Order, Position, Price, Trade
+
+
+class TestModels(unittest.TestCase):
+
+    def test_price_model(self):
+        data = {
+            "asks": [{"liquidity": 10000000, "price": "1.13028"}],
+            "bids": [{"liquidity": 10000000, "price": "1.13015"}],
+            "closeoutAsk": "1.13032",
+            "closeoutBid": "1.13011",
+            "instrument": "EUR_USD",
+            "time": "2016-06-22T18:41:36.201836422Z"
+        }
+        price = Price(data)
+        assert price.instrument == "EUR_USD"
+        assert price.bid == 1.13015
+        assert price.ask == 1.13028
+        assert price.closeout_bid == 1.13011
+        assert abs(price.spread - 0.00013) < 1e-9
+        assert price.data is data
+
+        # Parsed values are cached, the JSON object isn't read again.
+
+        data["bids"] = []
+        assert price.bid == 1.13015
+        assert Price(data).bid is None
+
+        with self.assertRaises(AttributeError):
+            price.foo = 1
+
+    def test_order_and_trade_models(self):
+        order = Order({
+            "clientExtensions": {"id": "EUR_USD_1"},
+            "id": "6372",
+            "price": "1.10000",
+            "stopLossOnFill": {"price": "1.09000", "timeInForce": "GTC"},
+            "type": "LIMIT",
+            "units": "-10000"
+        })
+        assert order.units == -10000
+        assert order.price == 1.1
+        assert order.stoploss == 1.09
+        assert order.takeprofit is None
+        assert order.own_id == "EUR_USD_1"
+        assert order.tag == ""
+
+        trades = Trade.from_list([{"currentUnits": "5", "id": "1"},
+                                  {"currentUnits": "-3", "id": "2"}])
+        assert [trade.current_units for trade in trades] == [5, -3]
+        assert trades[0] == Trade({"currentUnits": "5", "id": "1"})
+
+    def test_position_and_account_models(self):
+        position = Position({"instrument": "EUR_USD",
+                             "long": {"averagePrice": "1.1", "units": "10"},
+                             "short": {"units": "-4"}})
+        assert position.units == 6
+        assert position.long_average_price == 1.1
+        assert position.short_average_price is None
+
+        summary = AccountSummary({"NAV": "100.5", "balance": "100",
+                                  "openTradeCount": 2})
+        assert summary.nav == 100.5
+        assert summary.open_trade_count == 2
+
+    def test_equality_and_hash(self):
+        trade = Trade({"id": "1", "instrument": "EUR_USD"})
+        same_trade = Trade({"id": "1", "instrument": "EUR_USD"})
+        order = Order({"id": "1", "instrument": "EUR_USD"})
+
+        assert trade == same_trade
+        assert trade != order
+        assert hash(trade) == hash(same_trade)
+        assert len({trade, same_trade, order}) == 2
+        assert {trade: 1}[same_trade] == 1
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,10 @@
 import unittest
+from unittest import mock
+
+from requests import HTTPError
 
 from oandav20.testing import TestCase
+from oandav20.tracking import OrderCache
 
 
 class TestOrderMixin(TestCase):
@@ -26,18 +30,6 @@ class TestOrderMixin(TestCase):
     "EUR_ZAR"
     """
 
-    def tearDown(self):
-        """Add new ID to the file below for future uses."""
-        with open("used_own_ids.txt", "a") as f:
-            f.write(str(int(self.last_own_id) + 1) + "\n")
-
-    @property
-    def last_own_id(self):
-        with open("used_own_ids.txt") as f:
-            last_own_id = f.read().split("\n")[-2]  # [-1] is blank string
-
-        return last_own_id
-
     def test_create_order_method(self):
         # Market order
 
@@ -59,7 +51,7 @@ class TestOrderMixin(TestCase):
 
         # Stop order
 
-        own_id = "EUR_CHF_" + self.last_own_id
+        own_id = self.get_own_id("EUR_CHF")
         is_created = self.oanda.create_order(
             "STOP", "EUR_CHF", "SELL", 1, price=0.1, price_bound=0.0995,
             own_id=own_id, tag="foo", comment="bar")
@@ -103,13 +95,43 @@ class TestOrderMixin(TestCase):
             "EUR_HKD", "SELL", 1, price=0.1)
         assert order_id
 
+    def test_create_orders_method(self):
+        own_id = self.get_own_id("EUR_SEK")
+        report = self.oanda.create_orders([
+            {"order_type": "MARKET", "instrument": "EUR_SEK", "side": "BUY",
+             "units": 1, "own_id": own_id},
+            {"order_type": "LIMIT", "instrument": "EUR_SEK", "side": "BUY",
+             "units": 1, "price": 0.1},
+            {"order_type": "MARKET", "instrument": "EUR_SEK", "side": "BUY",
+             "units": 1, "own_id": own_id}
+        ], concurrency=1)
+        assert len(report) == 3
+
+        market, limit, duplicate = report
+        assert market.result.own_id == own_id
+        assert market.result.fill["orderID"] == market.result.order_id
+        assert limit.result.fill is None
+        assert self.oanda.get_order(int(limit.result.order_id))
+        assert duplicate.error is not None
+
+        with self.assertRaises(TypeError):
+            self.oanda.create_orders([
+                {"order_type": "MARKET", "instrument": "EUR_SEK",
+                 "side": "BUY", "units": 1},
+                {"order_type": "LIMIT", "instrument": "EUR_SEK",
+                 "side": "BUY", "units": 1}])
+
     def test_get_order_method(self):
-        """There are used old Oanda order ID and own order ID."""
-        order_details = self.oanda.get_order(5)
-        assert order_details["order"]["id"] == str(5)
+        order_id = self.oanda.create_limit_order(
+            "EUR_HUF", "BUY", 1, price=0.1)
+        order_details = self.oanda.get_order(int(order_id))
+        assert order_details["order"]["id"] == order_id
 
-        order_details = self.oanda.get_order(own_id="AUD_USD_1")
-        assert order_details["order"]["clientExtensions"]["id"] == "AUD_USD_1"
+        own_id = self.get_own_id("EUR_HUF")
+        self.oanda.create_limit_order(
+            "EUR_HUF", "BUY", 1, price=0.1, own_id=own_id)
+        order_details = self.oanda.get_order(own_id=own_id)
+        assert order_details["order"]["clientExtensions"]["id"] == own_id
 
         with self.assertRaises(TypeError):
             self.oanda.get_order()
@@ -135,8 +157,84 @@ class TestOrderMixin(TestCase):
         order_details = self.oanda.get_order(new_order_id)
         assert order_details["order"]["units"] == str(2)
 
+    def test_update_order_method_with_order_cache(self):
+        own_id = self.get_own_id("EUR_JPY")
+        self.oanda.order_cache = OrderCache()
+
+        try:
+            self.oanda.create_limit_order("EUR_JPY", "BUY", 1, price=0.1,
+                                          own_id=own_id)
+
+            with mock.patch.object(self.oanda, "get_order",
+                                   wraps=self.oanda.get_order) as get_order:
+                assert self.oanda.update_order(own_id=own_id, price=0.11)
+                assert self.oanda.update_order(own_id=own_id, units=3)
+                assert not get_order.called
+
+            order_details = self.oanda.get_order(own_id=own_id)["order"]
+            assert order_details["price"] == "0.11"
+            assert order_details["units"] == "3"
+            assert self.oanda.order_cache.hits == 2
+
+            self.oanda.cancel_order(own_id=own_id)
+            assert self.oanda.order_cache.get(self.oanda.default_id,
+                                              own_id=own_id) is None
+
+            with self.assertRaises(HTTPError):
+                self.oanda.update_order(own_id=own_id, price=0.12)
+        finally:
+            self.oanda.order_cache = None
+
+    def test_update_orders_method(self):
+        own_id = self.get_own_id("EUR_HUF")
+        self.oanda.create_limit_order("EUR_HUF", "BUY", 1, price=0.1,
+                                      own_id=own_id)
+        order_id = self.oanda.create_limit_order(
+            "EUR_HUF", "BUY", 2, price=0.2, stoploss=0.05)
+
+        with self.assertRaises(TypeError):
+            self.oanda.update_orders([{"price": 0.1}])
+
+        with self.assertRaises(TypeError):
+            self.oanda.update_orders([{"own_id": own_id, "foo": 1}])
+
+        report = self.oanda.update_orders([
+            {"own_id": own_id, "price": 0.11, "units": 3},
+            {"order_id": int(order_id), "price": 0.2, "stoploss": 0.05,
+             "units": 2},
+            {"own_id": "foo", "price": 0.1}])
+
+        assert report.items[0].result.replaced
+        assert report.items[0].result.own_id == own_id
+        assert report.items[1].result == (order_id, "", False)
+        assert isinstance(report.items[2].error, ValueError)
+
+        order_details = self.oanda.get_order(own_id=own_id)["order"]
+        assert order_details["id"] == report.items[0].result.order_id
+        assert order_details["price"] == "0.11"
+        assert order_details["units"] == "3"
+
+    def test_update_orders_method_keeps_side(self):
+        order_id = self.oanda.create_limit_order(
+            "EUR_SEK", "SELL", 5, price=100)
+        orders = [{"order_id": int(order_id), "units": 7}]
+
+        with self.assertRaises(ValueError):
+            self.oanda.update_orders(orders * 2)
+
+        report = self.oanda.update_orders(orders)
+        new_order_id = report.items[0].result.order_id
+        assert report.items[0].result.replaced
+
+        order_details = self.oanda.get_order(new_order_id)["order"]
+        assert order_details["units"] == "-7"
+
+        report = self.oanda.update_orders([{"order_id": int(new_order_id),
+                                            "units": 7}])
+        assert report.items[0].result == (new_order_id, "", False)
+
     def test_update_order_extensions_method(self):
-        own_id = "EUR_NOK_" + self.last_own_id
+        own_id = self.get_own_id("EUR_NOK")
         self.oanda.create_limit_order(
             "EUR_NOK", "BUY", 1, price=0.1, own_id=own_id)
 
@@ -159,10 +257,10 @@ class TestOrderMixin(TestCase):
         assert "EUR_NZD" not in pending_orders_instrument_list
 
     def test_cancel_filtered_orders_method(self):
-        own_id_1 = "EUR_PLN_" + self.last_own_id
+        own_id_1 = self.get_own_id("EUR_PLN")
         self.oanda.create_market_order("EUR_PLN", "BUY", 1, own_id=own_id_1)
 
-        own_id_2 = "EUR_SEK_" + self.last_own_id
+        own_id_2 = self.get_own_id("EUR_SEK")
         self.oanda.create_market_order("EUR_SEK", "BUY", 1, own_id=own_id_2)
 
         self.oanda.cancel_filtered_orders(own_ids=[own_id_1, own_id_2])
@@ -181,7 +279,9 @@ class TestOrderMixin(TestCase):
 
     def test_cancel_all_orders_method(self):
         self.oanda.create_limit_order("EUR_SGD", "BUY", 1, price=0.1)
-        self.oanda.cancel_all_orders()
+        report = self.oanda.cancel_all_orders()
+        assert len(report.succeeded) >= 1
+        assert not report.failed
 
         pending_orders = self.oanda.get_all_orders()
         assert not len(pending_orders["orders"])
@@ -0,0 +1,150 @@
+import asyncio
+import socket
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from oandav20 import AsyncOanda, Oanda
+from oandav20.pool import PoolConfig, SessionPool, get_keep_alive_options
+from oandav20.testing import MockServer
+
+ID = "101-004-0000000-001"
+
+
+class TestPoolConfig(unittest.TestCase):
+
+    def test_init_method(self):
+        with self.assertRaises(ValueError):
+            PoolConfig(max_connections=0)
+
+        with self.assertRaises(ValueError):
+            PoolConfig(max_connections=2, prewarm=3)
+
+        assert PoolConfig().timeout == (10.0, 30.0)
+        assert PoolConfig(connect_timeout=0, read_timeout=0).timeout is None
+        assert PoolConfig(read_timeout=0).timeout == (10.0, None)
+
+    def test_get_keep_alive_options_function(self):
+        assert get_keep_alive_options(0) == []
+
+        options = get_keep_alive_options(60)
+        assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in options
+
+    def test_prewarm_method(self):
+        with MockServer([ID]) as server:
+            oanda = server.connect(Oanda(
+                "DEMO", "mock", ID, PoolConfig(max_connections=4)))
+            assert oanda.prewarm(4) == 4
+
+            pool = oanda.client.get_adapter(oanda.base_url).poolmanager
+            connections = sum(
+                connection_pool.num_connections
+                for connection_pool in pool.pools._container.values())
+            assert connections == 4
+
+            oanda.get_account_summary()
+            assert connections == sum(
+                connection_pool.num_connections
+                for connection_pool in pool.pools._container.values())
+
+    def test_read_timeout(self):
+        with MockServer([ID], latency=0.5) as server:
+            oanda = server.connect(Oanda(
+                "DEMO", "mock", ID, PoolConfig(read_timeout=0.1)))
+            oanda.retry_policy = None
+
+            with self.assertRaises(requests.Timeout):
+                oanda.get_account_summary()
+
+    def test_async_prewarm_method(self):
+        loop = asyncio.new_event_loop()
+
+        async def run(server):
+            oanda = server.connect(AsyncOanda(
+                "DEMO", "mock", ID, PoolConfig(max_connections=5, prewarm=3)))
+
+            async with oanda:
+                connector = oanda.client.connector
+                assert connector.limit_per_host == 5
+                assert connector.limit == 20
+
+                return sum(len(connections) for connections in
+                           connector._conns.values())
+
+        with MockServer([ID]) as server:
+            assert loop.run_until_complete(run(server)) == 3
+
+        loop.close()
+
+
+class TestThreadSafeMode(unittest.TestCase):
+
+    def test_session_pool(self):
+        created = []
+
+        def create_session():
+            created.append(requests.Session())
+            return created[-1]
+
+        sessions = SessionPool(create_session, size=1)
+
+        with sessions.session() as first:
+            with sessions.session() as second:
+                assert first is not second
+
+        assert len(created) == 2
+
+        with sessions.session() as session:
+            assert session is second
+
+        sessions.close()
+        assert len(created) == 2
+
+    def test_concurrent_requests(self):
+        with MockServer([ID]) as server:
+            oanda = server.connect(Oanda("DEMO", "mock", ID,
+                                         thread_safe=True))
+            oanda.rate_limiter = None
+            used = set()
+            lock = threading.Lock()
+            original_create_session = oanda._create_session
+
+            def create_session():
+                session = original_create_session()
+                request = session.request
+
+                def tracked_request(*args, **kwargs):
+                    with lock:
+                        assert session not in used
+                        used.add(session)
+
+                    try:
+                        return request(*args, **kwargs)
+                    finally:
+                        with lock:
+                            used.remove(session)
+
+                session.request = tracked_request
+
+                return session
+
+            oanda.sessions._factory = create_session
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                summaries = list(executor.map(
+                    lambda _: oanda.get_account_summary(), range(40)))
+
+            assert all(summary["account"]["id"] == ID
+                       for summary in summaries)
+            assert 1 <= len(oanda.sessions._idle) <= 8
+            assert oanda.sessions._idle[0].headers["Authorization"] == \
+                "Bearer mock"
+
+            oanda.close()
+            assert oanda.sessions._idle == []
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,9 +6,32 @@ from oandav20.testing import TestCase
 class TestPositionsMixin(TestCase):
 
     def test_get_positions_method(self):
+        self.oanda.create_market_order("GBP_USD", "BUY", 1)
+
         positions = self.oanda.get_positions()
         assert len(positions["positions"]) > 0
 
+    def test_close_position_method(self):
+        self.oanda.create_market_order("NZD_USD", "BUY", 10)
+        self.oanda.create_market_order("NZD_USD", "BUY", 20)
+        self.oanda.create_market_order("NZD_USD", "SELL", 5)
+
+        assert self.oanda.close_position("NZD_USD", "LONG", 15)
+        assert self.oanda.close_position("NZD_USD", "LONG")
+
+        open_trades = self.oanda.get_all_trades()
+        assert [trade["currentUnits"] for trade in open_trades["trades"]
+                if trade["instrument"] == "NZD_USD"] == ["-5"]
+
+        with self.assertRaises(ValueError):
+            self.oanda.close_position("foo", "LONG")
+
+        with self.assertRaises(ValueError):
+            self.oanda.close_position("NZD_USD", "BUY")
+
+        with self.assertRaises(ValueError):
+            self.oanda.close_position("NZD_USD", "SHORT", -1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,7 @@
+import time
 import unittest
 
-from oandav20.testing import TestCase
+from oandav20.testing import MockServer, TestCase
 
 
 class TestPricingMixin(TestCase):
@@ -15,6 +16,81 @@ class TestPricingMixin(TestCase):
         with self.assertRaises(ValueError):
             self.oanda.get_pricing(["foo"])
 
+    def test_get_pricing_array_method(self):
+        prices = self.oanda.get_pricing_array(["AUD_USD", "EUR_USD"])
+        assert list(prices["instrument"]) == [0, 1]
+        assert (prices["ask"] > prices["bid"]).all()
+
+    def test_stream_pricing_method(self):
+        heartbeats = []
+        stream = self.oanda.stream_pricing(
+            ["AUD_USD", "EUR_USD"], heartbeat=heartbeats.append)
+
+        for price in stream:
+            assert price["instrument"] in ["AUD_USD", "EUR_USD"]
+            assert price["type"] == "PRICE"
+            break
+
+        stream.close()
+
+        with self.assertRaises(ValueError):
+            self.oanda.stream_pricing(["foo"])
+
+
+class TestPricingStream(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockServer(heartbeat_interval=0.05, price_interval=0.05)
+        self.server.start()
+        self.oanda = self.server.create_client()
+        self.heartbeats = []
+        self.stream = self.oanda.stream_pricing(
+            ["EUR_USD"], heartbeat=self.heartbeats.append, stall_timeout=0.3)
+
+    def tearDown(self):
+        self.stream.close()
+        self.oanda.close()
+        self.server.stop()
+
+    def wait_for_heartbeat(self):
+        count = len(self.heartbeats)
+
+        for price in self.stream:
+            assert price["instrument"] == "EUR_USD"
+
+            if len(self.heartbeats) > count:
+                return
+
+    def test_heartbeat_callback(self):
+        self.wait_for_heartbeat()
+
+        assert self.heartbeats[0]["type"] == "HEARTBEAT"
+        assert self.server.streams == 1
+
+    def test_reconnect_after_disconnect(self):
+        self.wait_for_heartbeat()
+        self.server.drop_streams()
+        self.wait_for_heartbeat()
+
+        assert self.server.streams == 2
+
+    def test_reconnect_after_server_error(self):
+        self.wait_for_heartbeat()
+        self.server.fail_next(1, status=503)
+        self.server.drop_streams()
+        self.wait_for_heartbeat()
+
+        assert self.server.streams == 2
+
+    def test_reconnect_after_stall(self):
+        self.wait_for_heartbeat()
+        started = time.time()
+        self.server.stall_streams(0.5)
+        self.wait_for_heartbeat()
+
+        assert time.time() - started >= 0.5
+        assert self.server.streams >= 2
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,61 @@
+import multiprocessing
+import os
+import tempfile
+import time
+import unittest
+
+from oandav20.ratelimit import RateLimiter
+
+
+def reserve_many(path, count, queue):
+    limiter = RateLimiter(1, 10, path)
+    queue.put(sum(limiter.reserve() > 0 for _ in range(count)))
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_reserve_method(self):
+        limiter = RateLimiter(100, 10)
+        delays = [limiter.reserve() for _ in range(15)]
+
+        assert delays[:10] == [0.0] * 10
+        assert 0.0 < delays[10] < delays[14] <= 0.05
+
+    def test_acquire_method(self):
+        limiter = RateLimiter(200, 1)
+        started = time.time()
+
+        for _ in range(21):
+            limiter.acquire()
+
+        assert 0.09 < time.time() - started < 0.5
+
+    def test_shared_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bucket")
+            queue = multiprocessing.Queue()
+            processes = [
+                multiprocessing.Process(target=reserve_many,
+                                        args=(path, 10, queue))
+                for _ in range(3)]
+
+            for process in processes:
+                process.start()
+
+            for process in processes:
+                process.join()
+
+            # Only 10 of 30 requests fit into the shared burst.
+
+            assert sum(queue.get() for _ in processes) >= 19
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            RateLimiter(0)
+
+        with self.assertRaises(ValueError):
+            RateLimiter(10, -1)
+
+
+if __name__ == "__main__":
+    unittest.main()
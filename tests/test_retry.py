@@ -0,0 +1,135 @@
+import email.utils
+import time
+import unittest
+
+import requests
+
+from oandav20 import Oanda
+from oandav20.retry import (RetryPolicy, has_own_id, is_full_close,
+                            parse_retry_after)
+
+
+def make_response(status_code, headers={}):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers)
+    response._content = b"{}"
+    response._content_consumed = True
+
+    return response
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def test_should_retry_method(self):
+        policy = RetryPolicy(retries=2)
+        own_id_body = {"order": {"clientExtensions": {"id": "EUR_USD_1"}}}
+
+        assert policy.should_retry("GET", 0)
+        assert policy.should_retry("PUT", 1, {"units": "ALL"}, 503)
+        assert not policy.should_retry("PUT", 0, {"units": "10"}, 503)
+        assert not policy.should_retry("PUT", 0, None, 503)
+        assert not policy.should_retry("GET", 2, status_code=503)
+        assert not policy.should_retry("GET", 0, status_code=404)
+        assert not policy.should_retry("POST", 0, {"order": {}}, 502)
+        assert policy.should_retry("POST", 0, own_id_body, 502)
+        assert policy.should_retry("POST", 0, {"order": {}}, 429)
+
+    def test_get_delay_method(self):
+        policy = RetryPolicy(backoff=0.1, max_backoff=0.3)
+
+        assert 0 <= policy.get_delay(0) <= 0.1
+        assert 0 <= policy.get_delay(5) <= 0.3
+        assert policy.get_delay(0, "2") == 2.0
+
+    def test_functions(self):
+        assert has_own_id({"clientExtensions": {"id": "foo"}})
+        assert not has_own_id({"clientExtensions": {"comment": "foo"}})
+        assert not has_own_id(None)
+
+        assert is_full_close({"units": "ALL"})
+        assert is_full_close({"longUnits": "ALL"})
+        assert not is_full_close({"longUnits": "ALL", "shortUnits": "5"})
+        assert not is_full_close({"units": "5"})
+        assert not is_full_close({})
+
+        assert parse_retry_after("") == 0.0
+        assert parse_retry_after("1.5") == 1.5
+        assert parse_retry_after("foo") == 0.0
+        assert 8 < parse_retry_after(
+            email.utils.formatdate(time.time() + 10, usegmt=True)) <= 10
+
+
+class TestSendRequestRetries(unittest.TestCase):
+
+    def setUp(self):
+        self.oanda = Oanda("DEMO", "foo", "bar")
+        self.oanda.retry_policy = RetryPolicy(backoff=0.001)
+        self.calls = []
+
+    def tearDown(self):
+        self.oanda.client.close()
+
+    def replace_client(self, *results):
+        results = list(results)
+
+        def request(method, url, **kwargs):
+            self.calls.append(method)
+            result = results.pop(0)
+
+            if isinstance(result, Exception):
+                raise result
+
+            return result
+
+        self.oanda.client.request = request
+
+    def test_transient_errors(self):
+        self.replace_client(requests.ConnectionError(), make_response(503),
+                            make_response(200))
+
+        assert self.oanda.send_request("/foo").status_code == 200
+        assert len(self.calls) == 3
+
+    def test_not_idempotent_request(self):
+        self.replace_client(make_response(502), make_response(201))
+
+        response = self.oanda.send_request("/foo", "POST", json={"order": {}})
+        assert response.status_code == 502
+
+        response = self.oanda.send_request(
+            "/foo", "POST",
+            json={"order": {"clientExtensions": {"id": "EUR_USD_1"}}})
+        assert response.status_code == 201
+
+    def test_partial_close_request(self):
+        self.replace_client(requests.ConnectionError(), make_response(200))
+
+        with self.assertRaises(requests.ConnectionError):
+            self.oanda.close_trade(10, units=5)
+
+        assert self.calls == ["PUT"]
+
+    def test_full_close_request(self):
+        self.replace_client(make_response(502), make_response(200))
+
+        assert self.oanda.close_trade(10)
+        assert self.calls == ["PUT", "PUT"]
+
+    def test_retries_exhausted(self):
+        self.replace_client(*[requests.Timeout()] * 4)
+
+        with self.assertRaises(requests.Timeout):
+            self.oanda.send_request("/foo")
+
+        assert len(self.calls) == 4
+
+    def test_disabled_policy(self):
+        self.oanda.retry_policy = None
+        self.replace_client(make_response(503))
+
+        assert self.oanda.send_request("/foo").status_code == 503
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+
+from requests import HTTPError
+
+from oandav20.retry import RetryPolicy
+from oandav20.testing import MockServer
+
+ID = "101-004-0000000-001"
+
+
+class TestMockServer(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockServer([ID], token="secret")
+        self.server.start()
+        self.oanda = self.server.create_client()
+        self.oanda.retry_policy = RetryPolicy(backoff=0.01)
+
+    def tearDown(self):
+        self.oanda.client.close()
+        self.server.stop()
+
+    def test_trading(self):
+        own_id = "EUR_USD_1"
+        self.oanda.create_market_order("EUR_USD", "BUY", 10, own_id=own_id,
+                                       stoploss=0.5)
+        self.oanda.create_market_order("EUR_USD", "SELL", 4)
+
+        trade = self.oanda.get_trade(own_id=own_id)["trade"]
+        assert trade["currentUnits"] == "10"
+        assert trade["stopLossOrder"]["price"] == "0.5"
+
+        position = self.oanda.get_positions()["positions"][0]
+        assert position["long"]["units"] == "10"
+        assert position["short"]["units"] == "-4"
+
+        summary = self.oanda.get_account_summary()["account"]
+        assert summary["openTradeCount"] == 2
+        assert summary["pendingOrderCount"] == 1
+
+        assert self.oanda.close_trade(own_id=own_id)
+
+        with self.assertRaises(HTTPError):
+            self.oanda.close_trade(own_id=own_id)
+
+        with self.assertRaises(HTTPError):
+            self.oanda.create_market_order("EUR_USD", "BUY", 1,
+                                           own_id=own_id)
+
+    def test_error_injection(self):
+        self.server.fail_next(2, status=503)
+        assert self.oanda.get_account_summary()["account"]["id"] == ID
+
+        self.oanda.retry_policy = None
+        self.server.fail_next(1, status=500)
+
+        with self.assertRaises(HTTPError):
+            self.oanda.get_account_summary()
+
+        self.oanda.client.headers["Authorization"] = "Bearer foo"
+
+        with self.assertRaises(HTTPError):
+            self.oanda.get_account_summary()
+
+
+if __name__ == "__main__":
+    unittest.main()
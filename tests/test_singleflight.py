@@ -0,0 +1,176 @@
+import asyncio
+import json
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from oandav20 import AsyncOanda, Oanda
+from oandav20.singleflight import SingleFlight, get_request_key
+from oandav20.testing import MockServer
+
+ID = "101-004-0000000-001"
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def test_get_request_key_function(self):
+        assert get_request_key("/foo", {"params": {"a": 1, "b": 2}}) == \
+            get_request_key("/foo", {"params": {"b": 2, "a": 1}})
+        assert get_request_key("/foo", {}) != get_request_key("/bar", {})
+
+    def test_call_method(self):
+        single_flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def function():
+            calls.append(1)
+            started.set()
+            release.wait()
+            return len(calls)
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            leader = executor.submit(single_flight.call, "foo", function)
+            started.wait()
+            followers = [executor.submit(single_flight.call, "foo", function)
+                         for _ in range(4)]
+
+            while single_flight.coalesced < 4:
+                pass
+
+            release.set()
+            results = [leader.result()] + [f.result() for f in followers]
+
+        assert results == [1] * 5
+        assert single_flight.sent == 1
+        assert single_flight.coalesced == 4
+
+        # Nothing is cached after the call.
+
+        assert single_flight.call("foo", function) == 2
+
+    def test_call_method_with_error(self):
+        single_flight = SingleFlight()
+
+        def function():
+            raise ValueError("foo")
+
+        with self.assertRaises(ValueError):
+            single_flight.call("foo", function)
+
+        assert single_flight._calls == {}
+
+    def test_invalidate_method(self):
+        single_flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def function():
+            started.set()
+            release.wait()
+            return "old"
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            try:
+                leader = executor.submit(single_flight.call,
+                                         "/foo/orders {}", function)
+                started.wait()
+                single_flight.invalidate("/bar/orders")
+                assert "/foo/orders {}" in single_flight._calls
+
+                single_flight.invalidate("/foo/orders/1/cancel")
+                follower = executor.submit(single_flight.call,
+                                           "/foo/orders {}", lambda: "new")
+                assert follower.result(timeout=5) == "new"
+            finally:
+                release.set()
+
+            assert leader.result() == "old"
+
+        assert single_flight.sent == 2
+        assert single_flight._calls == {}
+
+    def test_request_after_write(self):
+        """GET sent after a POST of the same client doesn't join a GET
+        started before the POST."""
+        oanda = Oanda("DEMO", "mock", ID)
+        orders = []
+        started = threading.Event()
+        release = threading.Event()
+
+        def send_request(endpoint, method="GET", **kwargs):
+            response = requests.Response()
+            response.status_code = 200
+
+            if method == "GET":
+                snapshot = list(orders)
+
+                if not started.is_set():
+                    started.set()
+                    release.wait()
+
+                response._content = json.dumps({"orders": snapshot}).encode()
+            else:
+                orders.append({"id": str(len(orders) + 1)})
+                response._content = b"{}"
+
+            return response
+
+        oanda.send_request = send_request
+        endpoint = "/{}/orders".format(ID)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            try:
+                before = executor.submit(oanda._request, endpoint)
+                started.wait()
+                oanda._request(endpoint, "POST", json={})
+                after = executor.submit(oanda._request, endpoint)
+
+                assert len(after.result(timeout=5)["orders"]) == 1
+            finally:
+                release.set()
+
+            assert before.result()["orders"] == []
+
+        oanda.close()
+
+    def test_concurrent_requests(self):
+        with MockServer([ID], latency=0.2) as server:
+            oanda = server.connect(Oanda("DEMO", "mock", ID,
+                                         thread_safe=True))
+
+            with ThreadPoolExecutor(max_workers=10) as executor:
+                results = list(executor.map(
+                    lambda _: oanda.get_all_trades(), range(10)))
+
+            oanda.close()
+
+        assert oanda.single_flight.sent + oanda.single_flight.coalesced == 10
+        assert oanda.single_flight.sent < 10
+        assert all(result == results[0] for result in results)
+        assert len(set(id(result) for result in results)) == 10
+
+    def test_async_concurrent_requests(self):
+        loop = asyncio.new_event_loop()
+
+        async def run(oanda):
+            async with oanda:
+                return await asyncio.gather(
+                    *[oanda.get_pricing(["EUR_USD"]) for _ in range(10)])
+
+        with MockServer([ID], latency=0.1) as server:
+            oanda = server.connect(AsyncOanda("DEMO", "mock", ID))
+            results = loop.run_until_complete(run(oanda))
+
+        loop.close()
+
+        assert oanda.single_flight.sent == 1
+        assert oanda.single_flight.coalesced == 9
+        assert len(set(id(result) for result in results)) == 10
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import tempfile
+import unittest
+
+from oandav20 import Oanda
+from oandav20.arrays import candles_to_array
+from oandav20.store import CandleStore
+
+
+def make_candles(start, end, incomplete_from=None):
+    """Create M1 candles within the range (including both limits)."""
+    return candles_to_array([
+        {
+            "complete": incomplete_from is None or time < incomplete_from,
+            "mid": {"c": str(time), "h": str(time), "l": str(time),
+                    "o": str(time)},
+            "time": "{:.9f}".format(time),
+            "volume": 1
+        }
+        for time in range(int(start) - int(start) % -60, int(end) + 1, 60)
+    ])
+
+
+class TestCandleStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = CandleStore(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_write_and_read_methods(self):
+        self.store.write("EUR_USD", make_candles(0, 600), 0, 600)
+        self.store.write("EUR_USD", make_candles(600, 1200), 600, 1200)
+        path = os.path.join(self.directory.name, "EUR_USD_M1_M.candles")
+        size = os.path.getsize(path)
+
+        candles = self.store.read("EUR_USD")
+        assert len(candles) == 21
+        assert (candles["time"][1:] > candles["time"][:-1]).all()
+
+        candles = self.store.read("EUR_USD", 120, 300)
+        assert list(candles["close"]) == [120, 180, 240, 300]
+        assert len(self.store.read("EUR_USD", 2000)) == 0
+        assert len(self.store.read("GBP_USD")) == 0
+
+        # Gap before the last candle rewrites the file, the already saved
+        # candles are skipped.
+
+        self.store.write("EUR_USD", make_candles(-600, 0), -600, 0)
+        assert len(self.store.read("EUR_USD")) == 31
+        assert os.path.getsize(path) == size * 31 // 21
+
+        self.store.write("EUR_USD", make_candles(900, 1200), 900, 1200)
+        assert os.path.getsize(path) == size * 31 // 21
+
+    def test_get_missing_method(self):
+        assert self.store.get_missing("EUR_USD", 0, 600) == [(0, 600)]
+
+        self.store.write("EUR_USD", make_candles(100, 200), 100, 200)
+        self.store.write("EUR_USD", make_candles(300, 400), 300, 400)
+        self.store.write("EUR_USD", make_candles(400, 500), 400, 500)
+
+        assert self.store.get_missing("EUR_USD", 0, 600) == \
+            [(0, 100), (200, 300), (500, 600)]
+        assert self.store.get_missing("EUR_USD", 150, 450) == [(200, 300)]
+        assert self.store.get_missing("EUR_USD", 320, 480) == []
+        assert self.store.get_missing("EUR_USD", 0, 600, "H1") == [(0, 600)]
+
+    def test_incomplete_candles(self):
+        self.store.write("EUR_USD", make_candles(0, 600, 480), 0, 600)
+
+        assert len(self.store.read("EUR_USD")) == 8
+        assert self.store.get_missing("EUR_USD", 0, 600) == [(480, 600)]
+
+    def test_get_candles_method(self):
+        requests = []
+
+        def request(endpoint, method="GET", parser=None, params=None,
+                    headers=None):
+            start = float(params["from"])
+            end = float(params["to"])
+            requests.append((start, end))
+
+            return make_candles(start, end)
+
+        oanda = Oanda("DEMO", "foo", "bar")
+        oanda.candle_store = self.store
+        oanda._request = request
+
+        candles = oanda.get_candles("EUR_USD", 0, 600000)
+        assert len(candles) == 10001
+        assert len(requests) == 3
+
+        candles = oanda.get_candles("EUR_USD", 60000, 660000)
+        assert len(candles) == 10001
+        assert requests[3:] == [(600000, 660000)]
+
+        oanda.client.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
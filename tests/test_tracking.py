@@ -0,0 +1,202 @@
+import time
+import unittest
+
+import requests
+
+from oandav20.testing import MockServer
+from oandav20.tracking import OrderCache, TransactionTracker
+
+
+def transaction(id, type, **kwargs):
+    kwargs.update(id=str(id), type=type, time="2016-08-17T15:21:29.306Z")
+    return kwargs
+
+
+class StubOanda:
+    """Stream of the given transactions, the first catching up fails."""
+
+    default_id = "foo"
+
+    def __init__(self, stream, missed):
+        self.stream = stream
+        self.missed = missed
+        self.catch_ups = []
+
+    def stream_transactions(self, heartbeat=None, account_id=""):
+        return (transaction for transaction in self.stream)
+
+    def get_transactions_since(self, transaction_id, account_id=""):
+        self.catch_ups.append(transaction_id)
+
+        if len(self.catch_ups) == 1:
+            raise requests.ConnectionError()
+
+        return {"transactions": [transaction for transaction in self.missed
+                                 if int(transaction["id"]) > transaction_id]}
+
+
+class TestTransactionTracker(unittest.TestCase):
+
+    def setUp(self):
+        self.tracker = TransactionTracker(None, account_id="foo")
+
+    def test_order_lifecycle(self):
+        self.tracker.apply(transaction(
+            10, "LIMIT_ORDER", instrument="EUR_USD", units="100",
+            price="1.10000", clientExtensions={"id": "EUR_USD_1"}))
+
+        order = self.tracker.get_order(own_id="EUR_USD_1")
+        assert order["id"] == "10"
+        assert order["type"] == "LIMIT"
+        assert order["state"] == "PENDING"
+
+        self.tracker.apply(transaction(
+            11, "ORDER_FILL", orderID="10", instrument="EUR_USD",
+            units="100", price="1.10000",
+            tradeOpened={"tradeID": "11", "units": "100",
+                         "clientExtensions": {"id": "EUR_USD_1"}}))
+
+        assert self.tracker.get_order(10)["state"] == "FILLED"
+        trade = self.tracker.get_trade(own_id="EUR_USD_1")
+        assert trade["id"] == "11"
+        assert trade["state"] == "OPEN"
+        assert trade["currentUnits"] == "100"
+
+        self.tracker.apply(transaction(
+            12, "ORDER_FILL", orderID="12", instrument="EUR_USD",
+            units="-40", price="1.10100",
+            tradeReduced={"tradeID": "11", "units": "-40",
+                          "realizedPL": "0.04"}))
+
+        trade = self.tracker.get_trade(11)
+        assert trade["state"] == "OPEN"
+        assert trade["currentUnits"] == "60"
+
+        self.tracker.apply(transaction(
+            13, "ORDER_FILL", orderID="13", instrument="EUR_USD",
+            units="-60", price="1.10100",
+            tradesClosed=[{"tradeID": "11", "units": "-60",
+                           "realizedPL": "0.06"}]))
+
+        trade = self.tracker.get_trade(own_id="EUR_USD_1")
+        assert trade["state"] == "CLOSED"
+        assert trade["realizedPL"] == "0.10"
+        assert not self.tracker.get_open_trades()
+
+    def test_order_cancel_and_replace(self):
+        self.tracker.apply(transaction(
+            20, "STOP_ORDER", instrument="EUR_USD", units="100",
+            price="1.20000", clientExtensions={"id": "EUR_USD_2"}))
+        self.tracker.apply(transaction(
+            21, "ORDER_CANCEL", orderID="20", replacedByOrderID="22"))
+        self.tracker.apply(transaction(
+            22, "STOP_ORDER", instrument="EUR_USD", units="100",
+            price="1.21000", replacesOrderID="20",
+            clientExtensions={"id": "EUR_USD_2"}))
+
+        assert self.tracker.get_order(20)["state"] == "CANCELLED"
+        order = self.tracker.get_order(own_id="EUR_USD_2")
+        assert order["id"] == "22"
+        assert order["state"] == "PENDING"
+        assert len(self.tracker.get_pending_orders()) == 1
+
+    def test_already_applied_transactions_are_ignored(self):
+        self.tracker.apply(transaction(
+            30, "LIMIT_ORDER", instrument="EUR_USD", units="100",
+            price="1.10000"))
+        self.tracker.apply(transaction(31, "ORDER_CANCEL", orderID="30"))
+        self.tracker.apply(transaction(
+            30, "LIMIT_ORDER", instrument="EUR_USD", units="100",
+            price="1.10000"))
+
+        assert self.tracker.get_order(30)["state"] == "CANCELLED"
+        assert self.tracker.last_transaction_id == 31
+
+        with self.assertRaises(TypeError):
+            self.tracker.get_order()
+
+    def test_failed_catch_up_keeps_the_gap(self):
+        missed = transaction(41, "LIMIT_ORDER", instrument="EUR_USD",
+                             units="100", price="1.10000")
+        oanda = StubOanda([transaction(42, "ORDER_CANCEL", orderID="40"),
+                           transaction(43, "ORDER_CANCEL", orderID="41")],
+                          [missed])
+        tracker = TransactionTracker(oanda)
+        tracker.last_transaction_id = 40
+        tracker.run()
+
+        assert oanda.catch_ups == [40, 40]
+        assert tracker.get_order(41)["state"] == "CANCELLED"
+        assert tracker.last_transaction_id == 43
+        assert tracker.error is None
+
+    def test_stop_method_with_heartbeats_only(self):
+        with MockServer(heartbeat_interval=0.1) as server:
+            tracker = TransactionTracker(server.create_client())
+            tracker.start()
+            time.sleep(0.3)
+            tracker.stop()
+
+            assert tracker.join(2.0)
+            assert tracker.error is None
+            tracker.oanda.close()
+
+
+class TestOrderCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = OrderCache()
+
+    def test_apply_method(self):
+        self.cache.apply(transaction(
+            10, "LIMIT_ORDER", instrument="EUR_USD", units="100",
+            price="1.10000", clientExtensions={"id": "EUR_USD_1"}), "foo")
+
+        order = self.cache.get("foo", own_id="EUR_USD_1")
+        assert order["id"] == "10"
+        assert order["type"] == "LIMIT"
+        assert order["price"] == "1.10000"
+        assert self.cache.get("bar", 10) is None
+
+        self.cache.apply(transaction(
+            11, "ORDER_CLIENT_EXTENSIONS_MODIFY", orderID="10",
+            clientExtensionsModify={"id": "EUR_USD_2"}), "foo")
+        assert self.cache.get("foo", own_id="EUR_USD_1") is None
+        assert self.cache.get("foo", own_id="EUR_USD_2")["id"] == "10"
+
+        self.cache.apply(transaction(12, "ORDER_FILL", orderID="10"), "foo")
+        assert self.cache.get("foo", 10) is None
+        assert (self.cache.hits, self.cache.misses) == (2, 3)
+
+    def test_apply_response_method(self):
+        self.cache.put("foo", {"id": "20", "state": "PENDING",
+                               "clientExtensions": {"id": "EUR_USD_1"}})
+        self.cache.apply_response("foo", {
+            "lastTransactionID": "22",
+            "orderCreateTransaction": transaction(
+                22, "STOP_ORDER", instrument="EUR_USD", units="100",
+                price="1.21000", replacesOrderID="20",
+                clientExtensions={"id": "EUR_USD_1"}),
+            "orderCancelTransaction": transaction(
+                21, "ORDER_CANCEL", orderID="20", replacedByOrderID="22")
+        })
+
+        assert self.cache.get("foo", 20) is None
+        assert self.cache.get("foo", own_id="EUR_USD_1")["id"] == "22"
+
+    def test_replace_all_and_max_age(self):
+        self.cache.put("foo", {"id": "1", "state": "PENDING"})
+        self.cache.put("foo", {"id": "2", "state": "FILLED"})
+        self.cache.replace_all("foo", [{"id": "3", "state": "PENDING"}])
+
+        assert self.cache.get("foo", 1) is None
+        assert self.cache.get("foo", 2) is None
+        assert self.cache.get("foo", 3) is not None
+
+        self.cache.max_age = 0.01
+        time.sleep(0.02)
+        assert self.cache.get("foo", 3) is None
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -27,20 +27,8 @@ class TestTradesMixin(TestCase):
     "USD_ZAR"
     """
 
-    def tearDown(self):
-        """Add new ID to the file below for future uses."""
-        with open("used_own_ids.txt", "a") as f:
-            f.write(str(int(self.last_own_id) + 1) + "\n")
-
-    @property
-    def last_own_id(self):
-        with open("used_own_ids.txt") as f:
-            last_own_id = f.read().split("\n")[-2]  # [-1] is blank string
-
-        return last_own_id
-
     def test_get_trade_method(self):
-        own_id = "USD_CAD_" + self.last_own_id
+        own_id = self.get_own_id("USD_CAD")
         self.oanda.create_market_order("USD_CAD", "BUY", 1, own_id=own_id)
 
         trade_details = self.oanda.get_trade(own_id=own_id)
@@ -57,7 +45,7 @@ class TestTradesMixin(TestCase):
         assert "USD_CHF" in trades_instrument_list
 
     def test_update_trade_method(self):
-        own_id = "USD_CNH_" + self.last_own_id
+        own_id = self.get_own_id("USD_CNH")
         self.oanda.create_market_order("USD_CNH", "BUY", 1, own_id=own_id)
 
         pricing = self.oanda.get_pricing(["USD_CNH"])
@@ -74,7 +62,7 @@ class TestTradesMixin(TestCase):
             str(stoploss)
 
     def test_update_trade_extensions_method(self):
-        own_id = "USD_CZK_" + self.last_own_id
+        own_id = self.get_own_id("USD_CZK")
         self.oanda.create_market_order("USD_CZK", "BUY", 1, own_id=own_id)
 
         is_updated = self.oanda.update_trade_extensions(
@@ -85,7 +73,7 @@ class TestTradesMixin(TestCase):
         assert trade_details["trade"]["clientExtensions"]["tag"] == "foo"
 
     def test_close_trade_method(self):
-        own_id = "USD_DKK_" + self.last_own_id
+        own_id = self.get_own_id("USD_DKK")
         self.oanda.create_market_order("USD_DKK", "BUY", 1, own_id=own_id)
 
         is_closed = self.oanda.close_trade(own_id=own_id)
@@ -95,10 +83,10 @@ class TestTradesMixin(TestCase):
         assert trade_details["trade"]["state"] == "CLOSED"
 
     def test_close_filtered_trades_method(self):
-        own_id_1 = "USD_HKD_" + self.last_own_id
+        own_id_1 = self.get_own_id("USD_HKD")
         self.oanda.create_market_order("USD_HKD", "BUY", 1, own_id=own_id_1)
 
-        own_id_2 = "USD_HUF_" + self.last_own_id
+        own_id_2 = self.get_own_id("USD_HUF")
         self.oanda.create_market_order("USD_HUF", "BUY", 1, own_id=own_id_2)
 
         self.oanda.close_filtered_trades(own_ids=[own_id_1, own_id_2])
@@ -115,9 +103,48 @@ class TestTradesMixin(TestCase):
         open_trades = self.oanda.get_all_trades()
         assert not len(open_trades["trades"])
 
+    def test_close_filtered_trades_by_position(self):
+        own_id = self.get_own_id("AUD_CAD")
+        self.oanda.create_market_order("AUD_CAD", "BUY", 1, own_id=own_id)
+        self.oanda.create_market_order("AUD_CAD", "BUY", 1)
+        self.oanda.create_market_order("AUD_CAD", "SELL", 1)
+
+        report = self.oanda.close_filtered_trades(own_ids=[own_id],
+                                                  by_position=True)
+        assert [item.arguments for item in report.items] == \
+            [{"own_id": own_id}]
+
+        report = self.oanda.close_filtered_trades(instrument="AUD_CAD",
+                                                  by_position=True)
+        assert not report.failed
+        assert len(report.items) == 2
+        assert {"instrument": "AUD_CAD", "side": "LONG"} not in \
+            [item.arguments for item in report.items]
+
+        self.oanda.create_market_order("AUD_CAD", "SELL", 1)
+        self.oanda.create_market_order("AUD_CAD", "SELL", 1)
+
+        report = self.oanda.close_filtered_trades(instrument="AUD_CAD")
+        assert len(report.items) == 2
+
+        self.oanda.create_market_order("AUD_CAD", "SELL", 1)
+        self.oanda.create_market_order("AUD_CAD", "SELL", 1)
+
+        report = self.oanda.close_filtered_trades(instrument="AUD_CAD",
+                                                  by_position=True)
+        assert [item.arguments for item in report.items] == \
+            [{"instrument": "AUD_CAD", "side": "SHORT"}]
+        assert report.items[0].result
+
+        open_trades = self.oanda.get_all_trades()
+        assert not [trade for trade in open_trades["trades"]
+                    if trade["instrument"] == "AUD_CAD"]
+
     def test_close_all_trades_method(self):
         self.oanda.create_market_order("USD_INR", "BUY", 1)
-        self.oanda.close_all_trades()
+        report = self.oanda.close_all_trades()
+        assert len(report.succeeded) >= 1
+        assert not report.failed
 
         open_trades = self.oanda.get_all_trades()
         assert not len(open_trades["trades"])
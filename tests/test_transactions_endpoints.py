@@ -0,0 +1,40 @@
+import threading
+import unittest
+
+from oandav20.testing import TestCase
+
+
+class TestTransactionsMixin(TestCase):
+
+    def test_get_transactions_since_method(self):
+        last_transaction_id = \
+            int(self.oanda.get_all_orders()["lastTransactionID"])
+        self.oanda.create_market_order("EUR_USD", "BUY", 1)
+
+        transactions = self.oanda.get_transactions_since(last_transaction_id)
+        transaction_types = \
+            [transaction["type"] for transaction in
+             transactions["transactions"]]
+        assert "MARKET_ORDER" in transaction_types
+
+    def test_stream_transactions_method(self):
+        """The stream is connected by the first iteration, so the order is
+        created a moment later.
+        """
+        stream = self.oanda.stream_transactions()
+        order_ids = []
+        timer = threading.Timer(1.0, lambda: order_ids.append(
+            self.oanda.create_market_order("EUR_USD", "BUY", 1)))
+        timer.start()
+
+        for transaction in stream:
+            if transaction["type"] == "MARKET_ORDER":
+                break
+
+        stream.close()
+        timer.join()
+        assert transaction["id"] == order_ids[0]
+
+
+if __name__ == "__main__":
+    unittest.main()